@@ -1,4 +1,8 @@
-from collections import Counter
+from cards import (
+    CARD_IDS, CARD_NAMES, CHOPSTICKS, DUMPLING, EGG, MAKI, MAKI_VALUE, NUM_CARDS,
+    PUDDING, SALMON, SASHIMI, SQUID, TEMPURA, WASABI, counts_of_names, nigiri_total,
+)
+from tracking import DistributionTracker
 
 # ── constants ─────────────────────────────────────────────────────────────────
 
@@ -24,17 +28,6 @@ DUMPLING_SCORES = [0, 1, 3, 6, 10, 15]
 
 # ── card tracking ─────────────────────────────────────────────────────────────
 
-def find_missing(old_hand: list[str], new_hand: list[str]) -> list[str]:
-    count_old = Counter(old_hand)
-    count_new = Counter(new_hand)
-    missing = []
-    for item, count in count_old.items():
-        diff = count - count_new[item]
-        if diff > 0:
-            missing.extend([item] * diff)
-    return missing
-
-
 def update_state(hand: list[str], state) -> None:
     if state.hands is None:
         state.player_count = PLAYERS_BY_HAND.get(len(hand), 2)
@@ -42,12 +35,16 @@ def update_state(hand: list[str], state) -> None:
         state.hand_num = 0
         state.start_card_num = len(hand)
         state.total_remaining = TOTAL_CARDS
+        state.tracker = DistributionTracker(
+            state.player_count, len(hand), CARD_DEFAULT_FREQUENCIES, TOTAL_CARDS
+        )
+        state.tracker.observe(0, hand)
         _recompute_distribution(state)
         return
 
+    played = state.tracker.observe(state.hand_num, hand)
+    state.enemy_cards_played.extend(played)
     if state.hand_num < len(state.hands):
-        played = find_missing(state.hands[state.hand_num], hand)
-        state.enemy_cards_played.extend(played)
         state.hands[state.hand_num] = hand.copy()
     else:
         state.hands.append(hand.copy())
@@ -57,167 +54,188 @@ def update_state(hand: list[str], state) -> None:
 
 
 def _recompute_distribution(state) -> None:
-    known_cards: list[str] = []
-    for h in state.hands:
-        known_cards.extend(h)
-    known_count = Counter(known_cards)
-    played_count = Counter(state.enemy_cards_played)
-
-    accounted = Counter(known_count)
-    accounted.update(played_count)
-
-    unseen_hands = state.player_count - len(state.hands)
-    unseen_hand_size = getattr(state, "start_card_num", 9)
-    remaining_in_deck = max(0, TOTAL_CARDS - sum(accounted.values()))
-
-    distribution: dict[str, float] = {}
-    for card, total_freq in CARD_DEFAULT_FREQUENCIES.items():
-        in_known = known_count.get(card, 0)
-        if unseen_hands == 0 or remaining_in_deck == 0:
-            distribution[card] = float(in_known)
-        else:
-            remaining_of_type = max(0, total_freq - accounted.get(card, 0))
-            proportion = remaining_of_type / remaining_in_deck
-            expected_in_unseen = proportion * unseen_hands * unseen_hand_size
-            distribution[card] = in_known + expected_in_unseen
-
-    state.card_distribution = distribution
+    # Running counts live in the tracker; this is its cached view
+    state.card_distribution = state.tracker.distribution
 
 
 # ── scoring ───────────────────────────────────────────────────────────────────
-
-def score_card(card: str, hand: list[str], state) -> float:
-    played        = state.played_cards
-    round_num     = state.round
-    player_count  = state.player_count
-    dist          = state.card_distribution
-    turns_left    = len(hand) - 1
-
-    played_counts = Counter(played)
+#
+# The whole hand is scored at once: `_features` gathers what the scores read
+# from the state, `_score_table` values every card id, and each card in hand
+# looks its value up.
+
+HIGH_DENY = {"Squid Nigiri", "Sashimi", "Pudding", "Maki Roll (3)"}
+MED_DENY  = {"Salmon Nigiri", "Tempura", "Wasabi", "Maki Roll (2)"}
+
+
+def _deny_table(multiplier: float) -> tuple[float, ...]:
+    return tuple(
+        1.0 * multiplier if name in HIGH_DENY
+        else 0.5 * multiplier if name in MED_DENY
+        else 0.0
+        for name in CARD_NAMES
+    )
+
+
+# Deny strong cards from opponents. Weighted heavily in 1v1.
+DENY_1V1 = _deny_table(1.0)
+DENY_MULTI = _deny_table(0.3)
+NO_DENY = _deny_table(0.0)
+DENY_CARDS = tuple(card for card in range(NUM_CARDS) if DENY_1V1[card])
+
+
+def _features(state) -> tuple:
+    player_count = state.player_count
+    dist = state.card_distribution
+    played_counts = state.played_counts
+
+    total_maki_in_dist = (
+        dist.get("Maki Roll (1)", 0) * 1
+        + dist.get("Maki Roll (2)", 0) * 2
+        + dist.get("Maki Roll (3)", 0) * 3
+    )
+    nigiri_est = (
+        dist.get("Squid Nigiri", 0) * 3
+        + dist.get("Salmon Nigiri", 0) * 2
+        + dist.get("Egg Nigiri", 0) * 1
+    )
+    avg_pudding = (dist.get("Pudding", 0) + state.puddings) / max(player_count, 1)
+    return (
+        state.tempura_parity, state.sashimi_mod, state.dumplings, state.maki,
+        played_counts[WASABI] - nigiri_total(played_counts),
+        dist.get("Tempura", 0), dist.get("Sashimi", 0),
+        total_maki_in_dist / max(player_count - 1, 1), nigiri_est,
+        state.round, state.puddings < avg_pudding, state.has_chopsticks,
+        DENY_1V1 if player_count == 2 else DENY_MULTI,
+    )
+
+
+def _score_table(hand_counts: list[int], turns_left: int, features: tuple) -> list[float]:
+    """Value of each card type the hand holds, by card id (0.0 for the rest)."""
+    (tempura_odd, sashimi_have, dumplings, my_maki, unused_wasabi,
+     tempura_dist, sashimi_dist, opponent_maki_est, nigiri_est,
+     round_num, behind_on_pudding, has_chopsticks, deny) = features
+    scores = [0.0] * NUM_CARDS
 
     # ── Tempura ──────────────────────────────────────────────────────────────
-    if card == "Tempura":
-        have = played_counts["Tempura"]
-        if have % 2 == 1:
-            return 15.0  # one away from completing a pair → grab it
-        tempura_available = dist.get("Tempura", 0) - hand.count("Tempura")
-        if tempura_available >= 1 and turns_left >= 1:
-            return 6.0
-        return 1.0
+    if hand_counts[TEMPURA]:
+        if tempura_odd:
+            scores[TEMPURA] = 15.0  # one away from completing a pair → grab it
+        elif tempura_dist - hand_counts[TEMPURA] >= 1 and turns_left >= 1:
+            scores[TEMPURA] = 6.0
+        else:
+            scores[TEMPURA] = 1.0
 
     # ── Sashimi ──────────────────────────────────────────────────────────────
-    if card == "Sashimi":
-        have = played_counts["Sashimi"] % 3
-        sashimi_available = dist.get("Sashimi", 0) - hand.count("Sashimi")
-        if have == 2:
-            return 18.0  # one away from 10 pts → highest priority
-        if have == 1 and sashimi_available >= 1 and turns_left >= 1:
-            return 9.0
-        if have == 0 and sashimi_available >= 2 and turns_left >= 2:
-            return 5.0
-        return 0.5
+    if hand_counts[SASHIMI]:
+        sashimi_available = sashimi_dist - hand_counts[SASHIMI]
+        if sashimi_have == 2:
+            scores[SASHIMI] = 18.0  # one away from 10 pts → highest priority
+        elif sashimi_have == 1 and sashimi_available >= 1 and turns_left >= 1:
+            scores[SASHIMI] = 9.0
+        elif sashimi_have == 0 and sashimi_available >= 2 and turns_left >= 2:
+            scores[SASHIMI] = 5.0
+        else:
+            scores[SASHIMI] = 0.5
 
     # ── Dumpling ─────────────────────────────────────────────────────────────
-    if card == "Dumpling":
-        have = played_counts["Dumpling"]
-        marginal = DUMPLING_SCORES[min(have + 1, 5)] - DUMPLING_SCORES[min(have, 5)]
-        return float(marginal) + have * 2.0  # aggressive snowball
+    if hand_counts[DUMPLING]:
+        marginal = DUMPLING_SCORES[min(dumplings + 1, 5)] - DUMPLING_SCORES[min(dumplings, 5)]
+        scores[DUMPLING] = float(marginal) + dumplings * 2.0  # aggressive snowball
 
     # ── Maki Rolls ───────────────────────────────────────────────────────────
-    if card.startswith("Maki Roll"):
-        roll_value = int(card.split("(")[1].rstrip(")"))
-        my_maki = sum(
-            int(c.split("(")[1].rstrip(")"))
-            for c in played if c.startswith("Maki Roll")
-        )
-        total_maki_in_dist = (
-            dist.get("Maki Roll (1)", 0) * 1
-            + dist.get("Maki Roll (2)", 0) * 2
-            + dist.get("Maki Roll (3)", 0) * 3
-        )
-        opponent_maki_est = total_maki_in_dist / max(player_count - 1, 1)
-        projected = my_maki + roll_value
-        base = roll_value * 1.5
-        if projected > opponent_maki_est:
-            base += 3.0
-        elif projected >= opponent_maki_est:
-            base += 1.5
-        return base
+    for card in MAKI:
+        if hand_counts[card]:
+            roll_value = MAKI_VALUE[card]
+            projected = my_maki + roll_value
+            base = roll_value * 1.5
+            if projected > opponent_maki_est:
+                base += 3.0
+            elif projected >= opponent_maki_est:
+                base += 1.5
+            scores[card] = base
 
     # ── Nigiri ───────────────────────────────────────────────────────────────
-    NIGIRI_BASE = {"Egg Nigiri": 1, "Salmon Nigiri": 2, "Squid Nigiri": 3}
-    if card in NIGIRI_BASE:
-        base_val = float(NIGIRI_BASE[card])
-        nigiris_played = sum(
-            played_counts[n] for n in ("Egg Nigiri", "Salmon Nigiri", "Squid Nigiri")
-        )
-        wasabi_available = played_counts.get("Wasabi", 0) > nigiris_played
-        if wasabi_available:
-            return base_val * 3 + 8.0  # big bonus to beat Gemini's +20
-        return base_val
+    if unused_wasabi > 0:
+        # big bonus to beat Gemini's +20
+        scores[EGG], scores[SALMON], scores[SQUID] = 11.0, 14.0, 17.0
+    else:
+        scores[EGG], scores[SALMON], scores[SQUID] = 1.0, 2.0, 3.0
 
     # ── Wasabi ───────────────────────────────────────────────────────────────
-    if card == "Wasabi":
-        nigiris_played = sum(
-            played_counts[n] for n in ("Egg Nigiri", "Salmon Nigiri", "Squid Nigiri")
-        )
-        unused_wasabi = played_counts.get("Wasabi", 0) - nigiris_played
+    if hand_counts[WASABI]:
         if unused_wasabi > 0:
-            return -2.0  # already have unused wasabi — don't stack
-        nigiri_est = (
-            dist.get("Squid Nigiri", 0) * 3
-            + dist.get("Salmon Nigiri", 0) * 2
-            + dist.get("Egg Nigiri", 0) * 1
-        )
-        reach = min(nigiri_est, turns_left)
-        return 2.0 + reach * 1.5
+            scores[WASABI] = -2.0  # already have unused wasabi — don't stack
+        else:
+            reach = min(nigiri_est, turns_left)
+            scores[WASABI] = 2.0 + reach * 1.5
 
     # ── Pudding ──────────────────────────────────────────────────────────────
-    if card == "Pudding":
+    if hand_counts[PUDDING]:
         base = float(round_num) * 1.5
-        avg_pudding = (dist.get("Pudding", 0) + state.puddings) / max(player_count, 1)
-        if state.puddings < avg_pudding:
+        if behind_on_pudding:
             base += 2.0
-        return base
+        scores[PUDDING] = base
 
     # ── Chopsticks ───────────────────────────────────────────────────────────
-    if card == "Chopsticks":
-        if state.has_chopsticks or turns_left <= 1:
-            return -3.0
-        return 0.5 + turns_left * 0.4
+    if has_chopsticks or turns_left <= 1:
+        scores[CHOPSTICKS] = -3.0
+    else:
+        scores[CHOPSTICKS] = 0.5 + turns_left * 0.4
+
+    # ── deny bonus ───────────────────────────────────────────────────────────
+    for card in DENY_CARDS:
+        scores[card] += deny[card]
+    return scores
+
 
-    return 0.0
+def _hand_scores(hand: list[str], features: tuple) -> list[float]:
+    table = _score_table(counts_of_names(hand), len(hand) - 1, features)
+    return [table[CARD_IDS[card]] for card in hand]
 
 
-# ── deny bonus ────────────────────────────────────────────────────────────────
+def score_hand(hand: list[str], state) -> list[float]:
+    """Score of every card in `hand`, in hand order. Doesn't update tracking."""
+    return _hand_scores(hand, _features(state))
+
+
+def decide_batch(hands: list[list[str]], states: list) -> list[list[float]]:
+    """
+    Score vectors for many (hand, state) positions in one call. Positions
+    that share a state object read its features once.
+    """
+    seen: dict[int, tuple] = {}
+    vectors = []
+    for hand, state in zip(hands, states):
+        features = seen.get(id(state))
+        if features is None:
+            features = seen[id(state)] = _features(state)
+        vectors.append(_hand_scores(hand, features))
+    return vectors
+
+
+def score_card(card: str, hand: list[str], state) -> float:
+    """Value of playing `card` from `hand`, without the deny bonus (see `deny_value`)."""
+    features = _features(state)[:-1] + (NO_DENY,)
+    return _score_table(counts_of_names(hand), len(hand) - 1, features)[CARD_IDS[card]]
+
 
 def deny_value(card: str, dist: dict[str, float], player_count: int) -> float:
     """Deny strong cards from opponents. Weighted heavily in 1v1."""
-    multiplier = 1.0 if player_count == 2 else 0.3
-    HIGH_DENY = {"Squid Nigiri", "Sashimi", "Pudding", "Maki Roll (3)"}
-    MED_DENY  = {"Salmon Nigiri", "Tempura", "Wasabi", "Maki Roll (2)"}
-    if card in HIGH_DENY:
-        return 1.0 * multiplier
-    if card in MED_DENY:
-        return 0.5 * multiplier
-    return 0.0
+    deny = DENY_1V1 if player_count == 2 else DENY_MULTI
+    return deny[CARD_IDS[card]]
 
 
 # ── main decide ───────────────────────────────────────────────────────────────
 
-def decide(hand: list[str], state) -> int:
-    """Returns the 0-based index of the card to play."""
+def prepare(hand: list[str], state) -> None:
+    """Per-turn work before scoring: update tracking and advance hand_num."""
     update_state(hand, state)
     state.hand_num = (state.hand_num + 1) % state.player_count
 
-    best_index = 0
-    best_score = float("-inf")
 
-    for i, card in enumerate(hand):
-        s = score_card(card, hand, state)
-        s += deny_value(card, state.card_distribution, state.player_count)
-        if s > best_score:
-            best_score = s
-            best_index = i
-
-    return best_index
+def decide(hand: list[str], state) -> int:
+    """Returns the 0-based index of the card to play."""
+    prepare(hand, state)
+    scores = score_hand(hand, state)
+    return max(range(len(hand)), key=scores.__getitem__)
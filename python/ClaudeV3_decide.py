@@ -1,4 +1,11 @@
-from collections import Counter
+from typing import Optional
+
+import endgame
+from cards import (
+    CARD_IDS, CARD_NAMES, CHOPSTICKS, DUMPLING, MAKI, MAKI_VALUE, NIGIRI, PUDDING,
+    SASHIMI, TEMPURA, WASABI, counts_of_names, nigiri_total,
+)
+from tracking import DistributionTracker
 
 # ── constants ─────────────────────────────────────────────────────────────────
 
@@ -40,45 +47,13 @@ BASE_PRIORITY = {
 
 # ── card tracking (Drake's distribution system) ───────────────────────────────
 
-def _find_missing(old_hand: list, new_hand: list) -> list:
-    """Cards in old_hand that disappeared → were played by that opponent."""
-    c1, c2 = Counter(old_hand), Counter(new_hand)
-    out = []
-    for item, cnt in c1.items():
-        diff = cnt - c2[item]
-        if diff > 0:
-            out.extend([item] * diff)
-    return out
-
-
 def _recompute_distribution(state) -> None:
     """
     Estimate how many of each card exist across ALL live hands
     (known hands exact + unseen hands estimated from deck proportions).
-    O(num_card_types) — very fast.
+    Reads the tracker's cached view — O(1) unless a hand changed.
     """
-    known: list = []
-    for h in state.hands:
-        known.extend(h)
-    known_cnt   = Counter(known)
-    played_cnt  = Counter(state.enemy_cards_played)
-
-    accounted   = known_cnt + played_cnt          # total cards we've observed
-    deck_left   = max(0, TOTAL_CARDS - sum(accounted.values()))
-    unseen_n    = state.player_count - len(state.hands)
-    hand_size   = getattr(state, "start_card_num", 9)
-
-    dist = {}
-    for card, freq in CARD_DEFAULT_FREQUENCIES.items():
-        in_known  = known_cnt.get(card, 0)
-        if unseen_n == 0 or deck_left == 0:
-            dist[card] = float(in_known)
-        else:
-            remaining = max(0, freq - accounted.get(card, 0))
-            expected  = (remaining / deck_left) * unseen_n * hand_size
-            dist[card] = in_known + expected
-
-    state.card_distribution = dist
+    state.card_distribution = state.tracker.distribution
 
 
 def update_state(hand: list, state) -> None:
@@ -89,13 +64,17 @@ def update_state(hand: list, state) -> None:
         state.hands          = [hand.copy()]
         state.hand_num       = 0
         state.start_card_num = len(hand)
+        state.tracker        = DistributionTracker(
+            state.player_count, len(hand), CARD_DEFAULT_FREQUENCIES, TOTAL_CARDS
+        )
+        state.tracker.observe(0, hand)
         _recompute_distribution(state)
         return
 
+    # Diff against the last time we held this hand position → what was played
+    played = state.tracker.observe(state.hand_num, hand)
+    state.enemy_cards_played.extend(played)
     if state.hand_num < len(state.hands):
-        # We've seen this hand position before — diff it to find what was played
-        played = _find_missing(state.hands[state.hand_num], hand)
-        state.enemy_cards_played.extend(played)
         state.hands[state.hand_num] = hand.copy()
     else:
         # New hand position coming into view
@@ -105,145 +84,182 @@ def update_state(hand: list, state) -> None:
 
 
 # ── scoring (Gemini's logic + distribution awareness) ────────────────────────
+#
+# One pass scores every card type: `_features` reads what the bonuses need
+# from the state, `_score_table` applies them to the base priorities by card
+# id, and each card in hand looks its score up.
+
+BASE_SCORES = tuple(float(BASE_PRIORITY[name]) for name in CARD_NAMES)   # by id
+
+# Small bonus for taking a card that would strongly benefit opponents.
+# Only material in 1v1; negligible in 4-player.
+HIGH_DENY = {"Squid Nigiri", "Sashimi", "Pudding", "Maki Roll (3)"}
+MED_DENY  = {"Salmon Nigiri", "Tempura", "Maki Roll (2)"}
+DENY_1V1  = tuple(
+    1.0 if name in HIGH_DENY else 0.5 if name in MED_DENY else 0.0
+    for name in CARD_NAMES
+)
+DENY_CARDS = tuple(card for card in range(len(CARD_NAMES)) if DENY_1V1[card])
 
-def _score(card: str, hand: list, state) -> float:
+
+def _features(state) -> tuple:
     """
-    Priority score for one card.
-    Starts from Gemini's proven base priorities, then applies
-    context bonuses informed by Drake's distribution data.
-    All arithmetic is simple — no loops — well under 1 ms per card.
+    Everything the card scores read from `state`, gathered once per state
+    so a batch of hands against the same state doesn't repeat it.
     """
-    played       = state.played_cards
     dist         = state.card_distribution
     player_count = state.player_count
-    round_num    = state.round
-    turns_left   = len(hand) - 1          # picks remaining after this one
-
-    played_cnt   = Counter(played)         # O(|played|), cached implicitly per call
-    priority     = float(BASE_PRIORITY.get(card, 0))
+    played_cnt   = state.played_counts     # 12-slot count vector
+
+    total_dist_maki = (dist.get("Maki Roll (1)", 0)
+                       + dist.get("Maki Roll (2)", 0) * 2
+                       + dist.get("Maki Roll (3)", 0) * 3)
+    nigiri_supply = (dist.get("Squid Nigiri", 0) * 3
+                     + dist.get("Salmon Nigiri", 0) * 2
+                     + dist.get("Egg Nigiri", 0))
+    avg_pudding = (dist.get("Pudding", 0) + state.puddings) / max(player_count, 1)
+    return (
+        played_cnt[WASABI] - nigiri_total(played_cnt) > 0,
+        state.tempura_parity, state.sashimi_mod, state.dumplings, state.maki,
+        dist.get("Tempura", 0), dist.get("Sashimi", 0),
+        total_dist_maki / max(player_count - 1, 1), nigiri_supply,
+        state.round, state.puddings < avg_pudding, state.has_chopsticks,
+        player_count <= 2,
+    )
+
+
+def _score_table(hand_counts: list[int], turns_left: int, features: tuple) -> list[float]:
+    """
+    Priority of every card id for a hand with these counts, with
+    `turns_left` picks remaining after this one. Bonuses are only worked
+    out for card types the hand holds.
+    """
+    (unused_wasabi, tempura_odd, sashimi_have, dumplings, my_maki,
+     tempura_dist, sashimi_dist, opp_maki_est, nigiri_supply,
+     round_num, behind_on_pudding, has_chopsticks, deny) = features
+    priority = list(BASE_SCORES)
 
     # ── Wasabi + Nigiri (Gemini's decisive +20) ───────────────────────────────
-    if card in ("Egg Nigiri", "Salmon Nigiri", "Squid Nigiri"):
-        nigiris_down = sum(played_cnt[n] for n in
-                           ("Egg Nigiri", "Salmon Nigiri", "Squid Nigiri"))
-        unused_wasabi = played_cnt.get("Wasabi", 0) - nigiris_down
-        if unused_wasabi > 0:
-            priority += 20   # Gemini's exact bonus — proven effective
+    if unused_wasabi:
+        for card in NIGIRI:
+            priority[card] += 20   # Gemini's exact bonus — proven effective
 
     # ── Tempura ──────────────────────────────────────────────────────────────
-    if card == "Tempura":
-        have = played_cnt["Tempura"]
-        if have % 2 == 1:
-            priority += 10                           # one away → complete it
+    if hand_counts[TEMPURA]:
+        if tempura_odd:
+            priority[TEMPURA] += 10                  # one away → complete it
         else:
             # Only start a new pair if more tempura are reachable
-            available = dist.get("Tempura", 0) - hand.count("Tempura")
+            available = tempura_dist - hand_counts[TEMPURA]
             if available < 1 or turns_left < 1:
-                priority -= 4                        # no partner coming; deprioritise
+                priority[TEMPURA] -= 4               # no partner coming; deprioritise
 
     # ── Sashimi ──────────────────────────────────────────────────────────────
-    if card == "Sashimi":
-        have = played_cnt["Sashimi"] % 3
-        available = dist.get("Sashimi", 0) - hand.count("Sashimi")
-        if have == 2:
-            priority += 10                           # one away from 10 pts
-        elif have == 1:
+    if hand_counts[SASHIMI]:
+        available = sashimi_dist - hand_counts[SASHIMI]
+        if sashimi_have == 2:
+            priority[SASHIMI] += 10                  # one away from 10 pts
+        elif sashimi_have == 1:
             if available >= 1 and turns_left >= 1:
-                priority += 5
+                priority[SASHIMI] += 5
             else:
-                priority -= 5                        # can't complete; dead card
-        elif have == 0:
+                priority[SASHIMI] -= 5               # can't complete; dead card
+        else:
             if available >= 2 and turns_left >= 2:
-                priority += 2
+                priority[SASHIMI] += 2
             else:
-                priority -= 5                        # no path to triple
+                priority[SASHIMI] -= 5               # no path to triple
 
     # ── Dumpling (Gemini's * 2 snowball) ─────────────────────────────────────
-    if card == "Dumpling":
-        have     = played_cnt["Dumpling"]
-        marginal = DUMP_SCORES[min(have + 1, 5)] - DUMP_SCORES[min(have, 5)]
-        priority += marginal + have * 2              # exact Gemini formula + marginal
+    if hand_counts[DUMPLING]:
+        marginal = DUMP_SCORES[min(dumplings + 1, 5)] - DUMP_SCORES[min(dumplings, 5)]
+        priority[DUMPLING] += marginal + dumplings * 2   # exact Gemini formula + marginal
 
     # ── Maki Rolls ───────────────────────────────────────────────────────────
-    if card.startswith("Maki Roll"):
-        roll_val = int(card.split("(")[1].rstrip(")"))
-        priority += roll_val                         # Gemini's simple face-value bonus
-        # Distribution bonus: are we winning maki?
-        my_maki = sum(
-            int(c.split("(")[1].rstrip(")"))
-            for c in played if c.startswith("Maki Roll")
-        )
-        total_dist_maki = (dist.get("Maki Roll (1)", 0)
-                           + dist.get("Maki Roll (2)", 0) * 2
-                           + dist.get("Maki Roll (3)", 0) * 3)
-        opp_maki_est = total_dist_maki / max(player_count - 1, 1)
-        if my_maki + roll_val > opp_maki_est:
-            priority += 2    # leading on maki → press the advantage
+    for card in MAKI:
+        if hand_counts[card]:
+            roll_val = MAKI_VALUE[card]
+            priority[card] += roll_val               # Gemini's simple face-value bonus
+            # Distribution bonus: are we winning maki?
+            if my_maki + roll_val > opp_maki_est:
+                priority[card] += 2  # leading on maki → press the advantage
 
     # ── Wasabi (value depends on nigiri supply) ───────────────────────────────
-    if card == "Wasabi":
-        nigiris_down  = sum(played_cnt[n] for n in
-                            ("Egg Nigiri", "Salmon Nigiri", "Squid Nigiri"))
-        unused_wasabi = played_cnt.get("Wasabi", 0) - nigiris_down
-        if unused_wasabi > 0:
-            priority -= 13   # already have unused wasabi; don't stack
-        else:
-            nigiri_supply = (dist.get("Squid Nigiri", 0) * 3
-                             + dist.get("Salmon Nigiri", 0) * 2
-                             + dist.get("Egg Nigiri", 0))
-            if nigiri_supply < 1 or turns_left < 1:
-                priority -= 8   # no nigiris coming; wasabi is worthless
+    if unused_wasabi:
+        priority[WASABI] -= 13   # already have unused wasabi; don't stack
+    elif nigiri_supply < 1 or turns_left < 1:
+        priority[WASABI] -= 8    # no nigiris coming; wasabi is worthless
 
     # ── Pudding ───────────────────────────────────────────────────────────────
-    if card == "Pudding":
-        priority += round_num                        # Gemini's exact bonus
-        # Extra push if we're behind the average pudding count
-        avg = (dist.get("Pudding", 0) + state.puddings) / max(player_count, 1)
-        if state.puddings < avg:
-            priority += 2
+    priority[PUDDING] += round_num                   # Gemini's exact bonus
+    # Extra push if we're behind the average pudding count
+    if behind_on_pudding:
+        priority[PUDDING] += 2
 
     # ── Chopsticks ────────────────────────────────────────────────────────────
-    if card == "Chopsticks":
-        if state.has_chopsticks or turns_left <= 1:
-            priority -= 10   # useless second copy or no time to use
-        else:
-            priority += turns_left * 0.3
+    if has_chopsticks or turns_left <= 1:
+        priority[CHOPSTICKS] -= 10   # useless second copy or no time to use
+    else:
+        priority[CHOPSTICKS] += turns_left * 0.3
 
+    if deny:
+        for card in DENY_CARDS:
+            priority[card] += DENY_1V1[card]
     return priority
 
 
-def _deny(card: str, player_count: int) -> float:
+def _hand_scores(hand: list, features: tuple) -> list[float]:
+    table = _score_table(counts_of_names(hand), len(hand) - 1, features)
+    return [table[CARD_IDS[card]] for card in hand]
+
+
+def score_hand(hand: list, state) -> list[float]:
+    """
+    Score of every card in `hand`, in hand order. Reads the tracking in
+    `state` without updating it.
+    """
+    return _hand_scores(hand, _features(state))
+
+
+def decide_batch(hands: list, states: list) -> list[list[float]]:
     """
-    Small bonus for taking a card that would strongly benefit opponents.
-    Only material in 1v1; negligible in 4-player.
+    Score vectors for many positions in one call, e.g. every candidate in
+    a search. `states[i]` goes with `hands[i]`; positions sharing a state
+    object read its features once.
     """
-    if player_count > 2:
-        return 0.0
-    HIGH = {"Squid Nigiri", "Sashimi", "Pudding", "Maki Roll (3)"}
-    MED  = {"Salmon Nigiri", "Tempura", "Maki Roll (2)"}
-    if card in HIGH: return 1.0
-    if card in MED:  return 0.5
-    return 0.0
+    seen: dict[int, tuple] = {}
+    vectors = []
+    for hand, state in zip(hands, states):
+        features = seen.get(id(state))
+        if features is None:
+            features = seen[id(state)] = _features(state)
+        vectors.append(_hand_scores(hand, features))
+    return vectors
 
 
 # ── public entry point ────────────────────────────────────────────────────────
 
-def decide(hand: list, state) -> int:
+def prepare(hand: list, state) -> Optional[int]:
     """
-    Returns the 0-based index of the best card to play.
-    Total runtime: O(hand_size * |played|) — comfortably under 1 ms.
+    Per-turn work before scoring: tracking, hand_num and the 1v1 endgame.
+    Returns the index to play if the endgame search settled it, else None.
     """
     # Update distribution tracking
     update_state(hand, state)
     state.hand_num = (state.hand_num + 1) % state.player_count
 
-    best_idx   = 0
-    best_score = float("-inf")
+    # 1v1 endgame: both hands are known, so search instead of guessing
+    return endgame.best_index(hand, state)
 
-    for i, card in enumerate(hand):
-        s = _score(card, hand, state) + _deny(card, state.player_count)
-        if s > best_score:
-            best_score = s
-            best_idx   = i
 
-    return best_idx
+def decide(hand: list, state) -> int:
+    """
+    Returns the 0-based index of the best card to play.
+    Total runtime: O(hand_size) — comfortably under 1 ms.
+    """
+    exact = prepare(hand, state)
+    if exact is not None:
+        return exact
+
+    scores = score_hand(hand, state)
+    return max(range(len(hand)), key=scores.__getitem__)
@@ -1,4 +1,11 @@
-from collections import Counter
+from typing import Optional
+
+import endgame
+from cards import (
+    CARD_IDS, CARD_NAMES, CHOPSTICKS, DUMPLING, EGG, MAKI, MAKI_VALUE, NUM_CARDS,
+    PUDDING, SALMON, SASHIMI, SQUID, TEMPURA, WASABI, counts_of_names,
+)
+from tracking import DistributionTracker
 
 # ── constants ────────────────────────────────────────────────────────────────
 
@@ -23,18 +30,6 @@ TOTAL_CARDS = 108
 
 # ── card tracking helpers ─────────────────────────────────────────────────────
 
-def find_missing(old_hand: list[str], new_hand: list[str]) -> list[str]:
-    """Return cards that were in old_hand but are no longer in new_hand (i.e. played)."""
-    count_old = Counter(old_hand)
-    count_new = Counter(new_hand)
-    missing = []
-    for item, count in count_old.items():
-        diff = count - count_new[item]
-        if diff > 0:
-            missing.extend([item] * diff)
-    return missing
-
-
 def update_state(hand: list[str], state) -> None:
     """
     Update state.card_distribution with best estimates of all cards
@@ -47,13 +42,18 @@ def update_state(hand: list[str], state) -> None:
         state.hand_num = 0
         state.start_card_num = len(hand)
         state.total_remaining = TOTAL_CARDS
+        state.tracker = DistributionTracker(
+            state.player_count, len(hand), CARD_DEFAULT_FREQUENCIES, TOTAL_CARDS
+        )
+        state.tracker.observe(0, hand)
         _recompute_distribution(state)
         return
 
-    # ── hand slot already exists: detect what the opponent played last turn ───
+    # ── diff against the last time we held this hand position ────────────────
+    # (for a hand slot we've seen, this is what the opponent played)
+    played = state.tracker.observe(state.hand_num, hand)
+    state.enemy_cards_played.extend(played)
     if state.hand_num < len(state.hands):
-        played = find_missing(state.hands[state.hand_num], hand)
-        state.enemy_cards_played.extend(played)
         state.hands[state.hand_num] = hand.copy()
 
     # ── new hand slot (we're seeing a hand position for the first time) ───────
@@ -69,160 +69,187 @@ def _recompute_distribution(state) -> None:
     Build state.card_distribution:
       for known hands → use exact counts
       for unseen hands → estimate proportionally from remaining deck
+    The tracker keeps the running counts and caches the result, so this
+    costs nothing unless a hand changed.
     """
-    known_cards: list[str] = []
-    for h in state.hands:
-        known_cards.extend(h)
-    known_count = Counter(known_cards)
+    state.card_distribution = state.tracker.distribution
 
-    played_count = Counter(state.enemy_cards_played)
 
-    # cards accounted for = in known hands + already played by opponents
-    accounted = Counter(known_count)
-    accounted.update(played_count)
-    # also remove our own played cards
-    # (state.played_cards tracks the local player's played pile)
-
-    unseen_hands = state.player_count - len(state.hands)
-    unseen_hand_size = state.start_card_num if hasattr(state, "start_card_num") else 9
-
-    distribution: dict[str, float] = {}
-    remaining_in_deck = max(0, TOTAL_CARDS - sum(accounted.values()))
+# ── scoring / valuation ───────────────────────────────────────────────────────
+#
+# Every card in hand is scored at once: `_features` reads what the scores need
+# from the state, `_score_table` turns that into one heuristic value per card
+# id (higher is better), and the hand is a lookup into that table.
 
-    for card, total_freq in CARD_DEFAULT_FREQUENCIES.items():
-        in_known = known_count.get(card, 0)
-        if unseen_hands == 0 or remaining_in_deck == 0:
-            distribution[card] = float(in_known)
-        else:
-            # expected cards of this type still floating in unseen hands
-            remaining_of_type = max(0, total_freq - accounted.get(card, 0))
-            proportion = remaining_of_type / remaining_in_deck
-            expected_in_unseen = proportion * unseen_hands * unseen_hand_size
-            distribution[card] = in_known + expected_in_unseen
+DUMP_SCORES = [0, 1, 3, 6, 10, 15]   # scoring for 0-5 dumplings
 
-    state.card_distribution = distribution
+# Extra value from denying an opponent a strong card; only used in 1v1
+DENY = tuple(
+    0.5 if name in {"Squid Nigiri", "Sashimi", "Pudding", "Maki Roll (3)"}
+    else 0.25 if name in {"Salmon Nigiri", "Tempura", "Wasabi", "Maki Roll (2)"}
+    else 0.0
+    for name in CARD_NAMES
+)
+DENY_CARDS = tuple(card for card in range(NUM_CARDS) if DENY[card])
 
 
-# ── scoring / valuation ───────────────────────────────────────────────────────
+def _features(state) -> tuple:
+    """The parts of `state` the card scores depend on."""
+    dist = state.card_distribution       # estimated counts across all live hands
+    player_count = state.player_count
 
-def score_card(card: str, hand: list[str], state) -> float:
+    # estimate competitors' maki
+    enemy_maki_est = (dist.get("Maki Roll (1)", 0) * 1 +
+                      dist.get("Maki Roll (2)", 0) * 2 +
+                      dist.get("Maki Roll (3)", 0) * 3) / max(player_count - 1, 1)
+    nigiri_est = (dist.get("Squid Nigiri", 0) * 3 +
+                  dist.get("Salmon Nigiri", 0) * 2 +
+                  dist.get("Egg Nigiri", 0) * 1)
+    avg_pudding = dist.get("Pudding", 0) / max(player_count, 1)
+    return (
+        # running aggregates of our own played pile this round
+        state.tempura_parity, state.sashimi_mod, state.dumplings, state.maki,
+        state.has_unused_wasabi, state.has_chopsticks,
+        dist.get("Tempura", 0), dist.get("Sashimi", 0), enemy_maki_est, nigiri_est,
+        state.round, state.puddings < avg_pudding,
+        player_count <= 2,
+    )
+
+
+def _score_table(hand_counts: list[int], turns_left: int, features: tuple) -> list[float]:
     """
-    Return a heuristic value for playing `card` given the current game state.
-    Higher is better.
+    Heuristic value of playing each card type in the hand, by card id, for a
+    hand with these counts (0.0 for types it doesn't hold). `turns_left` is
+    picks remaining after this one.
     """
-    played = state.played_cards          # our own played pile this round
-    round_num = state.round              # 1-3
-    player_count = state.player_count
-    dist = state.card_distribution       # estimated counts across all live hands
-
-    tempura_count  = played.count("Tempura")
-    sashimi_count  = played.count("Sashimi")
-    dumpling_count = played.count("Dumpling")
-    wasabi_played  = state.has_unused_wasabi
-    has_chopsticks = state.has_chopsticks
-
-    # turns remaining in this round (hand sizes shrink by 1 each turn)
-    turns_left = len(hand) - 1
+    (tempura_odd, sashimi_mod, dumpling_count, my_maki, wasabi_played,
+     has_chopsticks, tempura_dist, sashimi_dist, enemy_maki_est, nigiri_est,
+     round_num, behind_on_pudding, deny) = features
+    scores = [0.0] * NUM_CARDS
 
     # ── Tempura ──────────────────────────────────────────────────────────────
-    if card == "Tempura":
-        need = 2 - (tempura_count % 2)  # 1 if we have odd, 2 if we have even
+    if hand_counts[TEMPURA]:
         # probability another tempura will come through
-        tempura_in_play = dist.get("Tempura", 0) - hand.count("Tempura")
-        reach = min(turns_left, tempura_in_play)
-        if need == 1:          # one more completes a pair → 5 pts
-            return 4.5
-        elif reach >= 1:       # can likely complete a pair later
-            return 3.0
+        reach = min(turns_left, tempura_dist - hand_counts[TEMPURA])
+        if tempura_odd:            # one more completes a pair → 5 pts
+            scores[TEMPURA] = 4.5
+        elif reach >= 1:           # can likely complete a pair later
+            scores[TEMPURA] = 3.0
         else:
-            return 0.5         # won't complete; nearly worthless
+            scores[TEMPURA] = 0.5  # won't complete; nearly worthless
 
     # ── Sashimi ──────────────────────────────────────────────────────────────
-    if card == "Sashimi":
-        need = 3 - (sashimi_count % 3)
-        sashimi_in_play = dist.get("Sashimi", 0) - hand.count("Sashimi")
+    if hand_counts[SASHIMI]:
+        need = 3 - sashimi_mod
+        sashimi_in_play = sashimi_dist - hand_counts[SASHIMI]
         if need == 1:
-            return 5.0         # one away from 10 pts
+            scores[SASHIMI] = 5.0  # one away from 10 pts
         elif need == 2 and sashimi_in_play >= 2 and turns_left >= 2:
-            return 3.5
+            scores[SASHIMI] = 3.5
         elif need == 3 and sashimi_in_play >= 3 and turns_left >= 3:
-            return 2.5
+            scores[SASHIMI] = 2.5
         else:
-            return 0.3         # can't complete triple
+            scores[SASHIMI] = 0.3  # can't complete triple
 
     # ── Dumpling ─────────────────────────────────────────────────────────────
-    if card == "Dumpling":
-        # scoring: 1,3,6,10,15 for 1-5 dumplings
-        DUMP_SCORES = [0, 1, 3, 6, 10, 15]
+    if hand_counts[DUMPLING]:
         current_score = DUMP_SCORES[min(dumpling_count, 5)]
         next_score    = DUMP_SCORES[min(dumpling_count + 1, 5)]
-        marginal      = next_score - current_score
-        return float(marginal)
+        scores[DUMPLING] = float(next_score - current_score)
 
     # ── Maki Rolls ───────────────────────────────────────────────────────────
-    if card.startswith("Maki Roll"):
-        value = int(card.split("(")[1].rstrip(")"))
-        my_maki = sum(
-            int(c.split("(")[1].rstrip(")")) for c in played if c.startswith("Maki Roll")
-        )
-        # estimate competitors' maki
-        enemy_maki_est = (dist.get("Maki Roll (1)", 0) * 1 +
-                          dist.get("Maki Roll (2)", 0) * 2 +
-                          dist.get("Maki Roll (3)", 0) * 3) / max(player_count - 1, 1)
-        projected = my_maki + value
-        # higher maki value cards are intrinsically better
-        base = value * 1.2
-        if projected > enemy_maki_est:
-            base += 2.0        # likely winning maki
-        elif projected == enemy_maki_est:
-            base += 0.5
-        return base
+    for card in MAKI:
+        if hand_counts[card]:
+            value = MAKI_VALUE[card]
+            projected = my_maki + value
+            # higher maki value cards are intrinsically better
+            base = value * 1.2
+            if projected > enemy_maki_est:
+                base += 2.0        # likely winning maki
+            elif projected == enemy_maki_est:
+                base += 0.5
+            scores[card] = base
 
     # ── Nigiri ───────────────────────────────────────────────────────────────
-    NIGIRI_BASE = {"Egg Nigiri": 1, "Salmon Nigiri": 2, "Squid Nigiri": 3}
-    if card in NIGIRI_BASE:
-        base_val = NIGIRI_BASE[card]
-        if wasabi_played:
-            return base_val * 3 + 1   # triple on wasabi; +1 priority bonus
-        return float(base_val)
+    if wasabi_played:
+        scores[EGG], scores[SALMON], scores[SQUID] = 4.0, 7.0, 10.0   # triple on wasabi; +1 priority bonus
+    else:
+        scores[EGG], scores[SALMON], scores[SQUID] = 1.0, 2.0, 3.0
 
     # ── Wasabi ───────────────────────────────────────────────────────────────
-    if card == "Wasabi":
+    if hand_counts[WASABI]:
         if wasabi_played:
-            return -1.0        # already have unused wasabi; don't double up
-        # value is how likely we are to land a nigiri on top of it
-        nigiri_est = (dist.get("Squid Nigiri", 0) * 3 +
-                      dist.get("Salmon Nigiri", 0) * 2 +
-                      dist.get("Egg Nigiri", 0) * 1)
-        nigiri_chance = min(nigiri_est / max(turns_left, 1), 1.0)
-        return 2.0 + nigiri_chance * 4.0   # up to 6 value if nigiris are plentiful
+            scores[WASABI] = -1.0  # already have unused wasabi; don't double up
+        else:
+            # value is how likely we are to land a nigiri on top of it
+            nigiri_chance = min(nigiri_est / max(turns_left, 1), 1.0)
+            scores[WASABI] = 2.0 + nigiri_chance * 4.0   # up to 6 value if nigiris are plentiful
 
     # ── Pudding ──────────────────────────────────────────────────────────────
-    if card == "Pudding":
+    if hand_counts[PUDDING]:
         # worth more in later rounds and when we need catch-up
         base = 1.5
         if round_num == 3:
-            base = 3.0         # last round, pudding delta matters most
+            base = 3.0             # last round, pudding delta matters most
         elif round_num == 2:
             base = 2.0
         # boost if we have fewer puddings than estimated average
-        avg_pudding = dist.get("Pudding", 0) / max(player_count, 1)
-        if state.puddings < avg_pudding:
+        if behind_on_pudding:
             base += 1.5
-        return base
+        scores[PUDDING] = base
 
     # ── Chopsticks ───────────────────────────────────────────────────────────
-    if card == "Chopsticks":
-        if has_chopsticks:
-            return -1.0        # already have chopsticks; useless second copy
-        if turns_left <= 1:
-            return -1.0        # no time to use them
-        return 1.0 + turns_left * 0.3   # more valuable early in round
+    if has_chopsticks:
+        scores[CHOPSTICKS] = -1.0    # already have chopsticks; useless second copy
+    elif turns_left <= 1:
+        scores[CHOPSTICKS] = -1.0    # no time to use them
+    else:
+        scores[CHOPSTICKS] = 1.0 + turns_left * 0.3   # more valuable early in round
+
+    # ── deny value: how much do we hurt an opponent by taking this card ─────
+    if deny:
+        for card in DENY_CARDS:
+            scores[card] += DENY[card]
+    return scores
+
+
+def _hand_scores(hand: list[str], features: tuple) -> list[float]:
+    table = _score_table(counts_of_names(hand), len(hand) - 1, features)
+    return [table[CARD_IDS[card]] for card in hand]
+
+
+def score_hand(hand: list[str], state) -> list[float]:
+    """
+    Score every card in `hand`, in hand order. Reads the tracking in
+    `state` but doesn't update it (see `update_state`).
+    """
+    return _hand_scores(hand, _features(state))
+
 
-    return 0.0   # unknown card
+def decide_batch(hands: list[list[str]], states: list) -> list[list[float]]:
+    """
+    Score vectors for many positions in one call, e.g. every candidate a
+    search is weighing. `states[i]` goes with `hands[i]`; positions that
+    share a state object read its features once.
+    """
+    seen: dict[int, tuple] = {}
+    vectors = []
+    for hand, state in zip(hands, states):
+        features = seen.get(id(state))
+        if features is None:
+            features = seen[id(state)] = _features(state)
+        vectors.append(_hand_scores(hand, features))
+    return vectors
 
 
-# ── deny value: how much do we hurt an opponent by taking this card ───────────
+def score_card(card: str, hand: list[str], state) -> float:
+    """
+    Return a heuristic value for playing `card` given the current game state.
+    Higher is better. Leaves out the 1v1 deny bonus (see `deny_value`).
+    """
+    features = _features(state)[:-1] + (False,)
+    return _score_table(counts_of_names(hand), len(hand) - 1, features)[CARD_IDS[card]]
+
 
 def deny_value(card: str, dist: dict[str, float], player_count: int) -> float:
     """
@@ -231,27 +258,18 @@ def deny_value(card: str, dist: dict[str, float], player_count: int) -> float:
     """
     if player_count > 2:
         return 0.0
-    HIGH_DENY = {"Squid Nigiri", "Sashimi", "Pudding", "Maki Roll (3)"}
-    MED_DENY  = {"Salmon Nigiri", "Tempura", "Wasabi", "Maki Roll (2)"}
-    if card in HIGH_DENY:
-        return 0.5
-    if card in MED_DENY:
-        return 0.25
-    return 0.0
+    return DENY[CARD_IDS[card]]
 
 
 # ── main decide function ──────────────────────────────────────────────────────
 
-def decide(hand: list[str], state) -> int:
+def prepare(hand: list[str], state) -> Optional[int]:
     """
-    Choose the best card index to play.
-
-    Args:
-        hand:  list of card name strings in the player's current hand
-        state: GameState object (mutated in place for tracking)
+    Per-turn work before scoring: update tracking, advance hand_num, and
+    search the 1v1 endgame.
 
     Returns:
-        0-based index into hand
+        The index to play if the endgame search settled it, else None
     """
     # ── 1. update tracking ────────────────────────────────────────────────────
     update_state(hand, state)
@@ -259,15 +277,25 @@ def decide(hand: list[str], state) -> int:
     # ── 2. advance hand_num for next call ─────────────────────────────────────
     state.hand_num = (state.hand_num + 1) % state.player_count
 
-    # ── 3. score every card in hand ──────────────────────────────────────────
-    best_index = 0
-    best_score = float("-inf")
+    # ── 3. exact endgame search in 1v1 (both hands are known) ────────────────
+    return endgame.best_index(hand, state)
+
+
+def decide(hand: list[str], state) -> int:
+    """
+    Choose the best card index to play.
+
+    Args:
+        hand:  list of card name strings in the player's current hand
+        state: GameState object (mutated in place for tracking)
 
-    for i, card in enumerate(hand):
-        s = score_card(card, hand, state)
-        s += deny_value(card, state.card_distribution, state.player_count)
-        if s > best_score:
-            best_score = s
-            best_index = i
+    Returns:
+        0-based index into hand
+    """
+    exact = prepare(hand, state)
+    if exact is not None:
+        return exact
 
-    return best_index
\ No newline at end of file
+    # ── 4. score every card in hand, play the first best ────────────────────
+    scores = score_hand(hand, state)
+    return max(range(len(hand)), key=scores.__getitem__)
@@ -1,4 +1,4 @@
-from Drake_client import GameState
+from sushi_go_client import GameState
 players = {
     10:2,
     9:3,
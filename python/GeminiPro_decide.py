@@ -1,89 +1,111 @@
 from collections import Counter
 
+from cards import (
+    CARD_IDS, CHOPSTICKS, DUMPLING, EGG, MAKI, MAKI_VALUE, NUM_CARDS, PUDDING, SALMON,
+    SASHIMI, SQUID, TEMPURA, WASABI, nigiri_total,
+)
+
 def decide(hand: list[str], state) -> int:
     """
     Evaluates the current hand against the game state using a 6-tier priority hierarchy.
     Returns the integer index of the optimal card to draft.
     """
-    best_index = 0
-    highest_score = -999
+    scores = score_hand(hand, state)
+    # Ties go to the earliest card
+    return max(range(len(hand)), key=scores.__getitem__)
+
+
+def score_hand(hand: list[str], state) -> list[int]:
+    """The tier score of every card in `hand`, in hand order."""
+    table = _score_table(len(hand), _features(state))
+    return [table[CARD_IDS[card]] for card in hand]
+
+
+def decide_batch(hands: list[list[str]], states: list) -> list[list[int]]:
+    """
+    Score vectors for many (hand, state) positions in one call. Positions
+    that share a state object read it once.
+    """
+    seen: dict[int, tuple] = {}
+    vectors = []
+    for hand, state in zip(hands, states):
+        features = seen.get(id(state))
+        if features is None:
+            features = seen[id(state)] = _features(state)
+        table = _score_table(len(hand), features)
+        vectors.append([table[CARD_IDS[card]] for card in hand])
+    return vectors
+
 
+def _features(state) -> tuple:
     # Track current board state
-    my_played = Counter(state.played_cards if state.played_cards else [])
+    my_played = state.played_counts  # count vector, indexed by card id
     enemy_played = Counter(state.enemy_cards_played if state.enemy_cards_played else [])
     
     # Check for empty Wasabi
-    my_nigiri_count = my_played["Squid Nigiri"] + my_played["Salmon Nigiri"] + my_played["Egg Nigiri"]
-    has_empty_wasabi = my_played["Wasabi"] > my_nigiri_count
+    my_nigiri_count = nigiri_total(my_played)
+    has_empty_wasabi = my_played[WASABI] > my_nigiri_count
     
     enemy_nigiri_count = enemy_played["Squid Nigiri"] + enemy_played["Salmon Nigiri"] + enemy_played["Egg Nigiri"]
     enemy_has_empty_wasabi = enemy_played["Wasabi"] > enemy_nigiri_count
 
-    cards_left = len(hand)
-
-    for i, card in enumerate(hand):
-        score = 0
-        
-        # 1. IMMEDIATE HIGH-YIELD COMPLETION (Guaranteed points)
-        if has_empty_wasabi and card == "Squid Nigiri":
-            score += 100  # 9 pts
-        elif my_played["Sashimi"] % 3 == 2 and card == "Sashimi":
-            score += 95   # 10 pts
-        elif my_played["Tempura"] % 2 == 1 and card == "Tempura":
-            score += 90   # 5 pts
-        elif has_empty_wasabi and card == "Salmon Nigiri":
-            score += 85   # 6 pts
-        elif has_empty_wasabi and card == "Egg Nigiri":
-            score += 80   # 3 pts
-            
-        # 2. CRITICAL HATE-DRAFTING (Denial)
-        elif card == "Sashimi" and enemy_played["Sashimi"] >= 2:
-            score += 75   # Deny 10 points
-        elif card == "Squid Nigiri" and enemy_has_empty_wasabi:
-            score += 70   # Deny 9 points
-            
-        # 3. MAKI DOMINANCE (Comparative scoring)
-        elif "Maki Roll" in card:
-            maki_val = int(card.split("(")[1][0])
-            score += 40 + (maki_val * 5) # Scale based on Maki count
-            
-        # 4. SETUP & PROBABILITY (Early round investments)
-        elif cards_left >= 7:
-            if card == "Wasabi":
-                score += 65
-            elif card == "Sashimi" and my_played["Sashimi"] % 3 == 0:
-                score += 60
-            elif card == "Tempura" and my_played["Tempura"] % 2 == 0:
-                score += 55
-                
-        # PENALTY: Avoid useless setups late in the round
-        if cards_left <= 3 and card in ["Wasabi", "Sashimi", "Tempura"]:
-            # Only penalize if it doesn't complete a set (handled in Step 1)
-            score -= 100 
-                
-        # 5. PUDDING BUFFER (Endgame mitigation)
-        elif card == "Pudding":
-            score += 30
-            if state.round == 3:
-                score += 20 # Critical in final round to avoid -4 pts
-                
-        # 6. CHOPSTICKS EFFICIENCY
-        elif card == "Chopsticks":
-            if cards_left >= 7: 
-                score += 50
-            else:
-                score -= 100 # Never draft late
-                
-        # BASE SCORING (Fallbacks if no high-priority conditions are met)
-        if score == 0:
-            if card == "Squid Nigiri": score += 25
-            elif card == "Dumpling": score += 15 + (my_played["Dumpling"] * 5)
-            elif card == "Salmon Nigiri": score += 10
-            elif card == "Egg Nigiri": score += 5
-            
-        # Update best card
-        if score > highest_score:
-            highest_score = score
-            best_index = i
-
-    return best_index
\ No newline at end of file
+    return (has_empty_wasabi, enemy_has_empty_wasabi, enemy_played["Sashimi"],
+            state.sashimi_mod, state.tempura_parity, state.round, state.dumplings)
+
+
+def _score_table(cards_left: int, features: tuple) -> list[int]:
+    """The score of each card type, by card id, with `cards_left` in hand."""
+    (has_empty_wasabi, enemy_has_empty_wasabi, enemy_sashimi,
+     sashimi_mod, tempura_parity, round_num, dumplings) = features
+    score = [0] * NUM_CARDS
+    setup = cards_left >= 7
+    late = cards_left <= 3
+
+    # 1. IMMEDIATE HIGH-YIELD COMPLETION (Guaranteed points)
+    # 2. CRITICAL HATE-DRAFTING (Denial)
+    # BASE SCORING (Fallbacks if no high-priority conditions are met)
+    if has_empty_wasabi:
+        score[SQUID] = 100    # 9 pts
+        score[SALMON] = 85    # 6 pts
+        score[EGG] = 80       # 3 pts
+    else:
+        score[SQUID] = 70 if enemy_has_empty_wasabi else 25   # Deny 9 points
+        score[SALMON] = 10
+        score[EGG] = 5
+
+    if sashimi_mod == 2:
+        score[SASHIMI] = 95   # 10 pts
+    elif enemy_sashimi >= 2:
+        score[SASHIMI] = 75   # Deny 10 points
+    # 4. SETUP & PROBABILITY (Early round investments)
+    elif setup and sashimi_mod == 0:
+        score[SASHIMI] = 60
+
+    if tempura_parity:
+        score[TEMPURA] = 90   # 5 pts
+    elif setup:
+        score[TEMPURA] = 55
+
+    if setup:
+        score[WASABI] = 65
+
+    # 3. MAKI DOMINANCE (Comparative scoring)
+    for card in MAKI:
+        score[card] = 40 + (MAKI_VALUE[card] * 5) # Scale based on Maki count
+
+    # PENALTY: Avoid useless setups late in the round
+    if late:
+        # Only penalize if it doesn't complete a set (handled in Step 1)
+        for card in (WASABI, SASHIMI, TEMPURA):
+            score[card] -= 100
+
+    # 5. PUDDING BUFFER (Endgame mitigation)
+    score[PUDDING] = 30
+    if round_num == 3:
+        score[PUDDING] += 20 # Critical in final round to avoid -4 pts
+
+    # 6. CHOPSTICKS EFFICIENCY
+    score[CHOPSTICKS] = 50 if setup else -100 # Never draft late
+
+    score[DUMPLING] = 15 + (dumplings * 5)
+    return score
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Sushi Go Client - ISMCTS
+
+Plays `ISMCTS_decide` with a per-move time budget and logs the search's
+iterations/sec when the game ends. Keep the budget well under the server's
+turn timeout; the network round trip comes on top of it. `--workers N` starts
+N persistent rollout processes when the client connects. `--speculate`
+searches the possible next hands of a 2-player game while the opponent
+thinks, so a correctly guessed HAND is answered at once.
+
+Usage:
+    python ISMCTS_client.py <server_host> <server_port> <game_id> <player_name> [--budget MS] [--workers N]
+                            [--speculate] [--timing PATH] [--log-level LEVEL] [--log-file PATH]
+
+Example:
+    python ISMCTS_client.py localhost 7878 abc123 MctsBot --budget 200 --workers 4
+"""
+
+import sys
+
+import ISMCTS_decide
+import client_log
+from sushi_go_client import SushiGoClient
+
+
+class ISMCTSClient(SushiGoClient):
+    """SushiGoClient that picks cards with ISMCTS."""
+
+    strategy = ISMCTS_decide
+
+    def choose_card(self, hand: list[str]) -> int:
+        index = ISMCTS_decide.decide(hand, self.state)
+        if self._wire:
+            iterations, seconds = self.state.ismcts_stats
+            self.log.debug("search: %d iterations in %.1fms", iterations, seconds * 1000)
+        return index
+
+    def handle_message(self, message: str):
+        if message.startswith("GAME_END"):
+            self.log.info("%s", ISMCTS_decide.SEARCH.report())
+        return super().handle_message(message)
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) < 4:
+        print("Usage: python ISMCTS_client.py <host> <port> <game_id> <player_name> [--budget MS] [--workers N] [--speculate] [--timing PATH] "
+              "[--log-level LEVEL] [--log-file PATH]")
+        print("Example: python ISMCTS_client.py localhost 7878 abc123 MctsBot --budget 200 --workers 4")
+        sys.exit(1)
+
+    host, port, game_id, player_name = args[0], int(args[1]), args[2], args[3]
+    args = args[4:]
+    workers = 0
+    speculate = False
+    timing = None
+    level = "INFO"
+    log_file = None
+    while args:
+        arg = args.pop(0)
+        if arg == "--budget":
+            ISMCTS_decide.SEARCH.budget = float(args.pop(0)) / 1000
+        elif arg == "--workers":
+            workers = int(args.pop(0))
+        elif arg == "--speculate":
+            speculate = True
+        elif arg == "--timing":
+            timing = args.pop(0)
+        elif arg == "--log-level":
+            level = args.pop(0)
+        elif arg == "--log-file":
+            log_file = args.pop(0)
+
+    client_log.configure(level, log_file)
+    client = ISMCTSClient(host, port, rollout_workers=workers, timing=timing, speculate=speculate)
+    client.run(game_id, player_name)
+
+
+if __name__ == "__main__":
+    main()
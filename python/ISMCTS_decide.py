@@ -0,0 +1,337 @@
+"""
+Information-set Monte Carlo tree search for Sushi Go.
+
+Each iteration samples a determinization: the opponents' hands are drawn from
+the live-card estimate that ClaudeV3's `_recompute_distribution` keeps in
+`state.card_distribution`, minus our own hand. The tree branches on our picks
+only (single-observer ISMCTS); opponents move by a fast priority policy
+modelled on ClaudeV3's scores, and the rest of the round is rolled out with
+the same policy for every seat. Selection uses UCB1 with availability counts,
+since which of our picks are legal depends on the determinization.
+
+Each iteration clones a `SearchState` holding our tableau, deals the
+determinization into it and plays the turns with `make`. The reward is its
+`margin`: our round points minus the opponents' mean, including maki
+majority and a fixed value per pudding. Opponents' tableaus are unknown and
+start empty.
+
+The subtree under the card we played is kept on the state and becomes the
+next turn's root, so work carries over within a round. Every search stops at
+the per-move budget; `SEARCH.report()` gives iterations/sec. When
+`rollout_pool` is running, its workers search alongside and their root
+visits are added to ours.
+
+Usage:
+    python ISMCTS_decide.py [--budget MS] [--games N] [--players P] [--workers N] [opponent]
+
+Example:
+    python ISMCTS_decide.py --budget 50 --games 20 ClaudeV3_decide
+"""
+
+import math
+import random
+import sys
+import time
+from typing import Optional, Sequence
+
+import endgame
+import rollout_pool
+from cards import CARD_NAMES as CARDS
+from cards import (TEMPURA, SASHIMI, DUMPLING, PUDDING, WASABI, CHOPSTICKS,
+                   NIGIRI, NUM_CARDS, counts_of_names)
+from ClaudeV3_decide import update_state
+from search_state import ROW, SearchState
+from sushi_go_engine import CARD_DEFAULT_FREQUENCIES
+
+# ── constants ─────────────────────────────────────────────────────────────────
+
+TIME_BUDGET_MS = 50.0        # per move
+EXPLORATION = 0.7            # UCB1 constant, in reward units
+REWARD_SCALE = 10.0          # points per reward unit
+
+# ClaudeV3's base priorities plus face value for maki
+PRIORITY = (6, 7, 8, 3, 5, 7, 1, 9, 10, 5, 11, 0)
+DUMPLING_MARGINAL = endgame.DUMPLING_MARGINAL
+DECK_WEIGHTS = tuple(CARD_DEFAULT_FREQUENCIES[card] for card in CARDS)
+
+
+# ── default policy ────────────────────────────────────────────────────────────
+
+def _policy(hands: list, hand: int, table: Sequence[int], row: int, round_num: int) -> int:
+    """
+    Highest-priority card in the 12 counts at `hands[hand:]` for the
+    tableau at `table[row:]` (flat `SearchState` lists, or one hand and
+    one tableau at offset 0).
+    """
+    tempura, sashimi, dumplings, wasabi = table[row:row + 4]
+    best, best_score = -1, -1e9
+    for card in range(12):
+        if not hands[hand + card]:
+            continue
+        score = PRIORITY[card]
+        if card in NIGIRI:
+            if wasabi:
+                score += 20
+        elif card == TEMPURA:
+            if tempura:
+                score += 10
+        elif card == SASHIMI:
+            score += (0, 5, 10)[sashimi]
+        elif card == DUMPLING:
+            score += DUMPLING_MARGINAL[dumplings] + 2 * dumplings
+        elif card == PUDDING:
+            score += round_num
+        elif card == WASABI:
+            if wasabi:
+                score -= 13
+        elif card == CHOPSTICKS:
+            score -= 10
+        if score > best_score:
+            best, best_score = card, score
+    return best
+
+
+def _picks(sim: SearchState, seats: range, round_num: int) -> list:
+    hands, table = sim.hands, sim.table
+    return [_policy(hands, seat * NUM_CARDS, table, seat * ROW, round_num) for seat in seats]
+
+
+# ── search ────────────────────────────────────────────────────────────────────
+
+def _ucb(node) -> float:
+    return (node.total / node.visits
+            + EXPLORATION * math.sqrt(math.log(node.available) / node.visits))
+
+
+class Node:
+    """Statistics for one of our picks, reached through our earlier picks."""
+
+    __slots__ = ("children", "visits", "total", "available")
+
+    def __init__(self):
+        self.children: dict[int, "Node"] = {}
+        self.visits = 0
+        self.total = 0.0
+        self.available = 0
+
+
+class ISMCTS:
+    """Determinized single-observer ISMCTS with a wall-clock budget."""
+
+    def __init__(self, budget_ms: float = TIME_BUDGET_MS, rng: Optional[random.Random] = None):
+        """
+        Args:
+            budget_ms: Wall-clock budget per move
+            rng: Random source for determinizations (module `random` if omitted)
+        """
+        self.budget = budget_ms / 1000
+        self.rng = rng or random.Random()
+        self.last_iterations = 0
+        self.last_seconds = 0.0
+        self.total_iterations = 0
+        self.total_seconds = 0.0
+        self.moves = 0
+
+    def search(self, root: Node, hand: list, pool: list, tableau: tuple,
+               player_count: int, round_num: int, parallel=None) -> int:
+        """
+        Search from `root` until the budget is spent; return the most
+        visited card id that is in `hand`.
+
+        Args:
+            root: Tree root (possibly reused from the previous turn)
+            hand: Our 12-slot card counts
+            pool: Estimated counts of the cards in opponents' hands
+            tableau: Our tableau tuple (see `endgame.place`)
+            player_count: Seats at the table
+            round_num: Current round, for the pudding priority
+            parallel: Optional `rollout_pool.RolloutPool`; its workers
+                      search fresh trees alongside ours and their root
+                      visits are added in
+        """
+        snapshot = (tuple(hand), tuple(pool), tableau, player_count, round_num)
+        start = time.perf_counter()
+        deadline = time.monotonic() + self.budget
+        pending = parallel.submit(snapshot, deadline) if parallel else None
+        iterations = self.run(root, *snapshot, deadline=deadline)
+        visits = {card: child.visits for card, child in root.children.items()}
+        if pending is not None:
+            stats, remote = pending.get()
+            iterations += remote
+            for card, (count, _) in stats.items():
+                visits[card] = visits.get(card, 0) + count
+        elapsed = time.perf_counter() - start
+
+        self.last_iterations, self.last_seconds = iterations, elapsed
+        self.total_iterations += iterations
+        self.total_seconds += elapsed
+        self.moves += 1
+
+        legal = [card for card in range(12) if hand[card] and card in visits]
+        if not legal:
+            return _policy(hand, 0, tableau, 0, round_num)
+        return max(legal, key=visits.get)
+
+    def run(self, root: Node, hand, pool, tableau, player_count, round_num,
+            deadline: Optional[float] = None) -> int:
+        """
+        Iterate from `root` until `deadline` (a `time.monotonic()` value,
+        default now + budget); returns the iteration count.
+        """
+        if deadline is None:
+            deadline = time.monotonic() + self.budget
+        size = sum(hand)
+        base = SearchState(player_count)
+        base.set_row(0, tableau)
+        iterations = 0
+        while True:
+            self._iterate(root, base, hand, pool, round_num, size)
+            iterations += 1
+            if time.monotonic() >= deadline:
+                return iterations
+
+    def _determinize(self, hand, pool, player_count, size) -> list:
+        weights = list(pool)
+        if sum(weights) < size * (player_count - 1):
+            weights = [max(w, d) for w, d in zip(weights, DECK_WEIGHTS)]
+        hands = [list(hand)]
+        choices = self.rng.choices
+        for _ in range(player_count - 1):
+            opp = [0] * 12
+            for _ in range(size):
+                card = choices(range(12), weights)[0]
+                opp[card] += 1
+                weights[card] = max(0.0, weights[card] - 1)
+                if not any(weights):
+                    weights = list(DECK_WEIGHTS)
+            hands.append(opp)
+        return hands
+
+    def _iterate(self, root, base, hand, pool, round_num, size):
+        # Opponents' tableaus are unknown and start empty
+        sim = base.clone()
+        for seat, counts in enumerate(self._determinize(hand, pool, sim.players, size)):
+            sim.set_hand(seat, counts)
+        opponents = range(1, sim.players)
+        node, path = root, [root]
+
+        # Selection / expansion: branch on our picks only
+        while sim.cards_left():
+            ours = sim.hand(0)
+            legal = [card for card in range(12) if ours[card]]
+            for card in legal:
+                if card in node.children:
+                    node.children[card].available += 1
+            untried = [card for card in legal if card not in node.children]
+            if untried:
+                card = self.rng.choice(untried)
+                child = node.children[card] = Node()
+                child.available = 1
+            else:
+                card = max(legal, key=lambda c: _ucb(node.children[c]))
+                child = node.children[card]
+            sim.make([card] + _picks(sim, opponents, round_num), undo=False)
+            node = child
+            path.append(node)
+            if untried:
+                break
+
+        # Rollout with the default policy for every seat
+        seats = range(sim.players)
+        while sim.cards_left():
+            sim.make(_picks(sim, seats, round_num), undo=False)
+
+        reward = sim.margin(0, endgame.PUDDING_VALUE) / REWARD_SCALE
+        for visited in path:
+            visited.visits += 1
+            visited.total += reward
+
+    def report(self) -> str:
+        """One-line summary of search throughput so far."""
+        if not self.moves:
+            return "ISMCTS: no searches yet"
+        rate = self.total_iterations / max(self.total_seconds, 1e-9)
+        return (
+            f"ISMCTS: {self.total_iterations} iterations over {self.moves} moves "
+            f"in {self.total_seconds:.2f}s ({rate:,.0f} it/s, "
+            f"{self.total_iterations / self.moves:,.0f} per move)"
+        )
+
+
+SEARCH = ISMCTS()
+
+
+# ── public entry point ────────────────────────────────────────────────────────
+
+def decide(hand: list, state, search: ISMCTS = SEARCH) -> int:
+    """
+    Returns the 0-based index of the card ISMCTS visits most in its budget.
+    """
+    update_state(hand, state)
+    state.hand_num = (state.hand_num + 1) % state.player_count
+
+    counts = counts_of_names(hand)
+    pool = [
+        max(0.0, state.card_distribution.get(card, 0) - counts[i])
+        for i, card in enumerate(CARDS)
+    ]
+
+    # Reuse the subtree under last turn's pick if this is the next turn
+    root = None
+    saved = getattr(state, "ismcts_tree", None)
+    if saved is not None and state.played_cards:
+        round_num, turn, card, node = saved
+        if (round_num, turn + 1, CARDS[card]) == (state.round, state.turn, state.played_cards[-1]):
+            root = node.children.get(card)
+    root = root or Node()
+
+    card = search.search(
+        root, counts, pool, endgame.tableau_of(state.played_ids),
+        state.player_count, state.round, parallel=rollout_pool.active(),
+    )
+    state.ismcts_tree = (state.round, state.turn, card, root)
+    state.ismcts_stats = (search.last_iterations, search.last_seconds)
+    return hand.index(CARDS[card])
+
+
+def main():
+    from sushi_go_engine import load_strategy, play_game
+
+    args = sys.argv[1:]
+    games = 10
+    players = 2
+    opponent = "ClaudeV3_decide"
+    while args:
+        arg = args.pop(0)
+        if arg == "--budget":
+            SEARCH.budget = float(args.pop(0)) / 1000
+        elif arg == "--games":
+            games = int(args.pop(0))
+        elif arg == "--players":
+            players = int(args.pop(0))
+        elif arg == "--workers":
+            rollout_pool.start(int(args.pop(0)))
+        else:
+            opponent = arg
+
+    rival = load_strategy(opponent)
+    wins = 0
+    margins = []
+    for g in range(games):
+        # Rotate our seat so no seat has an edge
+        seat = g % players
+        strategies = [rival] * players
+        strategies[seat] = decide
+        result = play_game(strategies)
+        wins += seat in result.winners
+        others = [s for i, s in enumerate(result.scores) if i != seat]
+        margins.append(result.scores[seat] - sum(others) / len(others))
+        print(f"game {g + 1}: scores {result.scores} (ISMCTS seat {seat})")
+
+    print(f"\nvs {opponent}: won {wins}/{games}, mean margin {sum(margins) / games:+.1f}")
+    print(SEARCH.report())
+    print(f"budget {SEARCH.budget * 1000:.0f}ms per move")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import random
 from collections import Counter
 
+from cards import CARD_IDS, CARD_NAMES, MAKI, MAKI_VALUE, NIGIRI, PUDDING, SASHIMI, TEMPURA
+
 players = {
     10:2,
     9:3,
@@ -75,9 +77,9 @@ CARD_PRIORITY = {
 dumpling_scale = [1,2,3,4,5]
 
 
-def decide(hand: list[str], state):
+def prepare(hand: list[str], state):
     """
-    The main decision-making function for the Gemini bot.
+    Update the hand tracking in `state` for the hand just received.
     """
     if state.hands is None:
         state.player_count = players[len(hand)]
@@ -116,55 +118,88 @@ def decide(hand: list[str], state):
         
         count = Counter(temp)
         state.card_distribution = dict(count)
-    
 
-    # First, let's analyze our current played cards and hand
-    played_cards = state.played_cards
-    hand_counts = Counter(hand)
-    played_counts = Counter(played_cards)
 
-    # Calculate the priority of each card in the hand
-    priorities = {}
-    for i, card in enumerate(hand):
-        priorities[i] = get_card_priority(card, hand_counts, played_counts, state)
+# The priorities don't depend on the hand, so each state gets one table by
+# card id and every card in hand is a lookup into it.
+BASE_PRIORITY = tuple(CARD_PRIORITY[name] for name in CARD_NAMES)
 
-    # Choose the card with the highest priority
-    best_card_index = max(priorities, key=priorities.get)
+
+def decide(hand: list[str], state):
+    """
+    The main decision-making function for the Gemini bot.
+    """
+    prepare(hand, state)
+
+    # Choose the first card with the highest priority
+    priorities = score_hand(hand, state)
+    best_card_index = max(range(len(hand)), key=priorities.__getitem__)
 
     return best_card_index
 
 
+def score_hand(hand: list[str], state):
+    """
+    The priority of every card in the hand, in hand order.
+    """
+    table = _priorities(Counter(state.played_cards), state)
+    return [table[CARD_IDS[card]] for card in hand]
+
+
+def decide_batch(hands: list[list[str]], states: list):
+    """
+    Priority vectors for many (hand, state) positions in one call. Positions
+    that share a state object share its table.
+    """
+    tables = {}
+    vectors = []
+    for hand, state in zip(hands, states):
+        table = tables.get(id(state))
+        if table is None:
+            table = tables[id(state)] = _priorities(Counter(state.played_cards), state)
+        vectors.append([table[CARD_IDS[card]] for card in hand])
+    return vectors
+
+
 def get_card_priority(card, hand_counts, played_counts, state):
     """
     Calculates the priority of a single card based on the game state.
     """
-    priority = CARD_PRIORITY.get(card, 0)
+    return _priorities(played_counts, state)[CARD_IDS[card]]
+
+
+def _priorities(played_counts, state):
+    """
+    The priority of each card type, by card id. Tempura and Sashimi read
+    the distribution, which counts them only when they are in a known hand.
+    """
+    priority = list(BASE_PRIORITY)
+    dist = state.card_distribution
 
     # Wasabi + Nigiri: High priority to play a Nigiri on a Wasabi
-    if "Wasabi" in played_counts and card in ["Egg Nigiri", "Salmon Nigiri", "Squid Nigiri"]:
-        priority += 20
+    if "Wasabi" in played_counts:
+        for card in NIGIRI:
+            priority[card] += 20
 
     # Tempura: Higher priority if we already have one
-    if card == "Tempura" and int(state.card_distribution["Tempura"]) % 2 == 0:
-        priority += 10
+    if "Tempura" in dist and int(dist["Tempura"]) % 2 == 0:
+        priority[TEMPURA] += 10
 
     # Sashimi: Higher priority if we have one or two already
-    if card == "Sashimi" and 0 < int(state.card_distribution["Sashimi"]) % 3 and played_counts["Sashimi"] % 3 == 1:
-        priority += 2
-
-    if card == "Sashimi" and 0 < int(state.card_distribution["Sashimi"]) % 3 and played_counts["Sashimi"] % 3 == 2:
-        priority += 20
-
-    # Dumplings: Value increases with each one
-    priority += played_counts["Dumpling"] * 2
+    if "Sashimi" in dist and 0 < int(dist["Sashimi"]) % 3:
+        if played_counts["Sashimi"] % 3 == 1:
+            priority[SASHIMI] += 2
+        if played_counts["Sashimi"] % 3 == 2:
+            priority[SASHIMI] += 20
 
     # Maki Rolls: Value depends on what others have played (a more complex addition)
     # For now, a simple bonus based on the number of rolls
-    if "Maki Roll" in card:
-      priority += int(card.split("(")[1][0])
+    for card in MAKI:
+        priority[card] += MAKI_VALUE[card]
 
     # Pudding: important for end-game, but not urgent mid-round
-    if card == "Pudding":
-        priority += state.round
+    priority[PUDDING] += state.round
 
-    return priority
+    # Dumplings: Value increases with each one
+    bonus = played_counts["Dumpling"] * 2
+    return [value + bonus for value in priority]
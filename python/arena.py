@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Sushi Go Arena - round-robin tournament between decide modules
+
+Plays every combination of strategies at each table size, rotating seats so
+nobody benefits from a seat, across a pool of worker processes. Workers are
+started once and import every strategy up front, so each task only pays for
+the games it plays.
+
+Reports, per player count, each strategy's win rate (ties split), its mean
+score margin (own score minus the mean of its opponents) and 95% confidence
+intervals for both.
+
+Usage:
+    python arena.py [--games N] [--players 2,3,4,5] [--workers W] [--seed S] [module ...]
+
+Example:
+    python arena.py --games 100000
+    python arena.py --games 20000 --players 2 Claude_decide ClaudeV3_decide gemini_decide
+"""
+
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+from sushi_go_engine import HAND_SIZE_BY_PLAYERS, ROUNDS, load_strategy, play_game
+
+STRATEGIES = [
+    "Claude_decide",
+    "ClaudeV2_decide",
+    "ClaudeV3_decide",
+    "deepseek_decide",
+    "GeminiPro_decide",
+    "gemini_decide",
+    "LakerDawg_decide",
+    "Drake_decide",
+    "decide",
+]
+
+# Games per task; small enough to balance across workers, large enough that
+# dispatch overhead disappears.
+TASK_GAMES = 50
+
+# ── worker side ───────────────────────────────────────────────────────────────
+
+_worker_strategies: dict = {}
+_worker_faults: dict = {}
+
+
+def _guard(name, decide):
+    """Wrap decide so a crash or bad index costs a fault, not the game."""
+
+    def guarded(hand, state):
+        try:
+            choice = decide(hand, state)
+        except Exception:
+            choice = None
+        if type(choice) is int and 0 <= choice < len(hand):
+            return choice
+        if (
+            isinstance(choice, tuple)
+            and len(choice) == 2
+            and "Chopsticks" in state.played_cards
+            and all(type(i) is int and 0 <= i < len(hand) for i in choice)
+            and choice[0] != choice[1]
+        ):
+            return choice
+        _worker_faults[name] = _worker_faults.get(name, 0) + 1
+        return 0
+
+    return guarded
+
+
+def _init_worker(names):
+    for name in names:
+        _worker_strategies[name] = _guard(name, load_strategy(name))
+
+
+def _play_task(task):
+    """Play one task's games; returns (seating, per-seat stats, faults)."""
+    seating, games, seed = task
+    rng = random.Random(seed)
+    strategies = [_worker_strategies[name] for name in seating]
+    players = len(seating)
+    # per seat: [wins, wins^2, margin, margin^2]
+    sums = [[0.0, 0.0, 0.0, 0.0] for _ in seating]
+    _worker_faults.clear()
+
+    for _ in range(games):
+        result = play_game(strategies, rng)
+        total = sum(result.scores)
+        share = 1 / len(result.winners)
+        for seat, score in enumerate(result.scores):
+            win = share if seat in result.winners else 0.0
+            margin = score - (total - score) / (players - 1)
+            row = sums[seat]
+            row[0] += win
+            row[1] += win * win
+            row[2] += margin
+            row[3] += margin * margin
+
+    return seating, games, sums, dict(_worker_faults)
+
+
+# ── scheduling ────────────────────────────────────────────────────────────────
+
+def importable(names):
+    """Split names into strategies that load and (name, error) pairs that don't."""
+    ok, broken = [], []
+    for name in names:
+        try:
+            load_strategy(name)
+        except Exception as e:
+            broken.append((name, f"{type(e).__name__}: {e}"))
+        else:
+            ok.append(name)
+    return ok, broken
+
+
+def build_tasks(names, player_counts, games, seed):
+    """
+    Spread `games` over every table and seat rotation.
+
+    Each player count gets an equal share; within it every combination of
+    strategies plays every rotation of its seating equally often.
+    """
+    tables = []
+    for players in player_counts:
+        if len(names) >= players:
+            combos = list(itertools.combinations(names, players))
+        else:
+            combos = list(itertools.combinations_with_replacement(names, players))
+        combos = [c for c in combos if len(set(c)) > 1]
+        tables.append((players, combos))
+
+    tasks = []
+    rng = random.Random(seed)
+    for players, combos in tables:
+        if not combos:
+            continue
+        per_seating = max(1, games // len(player_counts) // (len(combos) * players))
+        for combo in combos:
+            for shift in range(players):
+                seating = combo[shift:] + combo[:shift]
+                remaining = per_seating
+                while remaining:
+                    chunk = min(TASK_GAMES, remaining)
+                    tasks.append((seating, chunk, rng.getrandbits(63)))
+                    remaining -= chunk
+    return tasks
+
+
+# ── reporting ─────────────────────────────────────────────────────────────────
+
+def _mean_ci(total, total_sq, n):
+    """Mean and 95% normal-approximation half-width."""
+    mean = total / n
+    if n < 2:
+        return mean, float("inf")
+    variance = max(0.0, (total_sq - n * mean * mean) / (n - 1))
+    return mean, 1.96 * math.sqrt(variance / n)
+
+
+def report(stats, faults, decisions):
+    for players in sorted(stats):
+        rows = []
+        for name, (n, wins, wins_sq, margin, margin_sq) in stats[players].items():
+            win, win_ci = _mean_ci(wins, wins_sq, n)
+            avg_margin, margin_ci = _mean_ci(margin, margin_sq, n)
+            rows.append((win, win_ci, avg_margin, margin_ci, name, n))
+        rows.sort(reverse=True)
+
+        print(f"\n{players} players (even share: {1 / players:.1%})")
+        print(f"  {'strategy':<18} {'games':>8} {'win rate':>16} {'margin':>16}")
+        for win, win_ci, avg_margin, margin_ci, name, n in rows:
+            print(
+                f"  {name:<18} {n:>8} {win:>8.1%} ±{win_ci:>5.1%} "
+                f"{avg_margin:>+8.2f} ±{margin_ci:>5.2f}"
+            )
+
+    noisy = {name: count for name, count in faults.items() if count}
+    if noisy:
+        print("\nFaults (crash or invalid index; index 0 was played instead):")
+        for name, count in sorted(noisy.items(), key=lambda item: -item[1]):
+            print(f"  {name:<18} {count:>8} ({count / decisions[name]:.1%} of decisions)")
+
+
+def run(names, player_counts, games, workers, seed):
+    tasks = build_tasks(names, player_counts, games, seed)
+    total_games = sum(task[1] for task in tasks)
+    print(f"Playing {total_games:,} games on {workers} workers...")
+
+    # stats[players][name] = [n, wins, wins^2, margin, margin^2]
+    stats: dict = {}
+    faults = {name: 0 for name in names}
+    decisions = {name: 0 for name in names}
+
+    start = time.perf_counter()
+    with Pool(workers, initializer=_init_worker, initargs=(names,)) as pool:
+        for seating, played, sums, task_faults in pool.imap_unordered(_play_task, tasks):
+            players = len(seating)
+            table = stats.setdefault(players, {})
+            hand_size = HAND_SIZE_BY_PLAYERS[players]
+            for name, seat_sums in zip(seating, sums):
+                row = table.setdefault(name, [0, 0.0, 0.0, 0.0, 0.0])
+                row[0] += played
+                for i, value in enumerate(seat_sums):
+                    row[i + 1] += value
+                decisions[name] += played * ROUNDS * hand_size
+            for name, count in task_faults.items():
+                faults[name] += count
+    elapsed = time.perf_counter() - start
+
+    report(stats, faults, decisions)
+    print(f"\n{total_games:,} games in {elapsed:.1f}s ({total_games / elapsed:,.0f} games/sec)")
+
+
+def main():
+    args = sys.argv[1:]
+    games = 10_000
+    player_counts = [2, 3, 4, 5]
+    workers = os.cpu_count() or 1
+    seed = None
+    names = []
+    while args:
+        arg = args.pop(0)
+        if arg == "--games":
+            games = int(args.pop(0))
+        elif arg == "--players":
+            player_counts = [int(p) for p in args.pop(0).split(",")]
+        elif arg == "--workers":
+            workers = int(args.pop(0))
+        elif arg == "--seed":
+            seed = int(args.pop(0))
+        elif arg.startswith("--"):
+            print("Usage: python arena.py [--games N] [--players 2,3,4,5] [--workers W] [--seed S] [module ...]")
+            sys.exit(1)
+        else:
+            names.append(arg)
+
+    names, broken = importable(names or STRATEGIES)
+    for name, error in broken:
+        print(f"Skipping {name}: {error}")
+    if len(names) < 2:
+        print("Need at least two importable strategies.")
+        sys.exit(1)
+
+    run(names, player_counts, games, workers, seed)
+
+
+if __name__ == "__main__":
+    main()
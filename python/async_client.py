@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Sushi Go Client - asyncio
+
+`AsyncSushiGoClient` plays the same protocol as `SushiGoClient`, with the
+same `GameState` tracking and `*_decide.py` strategies, over
+`asyncio.open_connection`. Both take their protocol handling from
+`ClientProtocol` and only own the I/O. JOIN, REJOIN, READY, PLAY and CHOPSTICKS are
+coroutines and every read is a `StreamReader.readline()`, so one event loop
+can hold hundreds of connections.
+
+`decide` runs where the `executor` says:
+
+    None                  inline on the event loop (right for the scoring
+                          strategies, which take µs)
+    ThreadPoolExecutor    on a worker thread; the loop keeps serving other
+                          connections while a long search runs
+    ProcessPoolExecutor   in another process, for real parallelism. The
+                          state goes over and comes back with the index, so
+                          tracking survives; per-process module state (the
+                          ISMCTS tree) is not shared. Needs a decide module:
+                          the built-in `choose_card` can't be pickled.
+
+From the command line it fills `--games` whole tables of `--players` bots
+on one loop and reports turns/sec. The local `sushi_go_server.py` creates
+the games on first JOIN.
+
+Usage:
+    python async_client.py <host> <port> [--games N] [--players P] [--prefix NAME]
+                           [--threads N | --processes N] [--log-level LEVEL] [module ...]
+
+Example:
+    python async_client.py localhost 7878 --games 100 --players 4 ClaudeV3_decide gemini_decide
+    python async_client.py localhost 7878 --games 4 --players 2 --processes 4 ISMCTS_decide
+"""
+
+import asyncio
+import importlib
+import logging
+import sys
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+import client_log
+from sushi_go_client import ClientProtocol
+from sushi_go_engine import HAND_SIZE_BY_PLAYERS, ROUNDS, decide_remote, load_strategy
+
+
+class AsyncSushiGoClient(ClientProtocol):
+    """A client whose I/O methods are coroutines on asyncio streams."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        decide_module: Optional[str] = None,
+        executor: Optional[Executor] = None,
+        verbose: bool = True,
+        timing: Optional[str] = None,
+    ):
+        """
+        Args:
+            host: Server host
+            port: Server port
+            decide_module: *_decide module to play (None: the built-in
+                           priority list in `choose_card`)
+            executor: Where decide runs; see the module docstring
+            verbose: Log every line sent and received at DEBUG
+            timing: Where to write per-phase timing JSON at GAME_END
+
+        Raises:
+            ValueError: A ProcessPoolExecutor without a decide module
+        """
+        if isinstance(executor, ProcessPoolExecutor) and decide_module is None:
+            raise ValueError("a process pool needs a decide module to run")
+        self.decide_module = decide_module
+        self._decide = None
+        if decide_module is not None:
+            self._decide = load_strategy(decide_module)
+            self.strategy = importlib.import_module(decide_module)
+        super().__init__(host, port, verbose=verbose, timing=timing)
+        self.executor = executor
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        # Lines read ahead of the STATUS reply while rejoining, for the game loop
+        self._held: deque[str] = deque()
+
+    async def connect(self):
+        """Connect to the server."""
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self._held.clear()
+        self._outstanding.clear()
+        self._wire = self.verbose and self.log.isEnabledFor(logging.DEBUG)
+        self.log.info("connected to %s:%d", self.host, self.port)
+
+    async def disconnect(self):
+        """Disconnect from the server."""
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.reader = self.writer = None
+
+    async def send(self, command: str):
+        """Send a command to the server."""
+        self.writer.write((command + "\n").encode("utf-8"))
+        await self.writer.drain()
+        if self._wire:
+            self.log.debug(">>> %s", command)
+
+    async def receive(self) -> str:
+        """Receive one line-delimited message from the server."""
+        if self._held:
+            return self._held.popleft()
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Server closed connection")
+        message = line.decode("utf-8", errors="replace").strip()
+        if self._wire:
+            self.log.debug("<<< %s", message)
+        return message
+
+    async def receive_until(self, predicate) -> str:
+        """Read lines until one matches predicate."""
+        while True:
+            message = await self.receive()
+            if message and predicate(message):
+                return message
+
+    async def join_game(self, game_id: str, player_name: str) -> bool:
+        """Join a game."""
+        await self.send(f"JOIN {game_id} {player_name}")
+        response = await self.receive_until(lambda line: line.startswith(("WELCOME", "ERROR")))
+        return self.welcome(response, player_name)
+
+    async def rejoin(self) -> bool:
+        """
+        Send REJOIN with the checkpoint's token, then STATUS, and restore the
+        state the checkpoint and STATUS agree on. Lines that arrive before
+        the STATUS reply (the resent HAND) are left for the game loop.
+        """
+        await self.send(f"REJOIN {self._record['token']}")
+        response = await self.receive_until(lambda line: line.startswith(("REJOINED", "ERROR")))
+        if response.startswith("ERROR"):
+            self.log.warning("failed to rejoin: %s", response)
+            return False
+
+        await self.send("STATUS")
+        held = []
+        while True:
+            message = await self.receive()
+            if message.startswith(("OK", "ERROR")):
+                break
+            held.append(message)
+        if not self.rejoined(message):
+            return False
+        self._held.extend(held)
+        self.log.info("rejoined as player %s", response.split()[2])
+        return True
+
+    async def signal_ready(self):
+        """Signal that we're ready to start. The OK is handled by `dispatch`."""
+        await self.send("READY")
+        self.expect_reply("READY")
+
+    async def play_card(self, card_index: int):
+        """Play a card by index. The card is recorded when the OK arrives."""
+        await self.send(f"PLAY {card_index}")
+        self.sent_move("PLAY", (card_index,))
+
+    async def play_chopsticks(self, index1: int, index2: int):
+        """Use chopsticks to play two cards. Recorded when the OK arrives."""
+        await self.send(f"CHOPSTICKS {index1} {index2}")
+        self.sent_move("CHOPSTICKS", (index1, index2))
+
+    def choose_card(self, hand: list[str]) -> int:
+        if self._decide is not None:
+            return self._decide(hand, self.state)
+        return super().choose_card(hand)
+
+    async def decide(self, hand: list[str]) -> int:
+        """`choose_card`, run on the executor if there is one."""
+        if self.executor is None:
+            return self.choose_card(hand)
+        loop = asyncio.get_running_loop()
+        if isinstance(self.executor, ProcessPoolExecutor):
+            index, self.state = await loop.run_in_executor(
+                self.executor, decide_remote, self.decide_module, hand, self.state
+            )
+            return index
+        return await loop.run_in_executor(self.executor, self.choose_card, hand)
+
+    async def play_turn(self):
+        """Play a single turn."""
+        if not self.state or not self.state.hand:
+            return
+
+        card_index = await self.decide(self.state.hand)
+        if self.timer is not None:
+            self.timer.mark("decided")
+        await self.play_card(card_index)
+
+    async def run(self, game_id: str, player_name: str) -> bool:
+        """
+        Play one game.
+
+        Returns:
+            Whether the game ran to GAME_END
+        """
+        self.log = client_log.connection(f"{player_name}@{game_id}")
+        try:
+            await self.connect()
+            if not await self.join_game(game_id, player_name):
+                return False
+            await self.signal_ready()
+
+            while True:
+                message = await self.receive()
+                if self.timer is not None and message.startswith("HAND"):
+                    self.timer.mark("line")
+                if not self.dispatch(message):
+                    self.game_over()
+                    return True
+                if message.startswith("HAND") and self.state and self.state.hand:
+                    await self.play_turn()
+
+        except Exception as e:
+            self.log.error("error: %s", e)
+            return False
+        finally:
+            await self.disconnect()
+
+
+async def play_tables(
+    host: str,
+    port: int,
+    games: int,
+    players: int,
+    modules: list[Optional[str]],
+    prefix: str,
+    executor: Optional[Executor] = None,
+) -> list[bool]:
+    """Seat `games` x `players` clients, cycling through `modules`, and play concurrently."""
+    clients = []
+    for i in range(games * players):
+        table, seat = divmod(i, players)
+        module = modules[i % len(modules)]
+        client = AsyncSushiGoClient(host, port, module, executor, verbose=False)
+        name = f"{(module or 'priority')[:12]}-{table}-{seat}"
+        clients.append(client.run(f"{prefix}-{table}", name))
+    return await asyncio.gather(*clients)
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) < 2:
+        print("Usage: python async_client.py <host> <port> [--games N] [--players P] [--prefix NAME] "
+              "[--threads N | --processes N] [--log-level LEVEL] [module ...]")
+        print("Example: python async_client.py localhost 7878 --games 100 --players 4 ClaudeV3_decide")
+        sys.exit(1)
+
+    host, port = args.pop(0), int(args.pop(0))
+    games = 1
+    players = 2
+    prefix = "async-" + uuid.uuid4().hex[:6]
+    executor = None
+    level = "INFO"
+    modules = []
+    while args:
+        arg = args.pop(0)
+        if arg == "--games":
+            games = int(args.pop(0))
+        elif arg == "--players":
+            players = int(args.pop(0))
+        elif arg == "--prefix":
+            prefix = args.pop(0)
+        elif arg == "--threads":
+            executor = ThreadPoolExecutor(int(args.pop(0)))
+        elif arg == "--processes":
+            executor = ProcessPoolExecutor(int(args.pop(0)))
+        elif arg == "--log-level":
+            level = args.pop(0)
+        else:
+            modules.append(arg)
+
+    client_log.configure(level)
+    start = time.perf_counter()
+    results = asyncio.run(
+        play_tables(host, port, games, players, modules or ["ClaudeV3_decide"], prefix, executor)
+    )
+    elapsed = time.perf_counter() - start
+    if executor is not None:
+        executor.shutdown()
+
+    finished = sum(results)
+    turns = finished * ROUNDS * HAND_SIZE_BY_PLAYERS[players]
+    print(f"{finished}/{len(results)} bot-games finished in {elapsed:.1f}s ({turns / elapsed:,.0f} turns/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Sushi Go Batch Simulator - thousands of games in lockstep with NumPy
+
+Runs N games at once as `(games, players, 12)` card-count arrays. Every seat
+plays a priority-table strategy: a base priority per card plus weighted
+count-based bonuses (the shape of `gemini_decide.CARD_PRIORITY`,
+`ClaudeV3_decide.BASE_PRIORITY` and `Claude_decide._score_table`), so a whole
+turn of every game is scored with one matrix product.
+
+Weights can differ per game, which makes sweeping a weight a single call:
+give each block of games its own value and compare the blocks.
+
+Requires NumPy (the bots themselves stay standard-library only).
+
+Usage:
+    python batch_sim.py [--games N] [--players P] [--seed S] [--preset NAME]
+                        [--vs NAME] [--sweep FEATURE V1 V2 ...]
+
+Example:
+    python batch_sim.py --games 200000 --players 2 --preset gemini --vs claude_v3
+    python batch_sim.py --games 100000 --players 3 --sweep tempura_odd 0 5 10 15
+"""
+
+import sys
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError as exc:
+    raise ImportError("batch_sim.py requires NumPy (pip install numpy)") from exc
+
+from cards import (
+    CARD_IDS, CARD_NAMES, CHOPSTICKS, DUMPLING, EGG, MAKI_VALUE, NIGIRI_VALUE, PUDDING,
+    SALMON, SASHIMI, SQUID, TEMPURA, WASABI,
+)
+from sushi_go_engine import CARD_DEFAULT_FREQUENCIES, DUMPLING_SCORES, HAND_SIZE_BY_PLAYERS, ROUNDS
+
+# ── card layout ───────────────────────────────────────────────────────────────
+#
+# Card ids and the rules tables come from cards.py and the engine; here they
+# only become arrays.
+
+FREQUENCIES = np.array([CARD_DEFAULT_FREQUENCIES[name] for name in CARD_NAMES])
+NIGIRI_VALUE = np.array(NIGIRI_VALUE)
+MAKI_VALUE = np.array(MAKI_VALUE)
+DUMPLING_SCORES = np.array(DUMPLING_SCORES)
+# Points the next dumpling adds, by dumplings already down
+DUMPLING_MARGINAL = np.diff(DUMPLING_SCORES, append=DUMPLING_SCORES[-1])
+
+# ── strategy features ─────────────────────────────────────────────────────────
+#
+# Each feature is (per-seat scalar) x (per-card row). The score of card c for
+# a seat is  base[c] + sum_f weight_f * scalar_f * row_f[c].
+
+def _row(*cards: int, values: Optional[np.ndarray] = None) -> np.ndarray:
+    if values is not None:
+        return values.astype(float)
+    row = np.zeros(12)
+    row[list(cards)] = 1.0
+    return row
+
+
+FEATURES = (
+    # name                   card row the bonus applies to
+    ("wasabi_any",           _row(EGG, SALMON, SQUID)),   # any wasabi played
+    ("wasabi_unused",        _row(EGG, SALMON, SQUID)),   # an uncovered wasabi
+    ("wasabi_nigiri_value",  _row(values=NIGIRI_VALUE)),  # ...scaled by nigiri value
+    ("wasabi_stack",         _row(WASABI)),               # wasabi onto uncovered wasabi
+    ("tempura_odd",          _row(TEMPURA)),              # completes a pair
+    ("sashimi_one",          _row(SASHIMI)),              # one sashimi towards a set
+    ("sashimi_two",          _row(SASHIMI)),              # completes a set
+    ("dumpling_marginal",    _row(DUMPLING)),             # points the next dumpling adds
+    ("dumpling_have",        _row(DUMPLING)),             # dumplings already down
+    ("maki_face",            _row(values=MAKI_VALUE)),    # rolls on the card
+    ("pudding_round",        _row(PUDDING)),              # round number
+    ("chopsticks_turns",     _row(CHOPSTICKS)),           # picks left after this one
+    ("chopsticks_owned",     _row(CHOPSTICKS)),           # already have chopsticks
+)
+FEATURE_NAMES = tuple(name for name, _ in FEATURES)
+FEATURE_ROWS = np.stack([row for _, row in FEATURES])      # (F, 12)
+WEIGHT_SIZE = 12 + len(FEATURES)
+
+
+def strategy_weights(preset: dict) -> np.ndarray:
+    """
+    Flatten a preset into a weight vector of length WEIGHT_SIZE.
+
+    Args:
+        preset: {"base": {card_name: priority}, feature_name: weight, ...}
+
+    Returns:
+        12 base priorities followed by one weight per FEATURES entry
+    """
+    weights = np.zeros(WEIGHT_SIZE)
+    for card, priority in preset.get("base", {}).items():
+        weights[CARD_IDS[card]] = priority
+    for name, weight in preset.items():
+        if name != "base":
+            weights[12 + FEATURE_NAMES.index(name)] = weight
+    return weights
+
+
+# gemini_decide.get_card_priority without its dumpling term, which adds the
+# same amount to every card in the hand and so never changes the pick. Ties
+# break in card-id order here, by position in hand in gemini_decide.
+GEMINI = {
+    "base": {
+        "Pudding": 5, "Maki Roll (1)": 2, "Maki Roll (2)": 3, "Maki Roll (3)": 4,
+        "Tempura": 6, "Sashimi": 7, "Dumpling": 8, "Egg Nigiri": 1,
+        "Salmon Nigiri": 9, "Squid Nigiri": 10, "Wasabi": 11, "Chopsticks": 0,
+    },
+    "wasabi_any": 20,
+    "tempura_odd": 10,
+    "sashimi_one": 10,
+    "sashimi_two": 10,
+    "maki_face": 1,
+    "pudding_round": 1,
+}
+
+# ClaudeV3_decide._score_table without the card_distribution terms; the
+# "is a partner still coming" checks are assumed to pass.
+CLAUDE_V3 = {
+    "base": {
+        "Chopsticks": 0, "Egg Nigiri": 1, "Maki Roll (1)": 2, "Maki Roll (2)": 3,
+        "Maki Roll (3)": 4, "Pudding": 5, "Tempura": 6, "Sashimi": 9,
+        "Dumpling": 8, "Salmon Nigiri": 9, "Squid Nigiri": 10, "Wasabi": 11,
+    },
+    "wasabi_unused": 20,
+    "wasabi_stack": -13,
+    "tempura_odd": 10,
+    "sashimi_one": 3,
+    "sashimi_two": 8,
+    "dumpling_marginal": 1,
+    "dumpling_have": 2,
+    "maki_face": 1,
+    "pudding_round": 1,
+    "chopsticks_turns": 0.3,
+    "chopsticks_owned": -10,
+}
+
+# Claude_decide._score_table without the card_distribution terms.
+CLAUDE = {
+    "base": {
+        "Tempura": 3.0, "Sashimi": 2.5, "Dumpling": 0.0,
+        "Maki Roll (1)": 1.2, "Maki Roll (2)": 2.4, "Maki Roll (3)": 3.6,
+        "Egg Nigiri": 1, "Salmon Nigiri": 2, "Squid Nigiri": 3,
+        "Pudding": 1.0, "Wasabi": 4.0, "Chopsticks": 1.0,
+    },
+    "wasabi_unused": 1,
+    "wasabi_nigiri_value": 2,
+    "wasabi_stack": -5,
+    "tempura_odd": 1.5,
+    "sashimi_one": 1.0,
+    "sashimi_two": 2.5,
+    "dumpling_marginal": 1,
+    "pudding_round": 0.5,
+    "chopsticks_turns": 0.3,
+    "chopsticks_owned": -2,
+}
+
+PRESETS = {"gemini": GEMINI, "claude_v3": CLAUDE_V3, "claude": CLAUDE}
+
+# ── simulation ────────────────────────────────────────────────────────────────
+
+@dataclass
+class BatchResult:
+    """Per-game, per-seat outcomes; every array is shaped (games, players)."""
+
+    scores: np.ndarray
+    puddings: np.ndarray
+    wins: np.ndarray      # 1/k for each of k tied winners, else 0
+
+    def mean_scores(self) -> np.ndarray:
+        return self.scores.mean(axis=0)
+
+    def win_rates(self) -> np.ndarray:
+        return self.wins.mean(axis=0)
+
+
+def _deal(rng: np.random.Generator, games: int) -> np.ndarray:
+    """Shuffled decks as card ids, shape (games, 108)."""
+    deck = np.repeat(np.arange(12), FREQUENCIES)
+    order = np.argsort(rng.random((games, deck.size)), axis=1)
+    return deck[order]
+
+
+def _counts(card_ids: np.ndarray) -> np.ndarray:
+    """(..., n) card ids -> (..., 12) counts."""
+    return (card_ids[..., None] == np.arange(12)).sum(axis=-2)
+
+
+def _award(values: np.ndarray, first: int, second: int) -> np.ndarray:
+    """Majority awards per game row; ties split, a tie for first blocks second."""
+    top = values.max(axis=1, keepdims=True)
+    leaders = (values == top) & (top > 0)
+    n_leaders = leaders.sum(axis=1, keepdims=True)
+    points = leaders * (first // np.maximum(n_leaders, 1))
+    if second:
+        rest = np.where(leaders, -1, values)
+        runner = rest.max(axis=1, keepdims=True)
+        runners = (rest == runner) & (runner > 0) & (n_leaders == 1)
+        points = points + runners * (second // np.maximum(runners.sum(axis=1, keepdims=True), 1))
+    return points
+
+
+def _score_round(tableau: np.ndarray, nigiri_points: np.ndarray) -> np.ndarray:
+    dumplings = DUMPLING_SCORES[np.minimum(tableau[..., DUMPLING], 5)]
+    maki = tableau @ MAKI_VALUE
+    return (
+        nigiri_points
+        + (tableau[..., TEMPURA] // 2) * 5
+        + (tableau[..., SASHIMI] // 3) * 10
+        + dumplings
+        + _award(maki, 6, 3)
+    )
+
+
+def _score_pudding(puddings: np.ndarray) -> np.ndarray:
+    least = puddings.min(axis=1, keepdims=True)
+    spread = puddings.max(axis=1, keepdims=True) > least       # all tied: no award
+    points = _award(puddings, 6, 0) * spread
+    if puddings.shape[1] > 2:
+        last = (puddings == least) & spread
+        points = points - last * (6 // last.sum(axis=1, keepdims=True).clip(min=1))
+    return points
+
+
+def _seat_scalars(tableau, unused_wasabi, round_num, picks_left):
+    """Per-seat feature scalars, shape (games, players, F), in FEATURES order."""
+    sashimi_mod = tableau[..., SASHIMI] % 3
+    dumplings = tableau[..., DUMPLING]
+    has_unused = unused_wasabi > 0
+    picks = np.full(dumplings.shape, picks_left)
+    return np.stack([
+        tableau[..., WASABI] > 0,
+        has_unused,
+        has_unused,
+        has_unused,
+        tableau[..., TEMPURA] % 2 == 1,
+        sashimi_mod == 1,
+        sashimi_mod == 2,
+        DUMPLING_MARGINAL[np.minimum(dumplings, 5)],
+        dumplings,
+        np.ones_like(has_unused),
+        np.full(dumplings.shape, round_num),
+        picks,
+        tableau[..., CHOPSTICKS] > 0,
+    ], axis=-1).astype(float)
+
+
+def simulate(
+    weights: np.ndarray,
+    games: int,
+    rng: Optional[np.random.Generator] = None,
+) -> BatchResult:
+    """
+    Play `games` complete games in lockstep.
+
+    Args:
+        weights: Strategy weight vectors, shaped (players, WEIGHT_SIZE) for one
+                 strategy per seat, or (games, players, WEIGHT_SIZE) to vary
+                 them per game
+        games: Number of games
+        rng: NumPy random generator (fresh default_rng() if omitted)
+
+    Returns:
+        Scores, puddings and win shares for every game and seat
+    """
+    rng = rng or np.random.default_rng()
+    weights = np.asarray(weights, dtype=float)
+    if weights.ndim == 2:
+        weights = np.broadcast_to(weights, (games,) + weights.shape)
+    players = weights.shape[1]
+    hand_size = HAND_SIZE_BY_PLAYERS[players]
+    base = weights[..., :12]
+    feature_weights = weights[..., 12:]
+
+    decks = _deal(rng, games)
+    scores = np.zeros((games, players), dtype=np.int64)
+    puddings = np.zeros((games, players), dtype=np.int64)
+    eye = np.eye(12, dtype=np.int64)
+    seats = np.arange(players)
+    dealt = 0
+
+    for round_num in range(1, ROUNDS + 1):
+        deal = decks[:, dealt:dealt + players * hand_size]
+        dealt += players * hand_size
+        hands = _counts(deal.reshape(games, players, hand_size))
+        tableau = np.zeros_like(hands)
+        unused_wasabi = np.zeros((games, players), dtype=np.int64)
+        nigiri_points = np.zeros((games, players), dtype=np.int64)
+
+        for picks_left in range(hand_size - 1, -1, -1):
+            scalars = _seat_scalars(tableau, unused_wasabi, round_num, picks_left)
+            priority = base + (scalars * feature_weights) @ FEATURE_ROWS
+            priority = np.where(hands > 0, priority, -np.inf)
+            choice = priority.argmax(axis=-1)                    # (games, players)
+
+            picked = eye[choice]
+            hands -= picked
+            tableau += picked
+
+            value = NIGIRI_VALUE[choice]
+            on_wasabi = (value > 0) & (unused_wasabi > 0)
+            nigiri_points += np.where(on_wasabi, value * 3, value)
+            unused_wasabi += (choice == WASABI).astype(np.int64) - on_wasabi
+
+            hands = hands[:, (seats - 1) % players]              # pass to seat + 1
+
+        scores += _score_round(tableau, nigiri_points)
+        puddings += tableau[..., PUDDING]
+
+    scores += _score_pudding(puddings)
+    key = scores * 16 + puddings                                 # pudding breaks ties
+    winners = key == key.max(axis=1, keepdims=True)
+    wins = winners / winners.sum(axis=1, keepdims=True)
+    return BatchResult(scores=scores, puddings=puddings, wins=wins)
+
+
+# ── command line ──────────────────────────────────────────────────────────────
+
+def main():
+    args = sys.argv[1:]
+    games = 100_000
+    players = 2
+    seed = None
+    preset = "gemini"
+    opponent = None
+    sweep_feature = None
+    sweep_values: list[float] = []
+    while args:
+        arg = args.pop(0)
+        if arg == "--games":
+            games = int(args.pop(0))
+        elif arg == "--players":
+            players = int(args.pop(0))
+        elif arg == "--seed":
+            seed = int(args.pop(0))
+        elif arg == "--preset":
+            preset = args.pop(0)
+        elif arg == "--vs":
+            opponent = args.pop(0)
+        elif arg == "--sweep":
+            sweep_feature = args.pop(0)
+            while args and not args[0].startswith("--"):
+                sweep_values.append(float(args.pop(0)))
+        else:
+            print(f"Unknown argument: {arg}")
+            print(__doc__.split("Usage:")[1])
+            sys.exit(1)
+
+    rng = np.random.default_rng(seed)
+    hero = strategy_weights(PRESETS[preset])
+    villain = strategy_weights(PRESETS[opponent or preset])
+    table = np.stack([hero] + [villain] * (players - 1))
+
+    start = time.perf_counter()
+    if sweep_feature is None:
+        result = simulate(table, games, rng)
+        labels = [preset] + [opponent or preset] * (players - 1)
+        for seat, label in enumerate(labels):
+            print(
+                f"seat {seat} {label:<10} mean score {result.mean_scores()[seat]:6.2f}   "
+                f"wins {result.win_rates()[seat]:6.1%}"
+            )
+    else:
+        # Seat 0 plays `preset` with the swept weight; each value gets a block of games
+        column = 12 + FEATURE_NAMES.index(sweep_feature)
+        block = games // len(sweep_values)
+        games = block * len(sweep_values)
+        per_game = np.repeat(table[None], games, axis=0)
+        for i, value in enumerate(sweep_values):
+            per_game[i * block:(i + 1) * block, 0, column] = value
+        result = simulate(per_game, games, rng)
+        for i, value in enumerate(sweep_values):
+            rows = slice(i * block, (i + 1) * block)
+            print(
+                f"{sweep_feature}={value:<8g} mean score {result.scores[rows, 0].mean():6.2f}   "
+                f"wins {result.wins[rows, 0].mean():6.1%}"
+            )
+    elapsed = time.perf_counter() - start
+    print(f"{games:,} games in {elapsed:.2f}s ({games / elapsed:,.0f} games/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Benchmark: decide() latency and memory per strategy, on recorded positions.
+
+The corpus is a set of real positions, a hand plus the `GameState` exactly as
+the strategy sees it just before deciding. They are recorded from each
+strategy's own self-play at 2-5 players, covering all three rounds. Every
+strategy reads its own tracking off the state, so each one gets positions
+from its own games. The corpus is pickled on first use and loaded on later
+runs, so a strategy edit is timed on the same positions as the baseline.
+States are stored as plain dicts of their attributes, and the file records
+`CORPUS_VERSION` and the `GameState` fields it was written with. A corpus
+from another version or another `GameState` is re-recorded, with a notice,
+rather than loaded into the wrong shape.
+By default every arena strategy is run; ISMCTS_decide (tens of ms per
+decision) can be named explicitly.
+
+Each decision runs on a fresh copy of its state, made outside the timed
+loop. The suite reports:
+
+    ns/decision      mean over every position (median alongside)
+    allocs           memory blocks allocated per decision and still live
+                     when it returns, from tracemalloc snapshots taken
+                     before and after (temporaries freed inside decide
+                     show up in peak bytes instead)
+    peak bytes       tracemalloc peak above the starting point, per decision
+    kept bytes       memory still allocated afterwards, per decision (state
+                     the strategy hangs off GameState, module-level caches)
+    errors           positions where decide raised
+
+`--save` writes the results as JSON. `--baseline` compares against a saved
+file and exits 1 if any strategy's median got slower than `--tolerance`
+times its baseline. The gate uses the median because the mean of the
+Claude strategies is dominated by a handful of endgame searches.
+
+Usage:
+    python bench_decide.py [--corpus PATH] [--record] [--games N] [--seconds S]
+                           [--save PATH] [--baseline PATH] [--tolerance X] [module ...]
+
+Example:
+    python bench_decide.py --save bench_baseline.json
+    python bench_decide.py --baseline bench_baseline.json ClaudeV3_decide
+"""
+
+import copy
+import dataclasses
+import gc
+import json
+import os
+import pickle
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from arena import STRATEGIES, importable
+from sushi_go_client import GameState
+from sushi_go_engine import load_strategy, play_game
+
+CORPUS = "bench_corpus.pkl"
+CORPUS_VERSION = 2           # bump when the stored position format changes
+PLAYERS = (2, 3, 4, 5)
+SEED = 1
+TARGET_SECONDS = 1.0         # timed run length per module
+MAX_REPEAT = 50              # timed calls per position at most
+
+
+# ── corpus ────────────────────────────────────────────────────────────────────
+
+def _schema() -> list[str]:
+    return [field.name for field in dataclasses.fields(GameState)]
+
+
+def _restore(saved: dict) -> GameState:
+    """A GameState from a stored attribute dict (the strategy's own attributes included)."""
+    fields = set(_schema())
+    state = GameState(**{key: value for key, value in saved.items() if key in fields})
+    for key, value in saved.items():
+        if key not in fields:
+            setattr(state, key, value)
+    return state
+
+
+def record_positions(name: str, games: int) -> list[tuple[list[str], dict]]:
+    """Seat 0's (hand, state) before every decision of `games` self-play games per table size."""
+    decide = load_strategy(name)
+    positions = []
+
+    def guarded(hand, state):
+        try:
+            choice = decide(hand, state)
+        except Exception:
+            return 0
+        return choice if type(choice) is int and 0 <= choice < len(hand) else 0
+
+    def recording(hand, state):
+        positions.append((list(hand), copy.deepcopy(vars(state))))
+        return guarded(hand, state)
+
+    for players in PLAYERS:
+        for game in range(games):
+            rng = random.Random(SEED * 1000 + players * 100 + game)
+            play_game([recording] + [guarded] * (players - 1), rng)
+    return positions
+
+
+def load_corpus(path: str, names: list[str], games: int, record: bool) -> dict:
+    """
+    Load the corpus, recording any strategy that isn't in it yet.
+
+    Returns:
+        {strategy: [(hand, GameState), ...]}
+    """
+    header = {"version": CORPUS_VERSION, "schema": _schema()}
+    stored = {}
+    if os.path.exists(path) and not record:
+        with open(path, "rb") as f:
+            saved = pickle.load(f)
+        if isinstance(saved, dict) and {key: saved.get(key) for key in header} == header:
+            stored = saved["positions"]
+        else:
+            print(f"{path} was written for another corpus version or GameState; "
+                  f"re-recording (compare against a baseline from the new corpus)", file=sys.stderr)
+    missing = [name for name in names if name not in stored]
+    for name in missing:
+        print(f"Recording {name}...", file=sys.stderr)
+        stored[name] = record_positions(name, games)
+    if missing:
+        with open(path, "wb") as f:
+            pickle.dump(dict(header, positions=stored), f)
+    return {
+        name: [(hand, _restore(state)) for hand, state in stored[name]]
+        for name in names
+    }
+
+
+# ── measurement ───────────────────────────────────────────────────────────────
+
+def _fresh(positions, repeat):
+    return [
+        [(list(hand), copy.deepcopy(state)) for _ in range(repeat)]
+        for hand, state in positions
+    ]
+
+
+def time_decisions(decide, positions, repeat: int) -> tuple[list[float], int]:
+    """Per-position mean ns over `repeat` calls each, and how many positions raised."""
+    per_position = []
+    errors = 0
+    clock = time.perf_counter_ns
+    for copies in _fresh(positions, repeat):
+        failed = False
+        gc.disable()
+        start = clock()
+        for hand, state in copies:
+            try:
+                decide(hand, state)
+            except Exception:
+                failed = True
+        elapsed = clock() - start
+        gc.enable()
+        per_position.append(elapsed / repeat)
+        errors += failed
+    return per_position, errors
+
+
+def _blocks(snapshot) -> dict:
+    return {stat.traceback: stat.count for stat in snapshot.statistics("traceback")}
+
+
+def measure_memory(decide, positions) -> tuple[float, float, float]:
+    """Mean live allocations, tracemalloc peak and retained bytes per decision."""
+    copies = _fresh(positions, 1)
+    allocs = []
+    peaks = []
+    retained = []
+    ignore = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+    tracemalloc.start()
+    for (hand, state), in copies:
+        before = _blocks(tracemalloc.take_snapshot().filter_traces(ignore))
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        try:
+            decide(hand, state)
+        except Exception:
+            pass
+        current, peak = tracemalloc.get_traced_memory()
+        after = _blocks(tracemalloc.take_snapshot().filter_traces(ignore))
+        allocs.append(sum(max(0, count - before.get(trace, 0)) for trace, count in after.items()))
+        peaks.append(peak - base)
+        retained.append(current - base)
+    tracemalloc.stop()
+    return statistics.fmean(allocs), statistics.fmean(peaks), statistics.fmean(retained)
+
+
+def bench(name: str, positions: list, seconds: float) -> dict:
+    decide = load_strategy(name)
+    # One untimed pass warms caches and tells us how long a pass takes
+    start = time.perf_counter()
+    time_decisions(decide, positions, 1)
+    one_pass = time.perf_counter() - start
+    repeat = max(1, min(MAX_REPEAT, int(seconds / max(one_pass, 1e-9))))
+
+    per_position, errors = time_decisions(decide, positions, repeat)
+    allocs, peak_bytes, retained_bytes = measure_memory(decide, positions)
+    return {
+        "positions": len(positions),
+        "repeat": repeat,
+        "ns_per_decision": round(statistics.fmean(per_position)),
+        "median_ns": round(statistics.median(per_position)),
+        "allocs": round(allocs, 1),
+        "peak_bytes": round(peak_bytes),
+        "retained_bytes": round(retained_bytes),
+        "errors": errors,
+    }
+
+
+# ── reporting ─────────────────────────────────────────────────────────────────
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Print median ratios against the baseline; return the strategies that regressed."""
+    regressed = []
+    print(f"\n{'vs baseline':<20} {'median ns':>12} {'ratio':>8}")
+    for name, result in results.items():
+        old = baseline.get("results", {}).get(name)
+        if not old:
+            print(f"{name:<20} {'(new)':>12}")
+            continue
+        ratio = result["median_ns"] / max(old["median_ns"], 1)
+        flag = "  REGRESSION" if ratio > tolerance else ""
+        print(f"{name:<20} {old['median_ns']:>12,} {ratio:>7.2f}x{flag}")
+        if ratio > tolerance:
+            regressed.append(name)
+    return regressed
+
+
+def main():
+    args = sys.argv[1:]
+    corpus_path = CORPUS
+    record = False
+    games = 2
+    seconds = TARGET_SECONDS
+    save = None
+    baseline_path = None
+    tolerance = 1.5
+    names = []
+    while args:
+        arg = args.pop(0)
+        if arg == "--corpus":
+            corpus_path = args.pop(0)
+        elif arg == "--record":
+            record = True
+        elif arg == "--games":
+            games = int(args.pop(0))
+        elif arg == "--seconds":
+            seconds = float(args.pop(0))
+        elif arg == "--save":
+            save = args.pop(0)
+        elif arg == "--baseline":
+            baseline_path = args.pop(0)
+        elif arg == "--tolerance":
+            tolerance = float(args.pop(0))
+        else:
+            names.append(arg)
+
+    names, broken = importable(names or STRATEGIES)
+    for name, error in broken:
+        print(f"Skipping {name}: {error}", file=sys.stderr)
+    corpus = load_corpus(corpus_path, names, games, record)
+
+    print(f"{'strategy':<20} {'positions':>9} {'ns/decision':>12} {'median ns':>12} "
+          f"{'allocs':>8} {'peak bytes':>11} {'kept bytes':>11} {'errors':>7}")
+    results = {}
+    for name in names:
+        result = results[name] = bench(name, corpus[name], seconds)
+        print(f"{name:<20} {result['positions']:>9} {result['ns_per_decision']:>12,} "
+              f"{result['median_ns']:>12,} {result['allocs']:>8,.1f} {result['peak_bytes']:>11,} "
+              f"{result['retained_bytes']:>11,} {result['errors']:>7}")
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "corpus": corpus_path,
+        "results": results,
+    }
+    if save:
+        with open(save, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: framing received bytes into lines.
+
+Replays bursts of real protocol lines (PLAYED, WAITING, ROUND_END,
+ROUND_START, HAND, ...) as `recv`-sized chunks through:
+
+    str buffer   the old receive(): decode each chunk, append it to a str,
+                 split("\\n", 1) per line
+    LineFramer   framing.py: bytearray, scan only the new bytes, decode the
+                 complete part once
+
+and reports µs per burst and ns per line for several burst sizes.
+
+Usage:
+    python bench_framing.py [--chunk BYTES] [--number N]
+
+Example:
+    python bench_framing.py --chunk 4096 --number 2000
+"""
+
+import sys
+import timeit
+
+from framing import LineFramer
+
+TURN_LINES = [
+    "PLAYED Alice:Squid Nigiri; Bob:Tempura; Carol:Dumpling; Dave:Maki Roll (3); Eve:Wasabi",
+    "WAITING Bob Carol",
+    "HAND 0:Tempura 1:Sashimi 2:Salmon Nigiri 3:Dumpling 4:Pudding 5:Maki Roll (2) 6:Egg Nigiri",
+]
+ROUND_LINES = [
+    'ROUND_END 1 {"Alice":21,"Bob":17,"Carol":30,"Dave":12,"Eve":25}',
+    "ROUND_START 2",
+]
+
+
+def burst(size: int) -> bytes:
+    """About `size` bytes of whole protocol lines."""
+    lines = []
+    total = 0
+    i = 0
+    while total < size:
+        line = (TURN_LINES + ROUND_LINES)[i % 5] if i % 15 >= 10 else TURN_LINES[i % 3]
+        lines.append(line)
+        total += len(line) + 1
+        i += 1
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def chunks(data: bytes, size: int) -> list[bytes]:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def str_buffer(pieces: list[bytes]) -> int:
+    buffer = ""
+    count = 0
+    for chunk in pieces:
+        buffer += chunk.decode("utf-8", errors="replace")
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            line.strip()
+            count += 1
+    return count
+
+
+def line_framer(pieces: list[bytes], framer: LineFramer) -> int:
+    count = 0
+    for chunk in pieces:
+        framer.feed(chunk)
+        count += len(framer.readlines())
+    return count
+
+
+def main():
+    args = sys.argv[1:]
+    chunk = 4096
+    number = 1000
+    while args:
+        arg = args.pop(0)
+        if arg == "--chunk":
+            chunk = int(args.pop(0))
+        elif arg == "--number":
+            number = int(args.pop(0))
+
+    print(f"{chunk}-byte chunks, {number} bursts each\n")
+    print(f"{'burst':>8} {'lines':>6} {'str buffer':>14} {'LineFramer':>14} {'speedup':>8}")
+    for size in (512, 4096, 16384, 65536):
+        pieces = chunks(burst(size), chunk)
+        lines = str_buffer(pieces)
+        # One framer for the whole run, as a client keeps one per connection
+        framer = LineFramer()
+        assert line_framer(pieces, framer) == lines
+        old = min(timeit.repeat(lambda: str_buffer(pieces), number=number, repeat=3)) / number
+        new = min(timeit.repeat(lambda: line_framer(pieces, framer), number=number, repeat=3)) / number
+        print(f"{size:>7}B {lines:>6} {old * 1e6:>10.1f} µs {new * 1e6:>10.1f} µs {old / new:>7.1f}x"
+              f"   ({old * 1e9 / lines:,.0f} vs {new * 1e9 / lines:,.0f} ns/line)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parsing HAND payloads into card ids.
+
+Times three parsers on random hands of every size from 10 cards (2 players)
+down to 1:
+
+    regex        the old SushiGoClient.parse_hand: re.finditer with a lazy
+                 group and a lookahead, strip(), then CARD_IDS
+    token split  the old first_card_bot.py parser: split on whitespace and
+                 glue multi-word names back together, then CARD_IDS
+    parse_hand   cards.py: one split on ":", rpartition per card, indices
+                 checked against precomputed strings
+
+and reports ns per hand and per card.
+
+Usage:
+    python bench_hand.py [--hands N] [--number N] [--seed S]
+
+Example:
+    python bench_hand.py --hands 1000 --number 200
+"""
+
+import random
+import re
+import sys
+import timeit
+
+from cards import CARD_IDS, CARD_NAMES, parse_hand
+
+HAND_PATTERN = re.compile(r"(\d+):(.*?)(?=\s\d+:|$)")
+
+
+def payload(ids: list[int]) -> str:
+    return " ".join(f"{i}:{CARD_NAMES[card]}" for i, card in enumerate(ids))
+
+
+def regex(text: str) -> list[int]:
+    return [CARD_IDS[match.group(2).strip()] for match in HAND_PATTERN.finditer(text)]
+
+
+def token_split(text: str) -> list[int]:
+    cards = []
+    current = []
+    for token in text.split():
+        if ":" in token:
+            prefix, name = token.split(":", 1)
+            if prefix.isdigit():
+                if current:
+                    cards.append(" ".join(current))
+                current = [name]
+                continue
+        current.append(token)
+    if current:
+        cards.append(" ".join(current))
+    return [CARD_IDS[name] for name in cards]
+
+
+def run(parser, payloads: list[str]):
+    for text in payloads:
+        parser(text)
+
+
+def main():
+    args = sys.argv[1:]
+    hands = 1000
+    number = 200
+    seed = 1
+    while args:
+        arg = args.pop(0)
+        if arg == "--hands":
+            hands = int(args.pop(0))
+        elif arg == "--number":
+            number = int(args.pop(0))
+        elif arg == "--seed":
+            seed = int(args.pop(0))
+
+    rng = random.Random(seed)
+    parsers = [("regex", regex), ("token split", token_split), ("parse_hand", parse_hand)]
+    print(f"{hands} random hands per size, best of 3 x {number}\n")
+    print(f"{'cards':>5} " + " ".join(f"{name:>14}" for name, _ in parsers) + f" {'vs regex':>9}")
+    for size in (10, 9, 8, 7, 4, 1):
+        hands_ids = [[rng.randrange(len(CARD_NAMES)) for _ in range(size)] for _ in range(hands)]
+        payloads = [payload(ids) for ids in hands_ids]
+        for _, parser in parsers:
+            assert [parser(text) for text in payloads] == hands_ids
+        per_hand = [
+            min(timeit.repeat(lambda: run(parser, payloads), number=number, repeat=3)) / (number * hands)
+            for _, parser in parsers
+        ]
+        print(f"{size:>5} " + " ".join(f"{t * 1e9:>11,.0f} ns" for t in per_hand)
+              + f" {per_hand[0] / per_hand[-1]:>8.1f}x"
+              + f"   ({per_hand[0] * 1e9 / size:,.0f} vs {per_hand[-1] * 1e9 / size:,.0f} ns/card)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: what client logging costs per turn.
+
+Plays a recorded turn's worth of protocol lines (HAND in, PLAY out, OK and
+PLAYED in) through `SushiGoClient` over an in-memory socket, under each
+logging setup:
+
+    sync DEBUG        every line written on the turn's thread (the old print)
+    background DEBUG  every line queued for the writer thread
+    INFO              the default: wire logging off, summaries only
+
+Output goes to `--sink` (a temp file by default). Point it at a terminal
+or a pipe to see what a slow consumer costs the synchronous setup.
+
+Usage:
+    python bench_logging.py [--turns N] [--sink PATH]
+
+Example:
+    python bench_logging.py --turns 20000
+    python bench_logging.py --sink /dev/tty
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import client_log
+from sushi_go_client import GameState, SushiGoClient
+
+TURN = (
+    b"HAND 0:Tempura 1:Squid Nigiri 2:Maki Roll (2) 3:Dumpling 4:Wasabi 5:Pudding 6:Egg Nigiri\n"
+    b"OK\n"
+    b"PLAYED Alice:Squid Nigiri; Bob:Tempura; Carol:Dumpling; Dave:Maki Roll (3)\n"
+)
+
+
+class ReplaySocket:
+    """Hands out the same turn forever and swallows what is sent."""
+
+    def recv(self, size: int) -> bytes:
+        return TURN
+
+    def sendall(self, data: bytes):
+        pass
+
+    def close(self):
+        pass
+
+
+def turn_us(turns: int) -> float:
+    """Mean µs per turn for the logging setup currently configured."""
+    client = SushiGoClient("localhost", 7878)
+    client.connect = lambda: None
+    client.sock = ReplaySocket()
+    client._wire = client.log.isEnabledFor(logging.DEBUG)
+    client.state = GameState(game_id="bench", player_id=0, hand=[])
+    start = time.perf_counter()
+    for _ in range(turns):
+        client.state.clear_played()
+        for _ in range(len(TURN.splitlines())):
+            message = client.receive()
+            client.dispatch(message)
+            if message.startswith("HAND"):
+                client.play_turn()
+    return (time.perf_counter() - start) / turns * 1e6
+
+
+def main():
+    args = sys.argv[1:]
+    turns = 10000
+    sink = None
+    while args:
+        arg = args.pop(0)
+        if arg == "--turns":
+            turns = int(args.pop(0))
+        elif arg == "--sink":
+            sink = args.pop(0)
+
+    path = sink or os.path.join(tempfile.mkdtemp(), "bench.log")
+    cases = [
+        ("sync DEBUG", "DEBUG", False),
+        ("background DEBUG", "DEBUG", True),
+        ("INFO (default)", "INFO", True),
+    ]
+    print(f"{turns} turns, logging to {path}\n")
+    results = []
+    for name, level, background in cases:
+        client_log.configure(level, path, background=background)
+        results.append((name, turn_us(turns)))
+        client_log.shutdown()
+    slowest = results[0][1]
+    for name, us in results:
+        print(f"{name:<20} {us:>8.1f} µs/turn   saves {slowest - us:>6.1f} µs")
+    if sink is None:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
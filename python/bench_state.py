@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: copying state for search.
+
+Compares `copy.deepcopy` of a mid-game `GameState` (as the Claude
+strategies leave it: tracker, stored hands, distribution) with building,
+cloning and make/unmake on a `SearchState`.
+
+Usage:
+    python bench_state.py [--players P] [--number N]
+
+Example:
+    python bench_state.py --players 4 --number 20000
+"""
+
+import copy
+import random
+import sys
+import timeit
+
+import ClaudeV3_decide
+from cards import NUM_CARDS
+from search_state import SearchState
+from sushi_go_engine import play_game
+from sushi_go_client import GameState
+
+
+def mid_game_state(players: int, seed: int = 1) -> GameState:
+    """A GameState captured at the middle of round 2 of a real game."""
+    captured = []
+
+    def capture(hand, state):
+        index = ClaudeV3_decide.decide(hand, state)
+        if state.round == 2 and len(hand) == 5 and not captured:
+            captured.append(copy.deepcopy(state))
+        return index
+
+    play_game([capture] + [ClaudeV3_decide.decide] * (players - 1), random.Random(seed))
+    return captured[0]
+
+
+def main():
+    args = sys.argv[1:]
+    players = 2
+    number = 10000
+    while args:
+        arg = args.pop(0)
+        if arg == "--players":
+            players = int(args.pop(0))
+        elif arg == "--number":
+            number = int(args.pop(0))
+
+    state = mid_game_state(players)
+    rng = random.Random(2)
+    size = sum(state.hand_counts)
+    opponents = []
+    for _ in range(players - 1):
+        hand = [0] * NUM_CARDS
+        for _ in range(size):
+            hand[rng.randrange(NUM_CARDS)] += 1
+        opponents.append(hand)
+    search = SearchState.from_game_state(state, opponents)
+    picks = [
+        next(card for card in range(NUM_CARDS) if search.hands[seat * NUM_CARDS + card])
+        for seat in range(players)
+    ]
+
+    def make_unmake():
+        search.make(picks)
+        search.unmake()
+
+    cases = [
+        ("copy.deepcopy(GameState)", lambda: copy.deepcopy(state)),
+        ("SearchState.from_game_state", lambda: SearchState.from_game_state(state, opponents)),
+        ("SearchState.clone", search.clone),
+        ("SearchState.make + unmake", make_unmake),
+    ]
+    print(f"{players} players, {size} cards in hand, {number} runs each\n")
+    baseline = None
+    for name, fn in cases:
+        seconds = min(timeit.repeat(fn, number=number, repeat=3)) / number
+        baseline = baseline or seconds
+        print(f"{name:<30} {seconds * 1e9:>10,.0f} ns   {baseline / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
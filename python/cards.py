@@ -0,0 +1,162 @@
+"""
+Card identities shared by the clients, the engine and the strategies.
+
+The protocol names cards with strings like "Maki Roll (2)". Internally a card
+is a small integer (`Card`, 0-11) in a fixed order, and a pile of cards is a
+12-slot count vector indexed by that id. That order is the same one
+`batch_sim.py` and `endgame.py` use. `GameState` keeps hands and played cards
+in this form, so strategies can read `state.played_counts[TEMPURA]` instead
+of counting strings.
+
+Example:
+    from cards import CARD_IDS, MAKI_VALUE, counts, maki_total
+
+    ids = [CARD_IDS[name] for name in ["Tempura", "Maki Roll (3)"]]
+    pile = counts(ids)            # [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0]
+    maki_total(pile)              # 3
+    parse_hand("0:Tempura 1:Maki Roll (3)")   # [0, 5]
+"""
+
+from enum import IntEnum
+from typing import Iterable
+
+
+class Card(IntEnum):
+    TEMPURA = 0
+    SASHIMI = 1
+    DUMPLING = 2
+    MAKI_1 = 3
+    MAKI_2 = 4
+    MAKI_3 = 5
+    EGG = 6
+    SALMON = 7
+    SQUID = 8
+    PUDDING = 9
+    WASABI = 10
+    CHOPSTICKS = 11
+
+
+# Plain ints for hot loops (enum attribute lookups are slow)
+(TEMPURA, SASHIMI, DUMPLING, MAKI_1, MAKI_2, MAKI_3,
+ EGG, SALMON, SQUID, PUDDING, WASABI, CHOPSTICKS) = range(12)
+NUM_CARDS = 12
+
+# id -> protocol name. Every name list built from these tables shares the
+# same string objects.
+CARD_NAMES: tuple[str, ...] = (
+    "Tempura", "Sashimi", "Dumpling",
+    "Maki Roll (1)", "Maki Roll (2)", "Maki Roll (3)",
+    "Egg Nigiri", "Salmon Nigiri", "Squid Nigiri",
+    "Pudding", "Wasabi", "Chopsticks",
+)
+# protocol name -> id
+CARD_IDS: dict[str, int] = {name: card for card, name in enumerate(CARD_NAMES)}
+
+NIGIRI = (EGG, SALMON, SQUID)
+MAKI = (MAKI_1, MAKI_2, MAKI_3)
+# Per-id lookups; 0 for cards that aren't nigiri / maki
+NIGIRI_VALUE = (0, 0, 0, 0, 0, 0, 1, 2, 3, 0, 0, 0)
+MAKI_VALUE = (0, 0, 0, 1, 2, 3, 0, 0, 0, 0, 0, 0)
+
+
+def empty_counts() -> list[int]:
+    """A zeroed 12-slot count vector."""
+    return [0] * NUM_CARDS
+
+
+def counts(ids: Iterable[int]) -> list[int]:
+    """Count vector for a sequence of card ids."""
+    vector = [0] * NUM_CARDS
+    for card in ids:
+        vector[card] += 1
+    return vector
+
+
+def counts_of_names(names: Iterable[str]) -> list[int]:
+    """Count vector for a sequence of protocol names."""
+    vector = [0] * NUM_CARDS
+    for name in names:
+        vector[CARD_IDS[name]] += 1
+    return vector
+
+
+def to_ids(names: Iterable[str]) -> list[int]:
+    """Card ids for protocol names."""
+    return [CARD_IDS[name] for name in names]
+
+
+def to_names(ids: Iterable[int]) -> list[str]:
+    """Protocol names for card ids."""
+    return [CARD_NAMES[card] for card in ids]
+
+
+# "0", "1", ... for checking HAND indices without int(); hands hold at
+# most 10 cards
+_INDICES = tuple(str(i) for i in range(16))
+
+
+def parse_hand(payload: str) -> list[int]:
+    """
+    Card ids of a HAND payload ("0:Tempura 1:Salmon Nigiri ..."), in order.
+
+    Names have no ":" in them, so one split on ":" leaves pieces of the
+    form "<name> <next index>". Each piece is taken apart with rpartition,
+    its index compared with a precomputed string and its name looked up
+    in `CARD_IDS`. `to_names` turns the result back into the shared
+    `CARD_NAMES` strings.
+
+    Raises:
+        ValueError: An index that isn't 0, 1, 2, ... in turn, or an
+                    unknown card name
+    """
+    pieces = payload.split(":")
+    last = len(pieces) - 1
+    if not last:
+        if payload.strip():
+            raise ValueError(f"HAND without indices: {payload!r}")
+        return []
+    if pieces[0] != "0" or last >= len(_INDICES):
+        return _parse_hand_strictly(payload, pieces)
+    get = CARD_IDS.get
+    ids = []
+    for i in range(1, last):
+        name, _, index = pieces[i].rpartition(" ")
+        card = get(name)
+        if card is None or index != _INDICES[i]:
+            return _parse_hand_strictly(payload, pieces)
+        ids.append(card)
+    card = get(pieces[last])
+    if card is None:
+        return _parse_hand_strictly(payload, pieces)
+    ids.append(card)
+    return ids
+
+
+def _parse_hand_strictly(payload: str, pieces: list[str]) -> list[int]:
+    # The slow path: tolerate extra spaces, or say what is wrong
+    if pieces[0].strip() != "0":
+        raise ValueError(f"HAND must start at index 0: {payload!r}")
+    names = []
+    for i, piece in enumerate(pieces[1:-1], 1):
+        name, _, index = piece.rstrip().rpartition(" ")
+        if index != str(i):
+            raise ValueError(f"HAND index {index!r} where {i} was expected: {payload!r}")
+        names.append(name)
+    names.append(pieces[-1])
+    ids = []
+    for name in names:
+        card = CARD_IDS.get(name.strip())
+        if card is None:
+            raise ValueError(f"Unknown card {name.strip()!r} in HAND: {payload!r}")
+        ids.append(card)
+    return ids
+
+
+def maki_total(vector: list[int]) -> int:
+    """Maki roll icons in a count vector."""
+    return vector[MAKI_1] + 2 * vector[MAKI_2] + 3 * vector[MAKI_3]
+
+
+def nigiri_total(vector: list[int]) -> int:
+    """Nigiri of any kind in a count vector."""
+    return vector[EGG] + vector[SALMON] + vector[SQUID]
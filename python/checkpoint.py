@@ -0,0 +1,120 @@
+"""
+GameState checkpoints, so a client can REJOIN without losing its tracking.
+
+Deciding changes the state: the Claude strategies fold each new hand into
+their tracker and step `hand_num`. After a disconnect the client has to
+know which side of its last move it stands on. A checkpoint therefore
+records the move that was in flight, together with two states:
+
+    after    the state once the move was chosen (tracking for this hand done)
+    before   the state the turn started from: the previous checkpoint's
+             `after` with that move played
+
+After a REJOIN the server's STATUS says whether we still owe a move for the
+same turn. If we do, the move never counted: start from `before` and decide
+the resent HAND again. If we don't, it counted: take `after` and play the
+move onto it. Either way, round and turn are then taken from STATUS.
+
+States are pickled without the caches strategies keep on them (`SKIP`), so
+a checkpoint is a couple of KB. It is written to a temporary file and
+renamed over the old one, so a crash never leaves half a checkpoint.
+
+Example:
+    record = checkpoint.new(token, game_id, player_name, state)
+    record = checkpoint.advance(record, state, (round, turn, cards))
+    checkpoint.write(path, record)
+    state = checkpoint.restore(checkpoint.read(path), status)
+"""
+
+import os
+import pickle
+from typing import Optional
+
+# GameState attributes that are caches, not tracking; rebuilt after a resume
+SKIP = ("ismcts_tree",)
+
+# (round, turn, card ids played)
+Move = tuple[int, int, tuple[int, ...]]
+
+
+def dumps(state) -> bytes:
+    """Pickle a GameState, leaving out the `SKIP` caches."""
+    attrs = {name: value for name, value in vars(state).items() if name not in SKIP}
+    return pickle.dumps((type(state), attrs), pickle.HIGHEST_PROTOCOL)
+
+
+def loads(data: bytes):
+    """The GameState `dumps` pickled."""
+    cls, attrs = pickle.loads(data)
+    state = cls.__new__(cls)
+    state.__dict__.update(attrs)
+    return state
+
+
+def new(token: str, game_id: str, player_name: str, state) -> dict:
+    """A checkpoint for a game just joined, with no move made yet."""
+    return {
+        "token": token,
+        "game_id": game_id,
+        "player_name": player_name,
+        "before": None,
+        "after": dumps(state),
+        "move": None,
+    }
+
+
+def advance(record: dict, state, move: Move) -> dict:
+    """The checkpoint after sending `move`, with `state` as it stands now."""
+    return {
+        **record,
+        "before": (record["after"], record["move"]),
+        "after": dumps(state),
+        "move": move,
+    }
+
+
+def restore(record: dict, status: dict):
+    """
+    The GameState to carry on from, given the server's STATUS after REJOIN.
+
+    Args:
+        record: The latest checkpoint
+        status: STATUS payload (round, turn and waiting once the game runs)
+    """
+    move = record["move"]
+    owed = record["player_name"] in status.get("waiting", ())
+    if move is not None and owed and (move[0], move[1]) == (status.get("round"), status.get("turn")):
+        # The move never counted: back to the start of the turn
+        after, previous = record["before"]
+        state = loads(after)
+        if previous is not None:
+            state.play(previous[2])
+    else:
+        state = loads(record["after"])
+        if move is not None:
+            state.play(move[2])
+
+    if "round" in status:
+        if status["round"] != state.round:
+            # A round ended while we were away
+            state.clear_played()
+            state.round = status["round"]
+        state.turn = status["turn"]
+    return state
+
+
+def write(path: str, record: dict):
+    """Atomically replace the checkpoint at `path`."""
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        pickle.dump(record, f, pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, path)
+
+
+def read(path: str) -> Optional[dict]:
+    """The checkpoint at `path`, or None if there is none."""
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
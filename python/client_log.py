@@ -0,0 +1,153 @@
+"""
+Leveled, buffered logging for the clients.
+
+Everything the clients used to print goes through the `sushigo` logger:
+
+    DEBUG    every line sent and received, per-move search details
+    INFO     connected, joined, game over with the final scores
+    WARNING  a failed JOIN, an ERROR reply from the server
+    ERROR    the exception that ended a game
+
+Each client logs through a `LoggerAdapter` carrying its connection
+("MyBot@abc123"), so lines from hundreds of bots in one process can be told
+apart. `configure()` puts a queue between the clients and the output: a log
+call only appends the record to the queue, and a background thread formats
+and writes it, flushing once per burst rather than once per line. A slow
+terminal or pipe then no longer stalls a turn.
+
+The clients check `isEnabledFor(DEBUG)` once per connection and skip the
+per-line calls entirely below it. At the default INFO level they log a few
+lines per game and nothing per turn.
+
+Example:
+    client_log.configure("DEBUG", path="bot.log")
+    log = client_log.connection("MyBot@abc123")
+    log.info("joined as player %d", 0)
+"""
+
+import atexit
+import logging
+import queue
+import sys
+import threading
+from typing import Optional
+
+LOGGER = "sushigo"
+FORMAT = "%(asctime)s %(levelname)-7s [%(conn)s] %(message)s"
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+log = logging.getLogger(LOGGER)
+
+_writer: Optional["_BackgroundWriter"] = None
+
+
+class _QueueHandler(logging.Handler):
+    """Puts records on the writer's queue; formatting happens over there."""
+
+    def __init__(self, records: queue.SimpleQueue):
+        super().__init__()
+        self.records = records
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # No handler lock or filters on the caller's side: a queue put is
+        # already thread-safe. Our args are strings and ints, so the record
+        # can cross threads unformatted.
+        self.records.put(record)
+        return True
+
+
+class _BatchedStreamHandler(logging.StreamHandler):
+    """StreamHandler that flushes when the writer runs dry, not per record."""
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        with self.lock:
+            self.stream.flush()
+
+
+class _BackgroundWriter:
+    """Thread that formats and writes queued records, one flush per burst."""
+
+    def __init__(self, sink: _BatchedStreamHandler):
+        self.records: queue.SimpleQueue = queue.SimpleQueue()
+        self.sink = sink
+        self.thread = threading.Thread(target=self._run, name="sushigo-log", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        records, sink = self.records, self.sink
+        while True:
+            record = records.get()
+            while True:
+                if record is None:
+                    sink.drain()
+                    return
+                sink.handle(record)
+                try:
+                    record = records.get_nowait()
+                except queue.Empty:
+                    break
+            sink.drain()
+
+    def stop(self):
+        self.records.put(None)
+        self.thread.join()
+
+
+class _ConnectionDefault(logging.Filter):
+    """Give records logged outside a connection an empty context."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "conn"):
+            record.conn = "-"
+        return True
+
+
+def configure(level: str = "INFO", path: Optional[str] = None, background: bool = True):
+    """
+    Send `sushigo` records at `level` and above to stderr or a file.
+
+    Args:
+        level: One of LEVELS
+        path: File to append to (None: stderr)
+        background: Format and write on a separate thread. False writes and
+                    flushes each record synchronously, like the old print().
+    """
+    global _writer
+    shutdown()
+    for handler in log.handlers[:]:
+        log.removeHandler(handler)
+        if handler.stream is not sys.stderr:
+            handler.stream.close()
+
+    stream = open(path, "a", encoding="utf-8") if path else sys.stderr
+    if background:
+        sink = _BatchedStreamHandler(stream)
+        _writer = _BackgroundWriter(sink)
+        handler = _QueueHandler(_writer.records)
+        handler.stream = stream          # so the next configure() can close it
+    else:
+        sink = handler = logging.StreamHandler(stream)
+    sink.setFormatter(logging.Formatter(FORMAT))
+    sink.addFilter(_ConnectionDefault())
+    log.addHandler(handler)
+    log.setLevel(level.upper())
+    log.propagate = False
+
+
+def shutdown():
+    """Write out anything queued and stop the background writer."""
+    global _writer
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
+
+
+atexit.register(shutdown)
+
+
+def connection(name: str) -> logging.LoggerAdapter:
+    """The `sushigo` logger with `name` as every record's connection."""
+    return logging.LoggerAdapter(log, {"conn": name})
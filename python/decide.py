@@ -1,6 +1,6 @@
 import random
 from collections import Counter
-import jacob_client
+import sushi_go_client
 
 PLAYER_NUM = {
     10:2,
@@ -39,7 +39,7 @@ priority = {
         "Chopsticks":1,  # Play 2 cards next turn
 }
 
-def decide(hand: list[str], state: jacob_client.GameState) -> int:
+def decide(hand: list[str], state: sushi_go_client.GameState) -> int:
 
     if state.hands is None:
         state.player_count = PLAYER_NUM[len(hand)]
@@ -17,6 +17,8 @@ import socket
 import sys
 import time
 
+from cards import parse_hand, to_names
+
 
 def main():
     if len(sys.argv) < 3:
@@ -77,31 +79,11 @@ def main():
                 return msg
 
     def parse_hand_message(message):
-        # Supports both "HAND A B C" and indexed "HAND 0:A 1:B" with spaces in names.
-        tokens = message.split()[1:]
-        if not tokens:
-            return []
-
-        if not any(":" in token for token in tokens):
-            return tokens
-
-        cards = []
-        current = []
-        for token in tokens:
-            if ":" in token:
-                prefix, name = token.split(":", 1)
-                if prefix.isdigit():
-                    if current:
-                        cards.append(" ".join(current))
-                    current = [name]
-                    continue
-            if current:
-                current.append(token)
-            else:
-                cards.append(token)
-        if current:
-            cards.append(" ".join(current))
-        return cards
+        # Indexed "HAND 0:A 1:B" through the shared parser; plain "HAND A B C" as a fallback
+        try:
+            return to_names(parse_hand(message[len("HAND "):]))
+        except ValueError:
+            return message.split()[1:]
 
     try:
         # Join the game
@@ -0,0 +1,70 @@
+"""
+Line framing for the receive path.
+
+The server's messages are newline-terminated UTF-8 lines, and one `recv`
+often holds several of them (PLAYED, ROUND_END, ROUND_START and the next
+HAND arrive together). `LineFramer` keeps the raw bytes in a bytearray and
+only looks at what each `feed` added, so a partial line is never rescanned
+or re-decoded. The complete part is decoded in one go from a memoryview,
+split into lines and queued, and the unfinished tail stays behind as bytes.
+Popping the consumed prefix off a bytearray does not move the rest, so a
+burst of any size costs time linear in its length.
+
+Example:
+    framer = LineFramer()
+    framer.feed(sock.recv(4096))
+    for line in framer.readlines():
+        handle(line)
+"""
+
+from collections import deque
+from typing import Optional
+
+
+class LineFramer:
+    """Bytes in, complete stripped lines out."""
+
+    __slots__ = ("_buffer", "_scanned", "_lines")
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._scanned = 0                # bytes of _buffer known to hold no newline
+        self._lines: deque[str] = deque()
+
+    def feed(self, data: bytes):
+        """Add received bytes and frame every line they complete."""
+        buffer = self._buffer
+        buffer += data
+        end = buffer.rfind(b"\n", self._scanned)
+        if end < 0:
+            self._scanned = len(buffer)
+            return
+        with memoryview(buffer) as view:
+            text = str(view[:end], "utf-8", "replace")
+        del buffer[:end + 1]
+        self._scanned = len(buffer)
+        self._lines.extend(map(str.strip, text.split("\n")))
+
+    def readline(self) -> Optional[str]:
+        """The next complete line, or None if there isn't one yet."""
+        return self._lines.popleft() if self._lines else None
+
+    def readlines(self) -> list[str]:
+        """Every complete line received so far, oldest first."""
+        lines = list(self._lines)
+        self._lines.clear()
+        return lines
+
+    def unread(self, lines: list[str]):
+        """Put lines back, ahead of anything still waiting, to be read again."""
+        self._lines.extendleft(reversed(lines))
+
+    def __len__(self) -> int:
+        """Complete lines waiting to be read."""
+        return len(self._lines)
+
+    def clear(self):
+        """Drop buffered bytes and lines, e.g. on reconnect."""
+        self._buffer.clear()
+        self._scanned = 0
+        self._lines.clear()
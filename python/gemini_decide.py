@@ -1,6 +1,8 @@
 import random
 from collections import Counter
 
+from cards import CARD_IDS, CARD_NAMES, MAKI, MAKI_VALUE, NIGIRI, PUDDING, SASHIMI, TEMPURA
+
 # Constants for card values and priorities
 # These can be adjusted to fine-tune the strategy
 CARD_SCORES = {
@@ -35,55 +37,85 @@ CARD_PRIORITY = {
 }
 
 
+# The priorities don't depend on the hand, so each state gets one table by
+# card id and every card in hand is a lookup into it.
+BASE_PRIORITY = tuple(CARD_PRIORITY[name] for name in CARD_NAMES)
+
+
 def decide(hand, state):
     """
     The main decision-making function for the Gemini bot.
     """
+    # Choose the first card with the highest priority
+    priorities = score_hand(hand, state)
+    best_card_index = max(range(len(hand)), key=priorities.__getitem__)
+
+    return best_card_index
 
-    # First, let's analyze our current played cards and hand
-    played_cards = state.get("played_cards", [])
-    hand_counts = Counter(hand)
-    played_counts = Counter(played_cards)
 
-    # Calculate the priority of each card in the hand
-    priorities = {}
-    for i, card in enumerate(hand):
-        priorities[i] = get_card_priority(card, hand_counts, played_counts, state)
+def score_hand(hand, state):
+    """
+    The priority of every card in the hand, in hand order.
+    """
+    table = _priority_table(state)
+    return [table[CARD_IDS[card]] for card in hand]
 
-    # Choose the card with the highest priority
-    best_card_index = max(priorities, key=priorities.get)
 
-    return best_card_index
+def decide_batch(hands, states):
+    """
+    Priority vectors for many (hand, state) positions in one call. Positions
+    that share a state object share its table.
+    """
+    tables = {}
+    vectors = []
+    for hand, state in zip(hands, states):
+        table = tables.get(id(state))
+        if table is None:
+            table = tables[id(state)] = _priority_table(state)
+        vectors.append([table[CARD_IDS[card]] for card in hand])
+    return vectors
+
+
+def _priority_table(state):
+    # First, let's analyze our current played cards
+    played_counts = Counter(state.get("played_cards", []))
+    return _priorities(played_counts, state.get("round", 1))
 
 
 def get_card_priority(card, hand_counts, played_counts, state):
     """
     Calculates the priority of a single card based on the game state.
     """
-    priority = CARD_PRIORITY.get(card, 0)
+    return _priorities(played_counts, state.get("round", 1))[CARD_IDS[card]]
+
+
+def _priorities(played_counts, round_num):
+    """
+    The priority of each card type, by card id.
+    """
+    priority = list(BASE_PRIORITY)
 
     # Wasabi + Nigiri: High priority to play a Nigiri on a Wasabi
-    if "Wasabi" in played_counts and card in ["Egg Nigiri", "Salmon Nigiri", "Squid Nigiri"]:
-        priority += 20
+    if "Wasabi" in played_counts:
+        for card in NIGIRI:
+            priority[card] += 20
 
     # Tempura: Higher priority if we already have one
-    if card == "Tempura" and played_counts["Tempura"] % 2 == 1:
-        priority += 10
+    if played_counts["Tempura"] % 2 == 1:
+        priority[TEMPURA] += 10
 
     # Sashimi: Higher priority if we have one or two already
-    if card == "Sashimi" and 0 < played_counts["Sashimi"] % 3 < 3:
-        priority += 10
-
-    # Dumplings: Value increases with each one
-    priority += played_counts["Dumpling"] * 2
+    if 0 < played_counts["Sashimi"] % 3 < 3:
+        priority[SASHIMI] += 10
 
     # Maki Rolls: Value depends on what others have played (a more complex addition)
     # For now, a simple bonus based on the number of rolls
-    if "Maki Roll" in card:
-      priority += int(card.split("(")[1][0])
+    for card in MAKI:
+        priority[card] += MAKI_VALUE[card]
 
     # Pudding: important for end-game, but not urgent mid-round
-    if card == "Pudding":
-        priority += state.get("round", 1) # Becomes more important in later rounds
+    priority[PUDDING] += round_num  # Becomes more important in later rounds
 
-    return priority
+    # Dumplings: Value increases with each one
+    bonus = played_counts["Dumpling"] * 2
+    return [value + bonus for value in priority]
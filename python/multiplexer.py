@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Sushi Go Multiplexer - many games, one process, a shared decision pool
+
+One `selectors` loop (epoll on Linux) owns every game connection. Each
+connection keeps its own line framer and `GameState`. The loop reads and
+parses lines per connection. Each `HAND` goes to a shared pool of decision
+workers, and when the answer comes back, `PLAY` is sent on the socket it
+belongs to. The HANDs read in one pass over the ready sockets go to the pool
+together, split into one task per worker, so the per-task cost of the pool
+is paid per batch, not per turn. Within a task, the positions of a strategy
+that scores whole hands (`decide_batch`) are scored in one call.
+
+    --workers N            N worker processes (default: one per core)
+    --workers N --threads  N worker threads, for strategies that release
+                           the GIL or spend their time waiting
+    --workers 0            decide inline in the loop
+
+Worker processes get the state along with the hand and return it updated,
+so tracking stays with its own game. While a connection waits for its
+answer, its further lines are held back, so nothing touches the state
+until the decision is in. Worker and process count are fixed however many
+games are open. Each game costs a socket, two small buffers and a
+`GameState`.
+
+The local `sushi_go_server.py` creates the games on first JOIN.
+
+Usage:
+    python multiplexer.py <host> <port> [--games N] [--players P] [--workers N] [--threads]
+                          [--prefix NAME] [--log-level LEVEL] [module ...]
+
+Example:
+    python multiplexer.py localhost 7878 --games 250 --players 4 --workers 4 ClaudeV3_decide
+"""
+
+import collections
+import os
+import resource
+import selectors
+import socket
+import sys
+import time
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+import client_log
+from framing import LineFramer
+from sushi_go_client import RECV_SIZE, ClientProtocol, GameState
+from sushi_go_engine import decide_remote, load_batch, load_strategy
+
+
+class MuxConnection(ClientProtocol):
+    """One game's socket, buffers and state; the multiplexer does the I/O."""
+
+    # Nothing reconnects a dropped game, so keep no checkpoint record
+    auto_rejoin = False
+
+    def __init__(self, host: str, port: int, game_id: str, player_name: str, decide_module: str):
+        super().__init__(host, port, verbose=False)
+        self.game_id = game_id
+        self.player_name = player_name
+        self.decide_module = decide_module
+        self.decide = load_strategy(decide_module)
+        self.log = client_log.connection(f"{player_name}@{game_id}")
+        self.sock: Optional[socket.socket] = None
+        self._framer = LineFramer()
+        self.outbox = bytearray()
+        self.deciding = False            # a decision for this game is in the pool
+        self.held: list[str] = []        # lines that arrived meanwhile
+        self.finished = False
+
+    def choose_card(self, hand: list[str]) -> int:
+        return self.decide(hand, self.state)
+
+    def frame(self, data: bytes) -> list[str]:
+        """The complete lines after adding `data` to the read buffer."""
+        self._framer.feed(data)
+        return self._framer.readlines()
+
+
+def _decide_batch(jobs: list[tuple[str, list[str], GameState]]) -> list[tuple]:
+    """
+    Worker entry point: decide a batch of positions. Each result is
+    (index, state, None), or (0, state, error) if the strategy raised.
+    For a module with `decide_batch`, each position gets its `prepare`,
+    then the ones still open are scored together in one call.
+    """
+    results = []
+    batches: dict[str, Optional[tuple]] = {}
+    scoring: dict[str, list[int]] = {}      # module -> positions left to score
+    for module_name, hand, state in jobs:
+        if module_name not in batches:
+            batches[module_name] = load_batch(module_name)
+        batch = batches[module_name]
+        try:
+            if batch is None:
+                index, state = decide_remote(module_name, hand, state)
+            else:
+                index = batch[0](hand, state)
+        except Exception as e:
+            results.append((0, state, f"{type(e).__name__}: {e}"))
+            continue
+        if index is None:
+            scoring.setdefault(module_name, []).append(len(results))
+        results.append((index, state, None))
+
+    for module_name, positions in scoring.items():
+        hands = [jobs[i][1] for i in positions]
+        states = [results[i][1] for i in positions]
+        try:
+            vectors = batches[module_name][1](hands, states)
+        except Exception as e:
+            for i, state in zip(positions, states):
+                results[i] = (0, state, f"{type(e).__name__}: {e}")
+            continue
+        for i, state, scores in zip(positions, states, vectors):
+            results[i] = (max(range(len(scores)), key=scores.__getitem__), state, None)
+    return results
+
+
+class Multiplexer:
+    """Selector loop over game connections, with a shared decision pool."""
+
+    def __init__(self, workers: int = 0, threads: bool = False):
+        """
+        Args:
+            workers: Pool size (0: decide inline in the loop)
+            threads: Use worker threads instead of processes
+        """
+        self.workers = workers
+        self.executor: Optional[Executor] = None
+        if workers:
+            self.executor = ThreadPoolExecutor(workers) if threads else ProcessPoolExecutor(workers)
+        self.selector = selectors.DefaultSelector()
+        self.connections: list[MuxConnection] = []
+        self.open = 0
+        self.turns = 0
+        # HANDs read during the current select pass, sent to the pool as
+        # one task per worker when the pass ends
+        self._pending: list[MuxConnection] = []
+        # Pool callbacks run on other threads: they queue the result and
+        # write a byte here to wake the selector
+        self._done: collections.deque[tuple[list[MuxConnection], Future]] = collections.deque()
+        self._wake_recv, self._wake_send = socket.socketpair()
+        self._wake_recv.setblocking(False)
+        self._wake_send.setblocking(False)
+        self.selector.register(self._wake_recv, selectors.EVENT_READ, None)
+
+    def add(self, conn: MuxConnection):
+        """Connect and send JOIN; the rest happens in `run`."""
+        conn.sock = socket.create_connection((conn.host, conn.port))
+        conn.sock.setblocking(False)
+        self.selector.register(conn.sock, selectors.EVENT_READ, conn)
+        self.connections.append(conn)
+        self.open += 1
+        self._send(conn, f"JOIN {conn.game_id} {conn.player_name}")
+
+    def run(self):
+        """Serve every connection until all have closed."""
+        while self.open:
+            for key, mask in self.selector.select():
+                conn = key.data
+                if conn is None:
+                    self._completed()
+                    continue
+                if mask & selectors.EVENT_WRITE:
+                    self._flush(conn)
+                if mask & selectors.EVENT_READ and conn.sock is not None:
+                    self._read(conn)
+            if self._pending:
+                self._submit()
+
+    def close(self):
+        """Shut the pool down and close the wakeup pair."""
+        if self.executor is not None:
+            self.executor.shutdown()
+        self.selector.close()
+        self._wake_recv.close()
+        self._wake_send.close()
+
+    # ── I/O ───────────────────────────────────────────────────────────────────
+
+    def _read(self, conn: MuxConnection):
+        try:
+            data = conn.sock.recv(RECV_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            conn.log.error("error: %s", e)
+            data = b""
+        if not data:
+            self._close(conn)
+            return
+        for message in conn.frame(data):
+            self._line(conn, message)
+            if conn.sock is None:
+                return
+
+    def _send(self, conn: MuxConnection, command: str):
+        conn.outbox += (command + "\n").encode("utf-8")
+        self._flush(conn)
+
+    def _flush(self, conn: MuxConnection):
+        if conn.sock is None:
+            return
+        try:
+            sent = conn.sock.send(conn.outbox)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        del conn.outbox[:sent]
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if conn.outbox else 0)
+        if self.selector.get_key(conn.sock).events != events:
+            self.selector.modify(conn.sock, events, conn)
+
+    def _close(self, conn: MuxConnection):
+        if conn.sock is not None:
+            self.selector.unregister(conn.sock)
+            conn.sock.close()
+            conn.sock = None
+            self.open -= 1
+
+    # ── protocol ──────────────────────────────────────────────────────────────
+
+    def _line(self, conn: MuxConnection, message: str):
+        if not message:
+            return
+        if conn.deciding:
+            conn.held.append(message)
+            return
+        if conn.state is None and message.startswith(("WELCOME", "ERROR")):
+            if conn.welcome(message, conn.player_name):
+                self._send(conn, "READY")
+                conn.expect_reply("READY")
+            else:
+                self._close(conn)
+            return
+        if not conn.dispatch(message):
+            conn.finished = True
+            self._close(conn)
+            return
+        if message.startswith("HAND") and conn.state and conn.state.hand:
+            self._dispatch(conn)
+
+    def _dispatch(self, conn: MuxConnection):
+        if self.executor is None:
+            self._play(conn, conn.choose_card(conn.state.hand))
+            return
+        conn.deciding = True
+        self._pending.append(conn)
+
+    def _submit(self):
+        pending, self._pending = self._pending, []
+        size = -(-len(pending) // self.workers)
+        for start in range(0, len(pending), size):
+            batch = pending[start:start + size]
+            jobs = [(conn.decide_module, conn.state.hand, conn.state) for conn in batch]
+            future = self.executor.submit(_decide_batch, jobs)
+            future.add_done_callback(lambda f, batch=batch: self._wake(batch, f))
+
+    def _wake(self, batch: list[MuxConnection], future: Future):
+        self._done.append((batch, future))
+        try:
+            self._wake_send.send(b"\0")
+        except BlockingIOError:
+            pass                         # a wakeup is already pending
+
+    def _completed(self):
+        try:
+            while self._wake_recv.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+        while self._done:
+            batch, future = self._done.popleft()
+            for conn, (index, state, error) in zip(batch, future.result()):
+                conn.deciding = False
+                if conn.sock is None:
+                    continue
+                if error is not None:
+                    conn.log.warning("decide failed, playing index 0: %s", error)
+                conn.state = state
+                self._play(conn, index)
+                held, conn.held = conn.held, []
+                for message in held:
+                    self._line(conn, message)
+
+    def _play(self, conn: MuxConnection, index: int):
+        self.turns += 1
+        self._send(conn, f"PLAY {index}")
+        conn.sent_move("PLAY", (index,))
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) < 2:
+        print("Usage: python multiplexer.py <host> <port> [--games N] [--players P] [--workers N] [--threads] "
+              "[--prefix NAME] [--log-level LEVEL] [module ...]")
+        print("Example: python multiplexer.py localhost 7878 --games 250 --players 4 --workers 4 ClaudeV3_decide")
+        sys.exit(1)
+
+    host, port = args.pop(0), int(args.pop(0))
+    games = 10
+    players = 2
+    workers = os.cpu_count() or 1
+    threads = False
+    prefix = "mux-" + uuid.uuid4().hex[:6]
+    level = "INFO"
+    modules = []
+    while args:
+        arg = args.pop(0)
+        if arg == "--games":
+            games = int(args.pop(0))
+        elif arg == "--players":
+            players = int(args.pop(0))
+        elif arg == "--workers":
+            workers = int(args.pop(0))
+        elif arg == "--threads":
+            threads = True
+        elif arg == "--prefix":
+            prefix = args.pop(0)
+        elif arg == "--log-level":
+            level = args.pop(0)
+        else:
+            modules.append(arg)
+    modules = modules or ["ClaudeV3_decide"]
+
+    client_log.configure(level)
+    mux = Multiplexer(workers, threads)
+    for i in range(games * players):
+        table, seat = divmod(i, players)
+        module = modules[i % len(modules)]
+        mux.add(MuxConnection(host, port, f"{prefix}-{table}", f"{module[:12]}-{table}-{seat}", module))
+
+    start = time.perf_counter()
+    mux.run()
+    elapsed = time.perf_counter() - start
+    mux.close()
+
+    finished = sum(conn.finished for conn in mux.connections)
+    pool = f"{workers} worker {'threads' if threads else 'processes'}" if workers else "inline"
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{finished}/{len(mux.connections)} bot-games finished in {elapsed:.1f}s "
+          f"({mux.turns / elapsed:,.0f} turns/s, {pool}, peak RSS {rss_mb:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
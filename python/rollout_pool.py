@@ -0,0 +1,138 @@
+"""
+Persistent rollout workers for search-based strategies.
+
+`start()` launches N worker processes once, with the engine and the ISMCTS
+search already imported. After that, each decision sends them one compact
+snapshot: count vectors, a tableau tuple and two ints, a few hundred bytes
+pickled. Every worker searches its own tree for the move budget, while the
+calling process searches its reused tree. The root statistics are then
+summed (root parallelization), so throughput grows with cores and no turn
+pays a fork or import.
+
+`SushiGoClient(rollout_workers=N)` calls `start()` from `connect()`. The pool
+outlives the connection and is shut down at interpreter exit.
+
+Example:
+    import rollout_pool
+    rollout_pool.start(4)
+    pending = rollout_pool.active().submit(snapshot, time.monotonic() + 0.2)
+    stats, iterations = pending.get()
+"""
+
+import atexit
+import os
+import threading
+from multiprocessing import Pool
+from typing import Optional
+
+# Workers stop this long before the move deadline so their results are
+# back over the pipe in time
+RETURN_MARGIN = 0.003        # seconds
+
+_worker_search = None
+
+
+def _init_worker():
+    global _worker_search
+    import random
+
+    import ISMCTS_decide
+
+    # Fresh RNG per process: forked workers would otherwise share the
+    # parent's random state and search identical determinizations
+    _worker_search = ISMCTS_decide.ISMCTS(rng=random.Random())
+
+
+def _search_task(snapshot: tuple, deadline: float) -> tuple[dict, int]:
+    from ISMCTS_decide import Node
+
+    root = Node()
+    iterations = _worker_search.run(root, *snapshot, deadline=deadline)
+    stats = {card: (child.visits, child.total) for card, child in root.children.items()}
+    return stats, iterations
+
+
+class PendingSearch:
+    """Rollout statistics still being gathered by the workers."""
+
+    def __init__(self, results: list):
+        self._results = results
+
+    def get(self) -> tuple[dict[int, list], int]:
+        """
+        Block for every worker's result and merge them.
+
+        Returns:
+            ({card id: [visits, total reward]}, total iterations)
+        """
+        merged: dict[int, list] = {}
+        iterations = 0
+        for result in self._results:
+            stats, count = result.get()
+            iterations += count
+            for card, (visits, total) in stats.items():
+                entry = merged.setdefault(card, [0, 0.0])
+                entry[0] += visits
+                entry[1] += total
+        return merged, iterations
+
+
+class RolloutPool:
+    """N warm worker processes that run ISMCTS from snapshots."""
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Args:
+            workers: Worker processes (default: one per core)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = Pool(self.workers, initializer=_init_worker)
+
+    def submit(self, snapshot: tuple, deadline: float) -> PendingSearch:
+        """
+        Start one search per worker without waiting for them.
+
+        Args:
+            snapshot: (hand counts, opponent pool, tableau, player_count, round)
+            deadline: `time.monotonic()` value the move must be ready by.
+                      Absolute, so a task that is dispatched late still
+                      stops on time.
+        """
+        deadline -= RETURN_MARGIN
+        return PendingSearch([
+            self._pool.apply_async(_search_task, (snapshot, deadline))
+            for _ in range(self.workers)
+        ])
+
+    def close(self):
+        """Stop the workers."""
+        self._pool.terminate()
+        self._pool.join()
+
+
+_pool: Optional[RolloutPool] = None
+_lock = threading.Lock()
+
+
+def start(workers: Optional[int] = None) -> RolloutPool:
+    """Start the shared pool if it isn't running; safe to call repeatedly."""
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = RolloutPool(workers)
+            atexit.register(stop)
+        return _pool
+
+
+def active() -> Optional[RolloutPool]:
+    """The shared pool, or None if `start()` hasn't been called."""
+    return _pool
+
+
+def stop():
+    """Shut the shared pool down."""
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
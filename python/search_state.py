@@ -0,0 +1,213 @@
+"""
+Compact, cheaply clonable game state for search.
+
+`GameState` is the client's record of the game. It is a dataclass with name
+lists, dicts and whatever attributes the strategies hang off it, so
+copying it for every simulated branch costs more than the search does.
+`SearchState` keeps only what search needs to play out a round, in two
+flat int lists:
+
+    hands   players x 12 card counts (seat-major)
+    table   players x 8: tempura parity, sashimi mod 3, dumplings (max 5),
+            uncovered wasabi, maki icons, puddings, chopsticks, points
+
+`clone()` copies those two lists: about a hundred ints, no matter how far
+the game has gone. `make(picks)` plays one simultaneous turn and passes the
+hands. `unmake()` restores the previous position from a small undo record,
+so a depth-first search can walk a line and come back without copying.
+
+Example:
+    root = SearchState.from_game_state(state, opponent_hands)
+    root.make([my_card, their_card])
+    value = root.margin(0)
+    root.unmake()
+"""
+
+from typing import Optional, Sequence, Union
+
+from cards import (
+    CHOPSTICKS, DUMPLING, EGG, MAKI_VALUE, NIGIRI_VALUE, NUM_CARDS,
+    PUDDING, SASHIMI, SQUID, TEMPURA, WASABI,
+)
+
+# Offsets into a seat's `table` row
+T_TEMPURA, T_SASHIMI, T_DUMPLINGS, T_WASABI, T_MAKI, T_PUDDINGS, T_CHOPSTICKS, T_POINTS = range(8)
+ROW = 8
+
+DUMPLING_MARGINAL = (1, 2, 3, 4, 5, 0)
+
+Pick = Union[int, tuple[int, int]]
+
+
+class SearchState:
+    """Hands and tableaus for every seat, with make/unmake turns."""
+
+    __slots__ = ("players", "hands", "table", "_undo")
+
+    def __init__(self, players: int):
+        self.players = players
+        self.hands = [0] * (players * NUM_CARDS)
+        self.table = [0] * (players * ROW)
+        self._undo: list = []
+
+    @classmethod
+    def from_game_state(
+        cls,
+        state,
+        opponent_hands: Sequence[Sequence[int]],
+        opponent_played: Optional[Sequence[Sequence[int]]] = None,
+    ) -> "SearchState":
+        """
+        Seat 0 is us, from a `GameState`; seats 1.. follow in passing order.
+
+        Args:
+            state: GameState with `hand_counts` and `played_ids`
+            opponent_hands: 12-slot counts per opponent (e.g. a
+                            determinization)
+            opponent_played: Card ids each opponent has played this round,
+                             if known
+        """
+        search = cls(len(opponent_hands) + 1)
+        search.set_hand(0, state.hand_counts)
+        for card in state.played_ids:
+            search._place(0, card)
+        for seat, hand in enumerate(opponent_hands, start=1):
+            search.set_hand(seat, hand)
+        for seat, played in enumerate(opponent_played or (), start=1):
+            for card in played:
+                search._place(seat, card)
+        return search
+
+    def clone(self) -> "SearchState":
+        """Independent copy (the undo history is not carried over)."""
+        other = SearchState.__new__(SearchState)
+        other.players = self.players
+        other.hands = self.hands[:]
+        other.table = self.table[:]
+        other._undo = []
+        return other
+
+    # ── accessors ─────────────────────────────────────────────────────────────
+
+    def hand(self, seat: int) -> list[int]:
+        """12-slot counts of `seat`'s hand (a copy)."""
+        return self.hands[seat * NUM_CARDS:(seat + 1) * NUM_CARDS]
+
+    def set_hand(self, seat: int, counts: Sequence[int]):
+        self.hands[seat * NUM_CARDS:(seat + 1) * NUM_CARDS] = counts
+
+    def row(self, seat: int) -> list[int]:
+        """`seat`'s tableau row (a copy); index with the T_* offsets."""
+        return self.table[seat * ROW:(seat + 1) * ROW]
+
+    def set_row(self, seat: int, tableau: Sequence[int]):
+        """Seat a tableau: an `endgame` tableau tuple, or a whole row."""
+        self.table[seat * ROW:seat * ROW + len(tableau)] = tableau
+
+    def cards_left(self) -> int:
+        """Cards in seat 0's hand (every hand is the same size)."""
+        return sum(self.hands[:NUM_CARDS])
+
+    # ── moves ─────────────────────────────────────────────────────────────────
+
+    def make(self, picks: Sequence[Pick], undo: bool = True):
+        """
+        Play one turn: every seat reveals its pick, then hands pass from
+        seat i to seat i + 1. A pick is a card id, or a pair of ids played
+        with Chopsticks (Chopsticks go back into the hand). Rollouts that
+        never come back can pass `undo=False` to skip the undo record.
+        """
+        if undo:
+            self._undo.append((tuple(picks), self.table[:]))
+        hands = self.hands
+        for seat, pick in enumerate(picks):
+            base = seat * NUM_CARDS
+            if type(pick) is int:
+                hands[base + pick] -= 1
+                self._place(seat, pick)
+            else:
+                for card in pick:
+                    hands[base + card] -= 1
+                    self._place(seat, card)
+                hands[base + CHOPSTICKS] += 1
+                self.table[seat * ROW + T_CHOPSTICKS] -= 1
+        hands[:] = hands[-NUM_CARDS:] + hands[:-NUM_CARDS]
+
+    def unmake(self):
+        """Undo the last `make`."""
+        picks, table = self._undo.pop()
+        self.table[:] = table
+        hands = self.hands
+        hands[:] = hands[NUM_CARDS:] + hands[:NUM_CARDS]
+        for seat, pick in enumerate(picks):
+            base = seat * NUM_CARDS
+            if type(pick) is int:
+                hands[base + pick] += 1
+            else:
+                for card in pick:
+                    hands[base + card] += 1
+                hands[base + CHOPSTICKS] -= 1
+
+    def _place(self, seat: int, card: int):
+        table = self.table
+        base = seat * ROW
+        if EGG <= card <= SQUID:
+            points = NIGIRI_VALUE[card]
+            if table[base + T_WASABI]:
+                points *= 3
+                table[base + T_WASABI] -= 1
+            table[base + T_POINTS] += points
+        elif card == TEMPURA:
+            if table[base + T_TEMPURA]:
+                table[base + T_POINTS] += 5
+            table[base + T_TEMPURA] ^= 1
+        elif card == SASHIMI:
+            if table[base + T_SASHIMI] == 2:
+                table[base + T_POINTS] += 10
+                table[base + T_SASHIMI] = 0
+            else:
+                table[base + T_SASHIMI] += 1
+        elif card == DUMPLING:
+            dumplings = table[base + T_DUMPLINGS]
+            table[base + T_POINTS] += DUMPLING_MARGINAL[dumplings]
+            table[base + T_DUMPLINGS] = min(dumplings + 1, 5)
+        elif card == PUDDING:
+            table[base + T_PUDDINGS] += 1
+        elif card == WASABI:
+            table[base + T_WASABI] += 1
+        elif card == CHOPSTICKS:
+            table[base + T_CHOPSTICKS] += 1
+        else:
+            table[base + T_MAKI] += MAKI_VALUE[card]
+
+    # ── scoring ───────────────────────────────────────────────────────────────
+
+    def totals(self, pudding_value: float = 0.0) -> list[float]:
+        """
+        Round points per seat including maki majority (6/3, ties split),
+        plus `pudding_value` per pudding taken.
+        """
+        table, players = self.table, self.players
+        maki = [table[seat * ROW + T_MAKI] for seat in range(players)]
+        awards = [0] * players
+        first = max(maki)
+        if first:
+            leaders = [seat for seat in range(players) if maki[seat] == first]
+            for seat in leaders:
+                awards[seat] += 6 // len(leaders)
+            if len(leaders) == 1:
+                second = max((m for m in maki if m < first), default=0)
+                if second:
+                    runners_up = [seat for seat in range(players) if maki[seat] == second]
+                    for seat in runners_up:
+                        awards[seat] += 3 // len(runners_up)
+        return [
+            table[seat * ROW + T_POINTS] + awards[seat]
+            + pudding_value * table[seat * ROW + T_PUDDINGS]
+            for seat in range(players)
+        ]
+
+    def margin(self, seat: int = 0, pudding_value: float = 0.0) -> float:
+        """`seat`'s total minus the mean of the other seats."""
+        totals = self.totals(pudding_value)
+        return totals[seat] - (sum(totals) - totals[seat]) / (self.players - 1)
@@ -0,0 +1,136 @@
+"""
+Speculative decisions for 2-player games.
+
+With two players, the next HAND is the hand we passed last turn minus the
+card the opponent takes from it. That leaves one possible next hand per
+card type in it, ten at most. After each PLAY, `Speculator` decides every
+one of them on a copy of the state in a background thread, while the
+client waits on the opponent. The likeliest picks go first, in `priority`
+order. When the HAND comes, `take` stops the speculation once the
+candidate in progress is done. That hand may have been decided, and
+the real state may have reached it the predicted way: the same round,
+turn and table (so our move was accepted). If so, the index and the state
+the strategy left behind are used as they are. Any other HAND is decided
+as usual, so a miss only costs the wait for the candidate in progress.
+
+States are copied with `checkpoint.dumps`, so search caches (`SKIP`) start
+afresh in each copy. An opponent's Chopsticks pair is not predicted and
+always misses.
+
+Example:
+    speculator = Speculator(decide, priority)
+    speculator.start(state, index)       # after sending PLAY <index>
+    ...
+    speculated = speculator.take(state)  # on the next HAND
+    index, state = speculated if speculated else (decide(state.hand, state), state)
+"""
+
+import threading
+from typing import Callable, Optional, Sequence
+
+import checkpoint
+
+
+def _position(state) -> tuple:
+    """What OK, PLAYED and HAND change between one move and the next."""
+    return state.round, state.turn, tuple(state.played_ids), tuple(state.hand_ids)
+
+
+class Speculator:
+    """Decides the possible next hands of a 2-player game ahead of time."""
+
+    def __init__(self, decide: Callable[[list[str], object], int], priority: Sequence[int]):
+        """
+        Args:
+            decide: decide(hand, state) -> index, run on state copies
+            priority: Card ids, likeliest opponent pick first
+        """
+        self.decide = decide
+        self.rank = {card: i for i, card in enumerate(priority)}
+        self.hits = 0
+        self.misses = 0
+        self._passed: Optional[tuple[int, int, list[int]]] = None   # (round, turn, hand ids)
+        self._results: dict[tuple, tuple[int, object]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, state, index: int):
+        """
+        Note the move just sent and speculate on the next hand.
+
+        Args:
+            state: The state the move was decided in, before its OK
+            index: Index of the card played from `state.hand_ids`
+        """
+        self.stop()
+        hand = state.hand_ids
+        passed, self._passed = self._passed, (state.round, state.turn, hand[:index] + hand[index + 1:])
+        # The opponent now holds the hand we passed them last turn
+        if state.player_count != 2 or passed is None or passed[:2] != (state.round, state.turn - 1):
+            return
+        opponent = passed[2]
+        if len(opponent) < 2:
+            return
+        candidates = sorted(set(opponent), key=lambda card: self.rank.get(card, len(self.rank)))
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(checkpoint.dumps(state), hand[index], opponent, candidates),
+            name="speculation",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _run(self, base: bytes, card: int, opponent: list[int], candidates: list[int]):
+        for taken in candidates:
+            if self._stop.is_set():
+                return
+            hand = list(opponent)
+            hand.remove(taken)
+            # What OK, PLAYED and HAND will do to the real state
+            state = checkpoint.loads(base)
+            state.play((card,))
+            state.turn += 1
+            state.set_hand(hand)
+            state.refresh_flags()
+            key = _position(state)
+            try:
+                index = self.decide(state.hand, state)
+            except Exception:
+                continue                 # the real HAND will raise it again, in the open
+            self._results[key] = (index, state)
+
+    def take(self, state) -> Optional[tuple[int, object]]:
+        """
+        The precomputed (index, state) for the HAND just parsed into
+        `state`, or None to decide it now.
+        """
+        if self._thread is None:
+            return None
+        self.stop()
+        result = self._results.get(_position(state))
+        self._results = {}
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        return None
+
+    def stop(self):
+        """Let the candidate in progress finish and drop the rest."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def reset(self):
+        """Forget the last move, e.g. at GAME_END or after a REJOIN."""
+        self.stop()
+        self._results = {}
+        self._passed = None
+
+    def report(self) -> str:
+        """One-line hit rate summary."""
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return f"speculation: {self.hits}/{total} hands precomputed ({rate:.0%})"
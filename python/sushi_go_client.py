@@ -6,19 +6,46 @@ This client connects to the Sushi Go server and plays using a simple strategy.
 Modify the `choose_card` method to implement your own AI!
 
 Usage:
-    python sushi_go_client.py <server_host> <server_port> <game_id> <player_name>
+    python sushi_go_client.py <server_host> <server_port> <game_id> <player_name> [--timing PATH]
+                              [--log-level LEVEL] [--log-file PATH] [--checkpoint PATH] [--speculate]
+
+    --timing PATH writes per-phase turn timing histograms as JSON to PATH
+    ("-" for stdout) at GAME_END; see timing.py.
+    --log-level LEVEL is DEBUG, INFO (default), WARNING or ERROR. INFO logs
+    a summary per game; DEBUG adds every line sent and received. Logs go to
+    stderr, or to --log-file PATH; see client_log.py.
+    --checkpoint PATH saves the game state there every turn. If the
+    connection drops the client REJOINs on its own; if the process dies,
+    running the same command again resumes from the file. See checkpoint.py.
+    --speculate decides the possible next hands of a 2-player game while
+    the opponent thinks, for clients that set `strategy`. See speculation.py.
 
 Example:
     python sushi_go_client.py localhost 7878 abc123 MyBot
 """
 
+import json
+import logging
+import os
 import random
-import re
 import socket
 import sys
-from dataclasses import dataclass
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from typing import Optional
 
+import checkpoint
+import client_log
+import rollout_pool
+from framing import LineFramer
+from speculation import Speculator
+from timing import TurnTimer
+from cards import (
+    CARD_IDS, CARD_NAMES as CARD_NAMES_BY_ID, CHOPSTICKS, DUMPLING, MAKI_VALUE,
+    NIGIRI, PUDDING, SASHIMI, TEMPURA, WASABI, counts, empty_counts, nigiri_total, parse_hand,
+)
+
 # Card names used by the protocol (now using full names instead of codes)
 CARD_NAMES = {
     "Tempura": "Tempura",
@@ -35,6 +62,26 @@ CARD_NAMES = {
     "Chopsticks": "Chopsticks",
 }
 
+# The default strategy's preference order, best first. Speculation also
+# uses it to guess which card the opponent takes first.
+PRIORITY = [
+    "Squid Nigiri",  # 3 points, or 9 with wasabi
+    "Salmon Nigiri",  # 2 points, or 6 with wasabi
+    "Maki Roll (3)",  # 3 maki rolls
+    "Maki Roll (2)",  # 2 maki rolls
+    "Tempura",  # 5 points per pair
+    "Sashimi",  # 10 points per set of 3
+    "Dumpling",  # Increasing value
+    "Wasabi",  # Triples next nigiri
+    "Egg Nigiri",  # 1 point, or 3 with wasabi
+    "Pudding",  # End game scoring
+    "Maki Roll (1)",  # 1 maki roll
+    "Chopsticks",  # Play 2 cards next turn
+]
+
+# Bytes asked of each recv(); large enough for a whole end-of-round burst
+RECV_SIZE = 65536
+
 
 @dataclass
 class GameState:
@@ -50,111 +97,289 @@ class GameState:
     has_unused_wasabi: bool = False
     puddings: int = 0
 
+    # Opponent tracking used by the *_decide.py strategy modules
+    hand_num: int = 0
+    player_count: int = 2
+    hands: Optional[list[list[str]]] = None
+    enemy_cards_played: list[str] = field(default_factory=list)
+    card_distribution: dict[str, float] = field(
+        default_factory=lambda: {card: 0 for card in CARD_NAMES}
+    )
+
+    # Card ids and 12-slot count vectors (see cards.py). `hand` and
+    # `played_cards` are name views of these, kept for older strategies;
+    # change them through set_hand / add_played / remove_played /
+    # clear_played so both forms stay in step.
+    hand_ids: list[int] = field(default_factory=list)
+    hand_counts: list[int] = field(default_factory=empty_counts)
+    played_ids: list[int] = field(default_factory=list)
+    played_counts: list[int] = field(default_factory=empty_counts)
+
+    # Running aggregates of our table this round, kept by add_played and
+    # friends so a strategy can score a card in O(1). `puddings` (above)
+    # counts the whole game and isn't reset between rounds.
+    tempura_parity: int = 0       # 1 while a tempura waits for its pair
+    sashimi_mod: int = 0          # sashimi toward the next set of three
+    dumplings: int = 0
+    unused_wasabi: int = 0        # wasabi with no nigiri on it yet
+    maki: int = 0                 # maki roll icons
+    chopsticks: int = 0           # chopsticks on the table, ready to use
+
     def __post_init__(self):
         if self.played_cards is None:
             self.played_cards = []
-
-
-class SushiGoClient:
-    """A client for playing Sushi Go."""
-
-    def __init__(self, host: str, port: int):
+        if self.hand and not self.hand_ids:
+            self.set_hand([CARD_IDS[card] for card in self.hand])
+        if self.played_cards and not self.played_ids:
+            self.played_ids = [CARD_IDS[card] for card in self.played_cards]
+            self.played_counts = counts(self.played_ids)
+            puddings = self.puddings
+            self._recount()
+            # A whole-game total passed in already includes this round's
+            self.puddings = max(puddings, self.puddings)
+
+    def set_hand(self, ids: list[int]):
+        """Replace the hand with card ids."""
+        self.hand_ids = ids
+        self.hand_counts = counts(ids)
+        self.hand = [CARD_NAMES_BY_ID[card] for card in ids]
+
+    def add_played(self, card: int):
+        """Record one of our cards going onto the table."""
+        self.played_ids.append(card)
+        self.played_counts[card] += 1
+        self.played_cards.append(CARD_NAMES_BY_ID[card])
+        self._tally(card)
+
+    def play(self, cards: tuple[int, ...]):
+        """Record our move: one card, or a pair with Chopsticks going back to the hand."""
+        if len(cards) == 2:
+            self.remove_played(CHOPSTICKS)
+        for card in cards:
+            self.add_played(card)
+
+    def remove_played(self, card: int):
+        """Take a card back off the table (Chopsticks returning to hand)."""
+        self.played_ids.remove(card)
+        self.played_counts[card] -= 1
+        self.played_cards.remove(CARD_NAMES_BY_ID[card])
+        if card == CHOPSTICKS:
+            self.chopsticks -= 1
+        else:
+            # Rare; order matters for wasabi, so replay the round
+            puddings = self.puddings - (card == PUDDING)
+            self._recount()
+            self.puddings = puddings
+
+    def clear_played(self):
+        """Empty the table at a round boundary."""
+        self.played_ids = []
+        self.played_counts = empty_counts()
+        self.played_cards = []
+        self.tempura_parity = self.sashimi_mod = self.dumplings = 0
+        self.unused_wasabi = self.maki = self.chopsticks = 0
+
+    def _tally(self, card: int):
+        if card == TEMPURA:
+            self.tempura_parity ^= 1
+        elif card == SASHIMI:
+            self.sashimi_mod = (self.sashimi_mod + 1) % 3
+        elif card == DUMPLING:
+            self.dumplings += 1
+        elif card in NIGIRI:
+            if self.unused_wasabi:
+                self.unused_wasabi -= 1
+        elif card == WASABI:
+            self.unused_wasabi += 1
+        elif card == PUDDING:
+            self.puddings += 1
+        elif card == CHOPSTICKS:
+            self.chopsticks += 1
+        else:
+            self.maki += MAKI_VALUE[card]
+
+    def _recount(self):
+        """Rebuild the round aggregates from played_ids; `puddings` ends up
+        as this round's count, for the caller to fold into the game total."""
+        self.tempura_parity = self.sashimi_mod = self.dumplings = 0
+        self.unused_wasabi = self.maki = self.chopsticks = self.puddings = 0
+        for card in self.played_ids:
+            self._tally(card)
+
+    def refresh_flags(self):
+        """Recompute chopsticks/wasabi tracking from the played cards."""
+        self.has_chopsticks = self.chopsticks > 0
+        played = self.played_counts
+        self.has_unused_wasabi = played[WASABI] > 0 and not nigiri_total(played)
+
+
+class ClientProtocol:
+    """
+    The client side of the protocol without the I/O: game state tracking,
+    OK/ERROR bookkeeping, checkpoints and message handling. Subclasses own
+    the connection and feed `welcome`, `rejoined` and `dispatch` the lines
+    they read: `SushiGoClient` over a blocking socket, `AsyncSushiGoClient`
+    over asyncio streams, `MuxConnection` from a selector loop.
+    """
+
+    # The *_decide module behind choose_card, if any. With timing on, its
+    # update_state is timed separately so decide splits into tracking and
+    # scoring.
+    strategy = None
+
+    # Keep a checkpoint record from WELCOME so a dropped connection can REJOIN
+    auto_rejoin = True
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        verbose: bool = True,
+        timing: Optional[str] = None,
+        checkpoint: Optional[str] = None,
+        speculate: bool = False,
+    ):
+        """
+        Args:
+            host: Server host
+            port: Server port
+            verbose: Log every line sent and received, when the
+                     `sushigo` logger is at DEBUG. False keeps the client
+                     quiet at any level.
+            timing: Where to write per-phase timing JSON at GAME_END
+                    ("-" for stdout). None leaves timing off.
+            checkpoint: File to keep the latest checkpoint in, for resuming
+                        after a restart. Reconnecting within the process
+                        works without one.
+            speculate: In 2-player games, decide the possible next hands
+                       while the opponent thinks (see speculation.py).
+                       Needs `strategy`.
+        """
         self.host = host
         self.port = port
-        self.sock: Optional[socket.socket] = None
+        self.verbose = verbose
         self.state: Optional[GameState] = None
-        self._recv_buffer = ""
-
-    def connect(self):
-        """Connect to the server."""
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.sock.connect((self.host, self.port))
-        self._recv_buffer = ""
-        print(f"Connected to {self.host}:{self.port}")
-
-    def disconnect(self):
-        """Disconnect from the server."""
-        if self.sock:
-            self.sock.close()
-            self.sock = None
-
-    def send(self, command: str):
-        """Send a command to the server."""
-        message = command + "\n"
-        self.sock.sendall(message.encode("utf-8"))
-        print(f">>> {command}")
-
-    def receive(self) -> str:
-        """Receive one line-delimited message from the server."""
-        while True:
-            if "\n" in self._recv_buffer:
-                line, self._recv_buffer = self._recv_buffer.split("\n", 1)
-                message = line.strip()
-                print(f"<<< {message}")
-                return message
-
-            chunk = self.sock.recv(4096)
-            if not chunk:
-                raise ConnectionError("Server closed connection")
-            self._recv_buffer += chunk.decode("utf-8", errors="replace")
-
-    def receive_until(self, predicate) -> str:
-        """Read lines until one matches predicate."""
-        while True:
-            message = self.receive()
-            if not message:
-                continue
-            if predicate(message):
-                return message
-
-    def join_game(self, game_id: str, player_name: str) -> bool:
-        """Join a game."""
-        self.send(f"JOIN {game_id} {player_name}")
-        response = self.receive_until(
-            lambda line: line.startswith("WELCOME") or line.startswith("ERROR")
-        )
-
+        # Commands still owed an OK/ERROR, oldest first: (verb, card ids played)
+        self._outstanding: deque[tuple[str, tuple[int, ...]]] = deque()
+        self.log = client_log.connection(f"{host}:{port}")
+        self._wire = False
+        self.checkpoint = checkpoint
+        self.rejoin_token: Optional[str] = None
+        self._record: Optional[dict] = None
+        self.timing = timing
+        self.timer: Optional[TurnTimer] = None
+        if timing:
+            self.timer = TurnTimer()
+            if self.strategy is not None:
+                self.timer.instrument(self.strategy)
+        self.speculator: Optional[Speculator] = None
+        if speculate and self.strategy is None:
+            self.log.warning("speculation needs a strategy module; playing without it")
+        elif speculate:
+            from sushi_go_engine import load_strategy
+
+            self.speculator = Speculator(
+                load_strategy(self.strategy.__name__), [CARD_IDS[card] for card in PRIORITY]
+            )
+
+    def welcome(self, response: str, player_name: str) -> bool:
+        """
+        Take the reply to JOIN or TJOIN: on WELCOME, start a fresh state and
+        the checkpoint record a REJOIN would restore from.
+        """
         if response.startswith("WELCOME"):
             parts = response.split()
             self.state = GameState(game_id=parts[1], player_id=int(parts[2]), hand=[])
+            self.rejoin_token = parts[3] if len(parts) > 3 else None
+            if self.auto_rejoin and self.rejoin_token:
+                self._record = checkpoint.new(self.rejoin_token, parts[1], player_name, self.state)
+                self._save_checkpoint()
+            self.log.info("joined as player %s", parts[2])
             return True
-        elif response.startswith("ERROR"):
-            print(f"Failed to join: {response}")
-            return False
+        self.log.warning("failed to join: %s", response)
         return False
 
-    def signal_ready(self):
-        """Signal that we're ready to start."""
-        self.send("READY")
-        return self.receive()
+    def expect_reply(self, verb: str, cards: tuple[int, ...] = ()):
+        """Note a command the server will answer with OK or ERROR."""
+        self._outstanding.append((verb, cards))
+        if cards and self._record is not None:
+            # The move is on its way: checkpoint while we wait for the others
+            move = (self.state.round, self.state.turn, cards)
+            self._record = checkpoint.advance(self._record, self.state, move)
+            self._save_checkpoint()
+
+    def sent_move(self, verb: str, indices: tuple[int, ...]):
+        """Note a PLAY or CHOPSTICKS just sent; the cards are recorded at its OK."""
+        if self.timer is not None:
+            self.timer.mark("sent")
+        hand_ids = self.state.hand_ids
+        self.expect_reply(verb, tuple(hand_ids[index] for index in indices))
+
+    def _save_checkpoint(self):
+        if self.checkpoint:
+            checkpoint.write(self.checkpoint, self._record)
+
+    def rejoined(self, status_reply: str) -> bool:
+        """
+        Restore the state the checkpoint record and the STATUS reply sent
+        after REJOIN agree on. Replies owed on the old connection are
+        dropped.
 
-    def play_card(self, card_index: int):
-        """Play a card by index."""
-        self.send(f"PLAY {card_index}")
-        return self.receive()
+        Returns:
+            False if the game ended while we were away
+        """
+        status = json.loads(status_reply[3:]) if status_reply.startswith("OK ") else {}
+        if status.get("status") == "ended":
+            self.log.warning("game ended while we were away")
+            return False
+        self.state = checkpoint.restore(self._record, status)
+        self._outstanding.clear()
+        if self.speculator is not None:
+            self.speculator.reset()
+        return True
 
-    def play_chopsticks(self, index1: int, index2: int):
-        """Use chopsticks to play two cards."""
-        self.send(f"CHOPSTICKS {index1} {index2}")
-        return self.receive()
+    def game_over(self):
+        """Forget the finished game's checkpoint."""
+        self._record = None
+        if self.checkpoint and os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+
+    def dispatch(self, message: str) -> bool:
+        """
+        Route one line from the server. The server answers commands in
+        order, so an OK/ERROR settles the oldest outstanding command;
+        every other line goes to `handle_message`.
+
+        Returns:
+            False once the game is over
+        """
+        if self._outstanding and message.startswith(("OK", "ERROR")):
+            self.acknowledge(message)
+            return True
+        return self.handle_message(message)
+
+    def acknowledge(self, message: str):
+        """Settle the oldest outstanding command with its OK/ERROR."""
+        verb, cards = self._outstanding.popleft()
+        if verb in ("PLAY", "CHOPSTICKS"):
+            if self.timer is not None:
+                self.timer.mark("ok")
+                self.timer.end_turn()
+            if message.startswith("OK"):
+                self.state.play(cards)
+            else:
+                self.log.warning("move rejected: %s", message)
+        elif message.startswith("ERROR"):
+            self.log.warning("%s failed: %s", verb, message)
 
     def parse_hand(self, message: str):
         """Parse a HAND message and update state."""
         if message.startswith("HAND"):
-            payload = message[len("HAND ") :]
-            cards = []
-            for match in re.finditer(r"(\d+):(.*?)(?=\s\d+:|$)", payload):
-                cards.append(match.group(2).strip())
+            ids = parse_hand(message[len("HAND ") :])
             if self.state:
-                self.state.hand = cards
+                self.state.set_hand(ids)
                 # Update chopsticks/wasabi tracking based on played cards
-                self.state.has_chopsticks = "Chopsticks" in self.state.played_cards
-                self.state.has_unused_wasabi = any(
-                    c == "Wasabi" for c in self.state.played_cards
-                ) and not any(
-                    c in ("Egg Nigiri", "Salmon Nigiri", "Squid Nigiri")
-                    for c in self.state.played_cards
-                )
+                self.state.refresh_flags()
 
     def choose_card(self, hand: list[str]) -> int:
         """
@@ -169,21 +394,7 @@ class SushiGoClient:
         Returns:
             Index of the card to play (0-based)
         """
-        # Simple priority-based strategy
-        priority = [
-            "Squid Nigiri",  # 3 points, or 9 with wasabi
-            "Salmon Nigiri",  # 2 points, or 6 with wasabi
-            "Maki Roll (3)",  # 3 maki rolls
-            "Maki Roll (2)",  # 2 maki rolls
-            "Tempura",  # 5 points per pair
-            "Sashimi",  # 10 points per set of 3
-            "Dumpling",  # Increasing value
-            "Wasabi",  # Triples next nigiri
-            "Egg Nigiri",  # 1 point, or 3 with wasabi
-            "Pudding",  # End game scoring
-            "Maki Roll (1)",  # 1 maki roll
-            "Chopsticks",  # Play 2 cards next turn
-        ]
+        # Simple priority-based strategy: see PRIORITY at the top
 
         # If we have wasabi, prioritize nigiri
         if self.state and self.state.has_unused_wasabi:
@@ -192,7 +403,7 @@ class SushiGoClient:
                     return hand.index(nigiri)
 
         # Otherwise use priority list
-        for card in priority:
+        for card in PRIORITY:
             if card in hand:
                 return hand.index(card)
 
@@ -203,12 +414,14 @@ class SushiGoClient:
         """Handle a message from the server."""
         if message.startswith("HAND"):
             self.parse_hand(message)
+            if self.timer is not None:
+                self.timer.mark("parsed")
         elif message.startswith("ROUND_START"):
             parts = message.split()
             if self.state:
                 self.state.round = int(parts[1])
                 self.state.turn = 1
-                self.state.played_cards = []
+                self.state.clear_played()
         elif message.startswith("PLAYED"):
             # Cards were revealed, next turn
             if self.state:
@@ -216,73 +429,309 @@ class SushiGoClient:
         elif message.startswith("ROUND_END"):
             # Round ended
             if self.state:
-                self.state.played_cards = []
+                self.state.clear_played()
+        elif message.startswith("GAME_START"):
+            if self.state:
+                self.state.player_count = int(message.split()[1])
         elif message.startswith("GAME_END"):
-            print("Game over!")
+            self.log.info("game over: %s", message[len("GAME_END"):].strip())
+            if self.timer is not None:
+                self.timer.dump(self.timing)
+            if self.speculator is not None:
+                self.log.info("%s", self.speculator.report())
+                self.speculator.reset()
             return False
         elif message.startswith("WAITING"):
             # Our move was accepted, waiting for others
             pass
         return True
 
-    def play_turn(self):
-        """Play a single turn."""
-        if not self.state or not self.state.hand:
-            return
 
-        card_index = self.choose_card(self.state.hand)
+class SushiGoClient(ClientProtocol):
+    """A client for playing Sushi Go."""
+
+    # After a dropped connection: reconnect and REJOIN, retrying after
+    # reconnect_delay seconds, doubling up to reconnect_max_delay
+    reconnect_attempts = 8
+    reconnect_delay = 0.01
+    reconnect_max_delay = 2.0
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        verbose: bool = True,
+        rollout_workers: int = 0,
+        timing: Optional[str] = None,
+        checkpoint: Optional[str] = None,
+        speculate: bool = False,
+    ):
+        """
+        Args:
+            rollout_workers: Rollout processes to start on connect (0: none)
+
+        The other arguments are as for `ClientProtocol`.
+        """
+        super().__init__(host, port, verbose, timing, checkpoint, speculate)
+        self.rollout_workers = rollout_workers
+        self.sock: Optional[socket.socket] = None
+        self._framer = LineFramer()
 
-        # Track the card we're about to play
-        played_card = self.state.hand[card_index]
+    def connect(self):
+        """Connect to the server."""
+        if self.rollout_workers:
+            # Before the socket exists, so forked workers don't inherit it
+            # and keep the connection open after we close it
+            rollout_pool.start(self.rollout_workers)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.connect((self.host, self.port))
+        self._framer.clear()
+        self._outstanding.clear()
+        # Decided once per connection so send/receive pay a single
+        # attribute check when wire logging is off
+        self._wire = self.verbose and self.log.isEnabledFor(logging.DEBUG)
+        self.log.info("connected to %s:%d", self.host, self.port)
 
-        response = self.play_card(card_index)
+    def disconnect(self):
+        """Disconnect from the server."""
+        if self.sock:
+            self.sock.close()
+            self.sock = None
 
-        if response.startswith("OK"):
-            if self.state:
-                self.state.played_cards.append(played_card)
+    def send(self, command: str):
+        """Send a command to the server."""
+        message = command + "\n"
+        self.sock.sendall(message.encode("utf-8"))
+        if self._wire:
+            self.log.debug(">>> %s", command)
 
-    def run(self, game_id: str, player_name: str):
-        """Main game loop."""
-        try:
-            self.connect()
+    def receive(self) -> str:
+        """Receive one line-delimited message from the server."""
+        framer = self._framer
+        while not framer:
+            self._fill()
+        message = framer.readline()
+        if self._wire:
+            self.log.debug("<<< %s", message)
+        return message
+
+    def receive_lines(self) -> list[str]:
+        """Every message that has arrived, waiting for at least one."""
+        framer = self._framer
+        while not framer:
+            self._fill()
+        messages = framer.readlines()
+        if self._wire:
+            for message in messages:
+                self.log.debug("<<< %s", message)
+        return messages
+
+    def _fill(self):
+        chunk = self.sock.recv(RECV_SIZE)
+        if not chunk:
+            raise ConnectionError("Server closed connection")
+        self._framer.feed(chunk)
+
+    def receive_until(self, predicate) -> str:
+        """Read lines until one matches predicate."""
+        while True:
+            message = self.receive()
+            if not message:
+                continue
+            if predicate(message):
+                return message
+
+    def join_game(self, game_id: str, player_name: str) -> bool:
+        """Join a game."""
+        self.send(f"JOIN {game_id} {player_name}")
+        return self._welcome(player_name)
+
+    def join_match(self, match_token: str, player_name: str) -> bool:
+        """Join a tournament match with the token from TOURNAMENT_MATCH."""
+        self.send(f"TJOIN {match_token}")
+        return self._welcome(player_name)
 
-            if not self.join_game(game_id, player_name):
-                return
+    def _welcome(self, player_name: str) -> bool:
+        response = self.receive_until(
+            lambda line: line.startswith("WELCOME") or line.startswith("ERROR")
+        )
 
-            # Signal ready
-            response = self.signal_ready()
+        return self.welcome(response, player_name)
 
-            # Main game loop
-            running = True
-            while running:
-                # Check for incoming messages
+    def signal_ready(self):
+        """Signal that we're ready to start. The OK is handled by `dispatch`."""
+        self.send("READY")
+        self.expect_reply("READY")
+
+    def play_card(self, card_index: int):
+        """Play a card by index. The card is recorded when the OK arrives."""
+        self.send(f"PLAY {card_index}")
+        self.sent_move("PLAY", (card_index,))
+
+    def play_chopsticks(self, index1: int, index2: int):
+        """Use chopsticks to play two cards. Recorded when the OK arrives."""
+        self.send(f"CHOPSTICKS {index1} {index2}")
+        self.sent_move("CHOPSTICKS", (index1, index2))
+
+    def recover(self, error: Exception) -> bool:
+        """
+        Reconnect and REJOIN after the connection dropped, picking the state
+        back up from the latest checkpoint.
+
+        Returns:
+            Whether we are back in the game
+        """
+        if not self.auto_rejoin or self._record is None:
+            return False
+        self.log.warning("connection lost (%s), rejoining", error)
+        delay = self.reconnect_delay
+        for attempt in range(1, self.reconnect_attempts + 1):
+            try:
+                self.disconnect()
+                self.connect()
+                return self.rejoin()
+            except (ConnectionError, OSError) as e:
+                self.log.info("rejoin attempt %d failed: %s", attempt, e)
+            time.sleep(delay)
+            delay = min(delay * 2, self.reconnect_max_delay)
+        return False
+
+    def rejoin(self) -> bool:
+        """
+        Send REJOIN with the checkpoint's token, then STATUS, and restore the
+        state the checkpoint and STATUS agree on. Lines that arrive before
+        the STATUS reply (the resent HAND) are left for the game loop.
+        """
+        start = time.perf_counter()
+        self.send(f"REJOIN {self._record['token']}")
+        response = self.receive_until(lambda line: line.startswith(("REJOINED", "ERROR")))
+        if response.startswith("ERROR"):
+            self.log.warning("failed to rejoin: %s", response)
+            return False
+
+        self.send("STATUS")
+        held = []
+        while True:
+            message = self.receive()
+            if message.startswith(("OK", "ERROR")):
+                break
+            held.append(message)
+        if not self.rejoined(message):
+            return False
+        self._framer.unread(held)
+        self.log.info(
+            "rejoined as player %s in %.1fms", response.split()[2], (time.perf_counter() - start) * 1000
+        )
+        return True
+
+    def play_turn(self):
+        """Play a single turn."""
+        if not self.state or not self.state.hand:
+            return
+
+        speculated = self.speculator.take(self.state) if self.speculator else None
+        if speculated is not None:
+            card_index, self.state = speculated
+        else:
+            card_index = self.choose_card(self.state.hand)
+        if self.timer is not None:
+            self.timer.mark("decided")
+        self.play_card(card_index)
+        if self.speculator is not None:
+            self.speculator.start(self.state, card_index)
+
+    def play_game(self):
+        """Play the joined game through to GAME_END, rejoining if the connection drops."""
+        # Every line, replies included, comes through here, so nothing that
+        # arrives ahead of an OK is lost
+        running = True
+        while running:
+            try:
                 message = self.receive()
-                running = self.handle_message(message)
+                if self.timer is not None and message.startswith("HAND"):
+                    self.timer.mark("line")
+                running = self.dispatch(message)
 
                 # If we received our hand, play a card
                 if message.startswith("HAND") and self.state and self.state.hand:
                     self.play_turn()
+            except (ConnectionError, OSError) as e:
+                if not self.recover(e):
+                    raise
+
+        self.game_over()
+
+    def run(self, game_id: str, player_name: str):
+        """Main game loop."""
+        self.log = client_log.connection(f"{player_name}@{game_id}")
+        try:
+            self.connect()
+
+            record = checkpoint.read(self.checkpoint) if self.checkpoint else None
+            rejoined = False
+            if record and (record["game_id"], record["player_name"]) == (game_id, player_name):
+                # Restarted mid-game: pick up where the checkpoint left off
+                self._record = record
+                self.rejoin_token = record["token"]
+                rejoined = self.rejoin()
+                if not rejoined:
+                    # A stale checkpoint: drop it and join afresh on a clean connection
+                    self.log.info("checkpoint is stale, joining instead")
+                    self.game_over()
+                    self.disconnect()
+                    self.connect()
+            if not rejoined:
+                if not self.join_game(game_id, player_name):
+                    return
+
+                # Signal ready
+                self.signal_ready()
+
+            self.play_game()
 
         except KeyboardInterrupt:
-            print("\nDisconnecting...")
+            self.log.info("interrupted, disconnecting")
         except Exception as e:
-            print(f"Error: {e}")
+            self.log.error("error: %s", e)
         finally:
             self.disconnect()
 
 
-def main():
-    if len(sys.argv) != 5:
-        print("Usage: python sushi_go_client.py <host> <port> <game_id> <player_name>")
-        print("Example: python sushi_go_client.py localhost 7878 abc123 MyBot")
+def main(client_class: type = SushiGoClient):
+    """Run `client_class` with host/port/game/name from the command line."""
+    script = os.path.basename(sys.argv[0])
+    args = sys.argv[1:]
+    if len(args) < 4:
+        print(f"Usage: python {script} <host> <port> <game_id> <player_name> [--timing PATH] "
+              "[--log-level LEVEL] [--log-file PATH] [--checkpoint PATH] [--speculate]")
+        print(f"Example: python {script} localhost 7878 abc123 MyBot")
         sys.exit(1)
 
-    host = sys.argv[1]
-    port = int(sys.argv[2])
-    game_id = sys.argv[3]
-    player_name = sys.argv[4]
-
-    client = SushiGoClient(host, port)
+    host = args[0]
+    port = int(args[1])
+    game_id = args[2]
+    player_name = args[3]
+    args = args[4:]
+    timing = None
+    level = "INFO"
+    log_file = None
+    checkpoint_path = None
+    speculate = False
+    while args:
+        arg = args.pop(0)
+        if arg == "--timing":
+            timing = args.pop(0)
+        elif arg == "--checkpoint":
+            checkpoint_path = args.pop(0)
+        elif arg == "--speculate":
+            speculate = True
+        elif arg == "--log-level":
+            level = args.pop(0)
+        elif arg == "--log-file":
+            log_file = args.pop(0)
+
+    client_log.configure(level, log_file)
+    client = client_class(host, port, timing=timing, checkpoint=checkpoint_path, speculate=speculate)
     client.run(game_id, player_name)
 
 
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+Sushi Go Engine - headless, in-process rules engine
+
+Plays complete games between `decide(hand, state)` strategy functions without
+a server or any sockets. Every seat gets its own `GameState`, maintained
+exactly the way `SushiGoClient` maintains it during a live game, so a strategy
+behaves here the same way it does against the real server.
+
+Usage:
+    python sushi_go_engine.py <decide_module> <decide_module> [...] [--games N] [--seed S]
+
+Example:
+    python sushi_go_engine.py Claude_decide ClaudeV3_decide --games 1000
+"""
+
+import importlib
+import operator
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence, Union
+
+from cards import CARD_IDS, CHOPSTICKS
+from sushi_go_client import GameState
+
+# ── constants ─────────────────────────────────────────────────────────────────
+
+PLAYERS_BY_HAND = {10: 2, 9: 3, 8: 4, 7: 5}
+HAND_SIZE_BY_PLAYERS = {players: size for size, players in PLAYERS_BY_HAND.items()}
+
+# The full 108-card deck. (The *_decide.py tables list 3 "Maki Roll (3)",
+# which only adds up to 103 and runs a 5-player game out of cards.)
+CARD_DEFAULT_FREQUENCIES = {
+    "Tempura": 14,
+    "Sashimi": 14,
+    "Dumpling": 14,
+    "Maki Roll (1)": 6,
+    "Maki Roll (2)": 12,
+    "Maki Roll (3)": 8,
+    "Egg Nigiri": 5,
+    "Salmon Nigiri": 10,
+    "Squid Nigiri": 5,
+    "Pudding": 10,
+    "Wasabi": 6,
+    "Chopsticks": 4,
+}
+
+NIGIRI_VALUES = {"Egg Nigiri": 1, "Salmon Nigiri": 2, "Squid Nigiri": 3}
+MAKI_VALUES = {"Maki Roll (1)": 1, "Maki Roll (2)": 2, "Maki Roll (3)": 3}
+DUMPLING_SCORES = [0, 1, 3, 6, 10, 15]
+ROUNDS = 3
+
+# Strategy modules whose decide() expects the state as a plain dict
+# (see gemini_client.py, which passes `self.state.__dict__`).
+DICT_STATE_MODULES = {"gemini_decide"}
+
+Move = Union[int, tuple[int, int]]
+Decide = Callable[[list[str], GameState], Move]
+
+
+class IllegalMove(ValueError):
+    """A move the rules do not allow; `code` is the PROTOCOL.md error code."""
+
+    def __init__(self, code: str, message: str):
+        super().__init__(code, message)
+        self.code = code
+        self.message = message
+
+    def __str__(self) -> str:
+        return f"{self.code} {self.message}"
+
+
+# ── scoring ───────────────────────────────────────────────────────────────────
+
+def build_deck() -> list[str]:
+    """Return the full unshuffled 108-card deck."""
+    deck = []
+    for card, count in CARD_DEFAULT_FREQUENCIES.items():
+        deck.extend([card] * count)
+    return deck
+
+
+def score_tableau(cards: Sequence[str]) -> int:
+    """
+    Score one round's tableau, excluding maki majorities and pudding.
+
+    Args:
+        cards: Cards in the order they were played (wasabi only boosts
+               nigiri played after it)
+
+    Returns:
+        Points from nigiri/wasabi, tempura, sashimi and dumplings
+    """
+    points = 0
+    wasabi = tempura = sashimi = dumplings = 0
+    for card in cards:
+        value = NIGIRI_VALUES.get(card)
+        if value is not None:
+            if wasabi:
+                wasabi -= 1
+                value *= 3
+            points += value
+        elif card == "Tempura":
+            tempura += 1
+        elif card == "Sashimi":
+            sashimi += 1
+        elif card == "Dumpling":
+            dumplings += 1
+        elif card == "Wasabi":
+            wasabi += 1
+    return (
+        points
+        + (tempura // 2) * 5
+        + (sashimi // 3) * 10
+        + DUMPLING_SCORES[min(dumplings, 5)]
+    )
+
+
+def count_maki(cards: Sequence[str]) -> int:
+    """Total maki rolls shown on a tableau."""
+    return sum(MAKI_VALUES.get(card, 0) for card in cards)
+
+
+def score_maki(maki: Sequence[int]) -> list[int]:
+    """
+    Award maki majorities: 6 for the most, 3 for second most.
+
+    Ties split the award (rounded down) and a tie for most means no second
+    place is awarded. Players with no maki score nothing.
+    """
+    points = [0] * len(maki)
+    first = max(maki)
+    if first == 0:
+        return points
+    leaders = [i for i, m in enumerate(maki) if m == first]
+    for i in leaders:
+        points[i] += 6 // len(leaders)
+    if len(leaders) > 1:
+        return points
+    second = max((m for m in maki if m < first), default=0)
+    if second == 0:
+        return points
+    runners_up = [i for i, m in enumerate(maki) if m == second]
+    for i in runners_up:
+        points[i] += 3 // len(runners_up)
+    return points
+
+
+def score_pudding(puddings: Sequence[int]) -> list[int]:
+    """
+    End-of-game pudding: +6 split among the most, -6 split among the fewest.
+
+    The penalty is skipped in 2-player games; nobody scores if all are tied.
+    """
+    points = [0] * len(puddings)
+    most, least = max(puddings), min(puddings)
+    if most == least:
+        return points
+    top = [i for i, p in enumerate(puddings) if p == most]
+    for i in top:
+        points[i] += 6 // len(top)
+    if len(puddings) > 2:
+        bottom = [i for i, p in enumerate(puddings) if p == least]
+        for i in bottom:
+            points[i] -= 6 // len(bottom)
+    return points
+
+
+# ── game model ────────────────────────────────────────────────────────────────
+
+class Game:
+    """
+    Authoritative state of one game, advanced a turn at a time.
+
+    Seat `i` passes its hand to seat `i + 1` after every turn.
+    """
+
+    __slots__ = (
+        "player_count", "hand_size", "deck", "round", "turn",
+        "hands", "tableaus", "puddings", "scores",
+    )
+
+    def __init__(self, player_count: int, rng: Optional[random.Random] = None):
+        if player_count not in HAND_SIZE_BY_PLAYERS:
+            raise ValueError(f"Unsupported player count: {player_count}")
+        self.player_count = player_count
+        self.hand_size = HAND_SIZE_BY_PLAYERS[player_count]
+        self.deck = build_deck()
+        (rng or random).shuffle(self.deck)
+        self.round = 0
+        self.turn = 0
+        self.hands: list[list[str]] = [[] for _ in range(player_count)]
+        self.tableaus: list[list[str]] = [[] for _ in range(player_count)]
+        self.puddings = [0] * player_count
+        self.scores = [0] * player_count
+
+    @property
+    def round_over(self) -> bool:
+        return not self.hands[0]
+
+    @property
+    def finished(self) -> bool:
+        return self.round == ROUNDS and self.round_over
+
+    def start_round(self):
+        """Deal a fresh hand to every seat from the remaining deck."""
+        self.round += 1
+        self.turn = 1
+        size = self.hand_size
+        for seat in range(self.player_count):
+            self.hands[seat] = self.deck[-size:]
+            del self.deck[-size:]
+            self.tableaus[seat] = []
+
+    def check_move(self, seat: int, move: Move) -> tuple[int, ...]:
+        """Validate a move for `seat` and return it as a tuple of indices."""
+        hand = self.hands[seat]
+        if type(move) is int and 0 <= move < len(hand):
+            return (move,)
+        if isinstance(move, (tuple, list)):
+            indices = tuple(move)
+        else:
+            indices = (move,)
+        try:
+            indices = tuple(operator.index(i) for i in indices)
+        except TypeError:
+            raise IllegalMove("E001", f"Invalid move: {move!r}") from None
+        if not 1 <= len(indices) <= 2:
+            raise IllegalMove("E001", f"Invalid move: {move!r}")
+        for i in indices:
+            if not 0 <= i < len(hand):
+                raise IllegalMove("E006", f"Invalid card index: {i}")
+        if len(indices) == 2:
+            if indices[0] == indices[1]:
+                raise IllegalMove("E009", "Cannot use same card index twice")
+            if "Chopsticks" not in self.tableaus[seat]:
+                raise IllegalMove("E007", "No chopsticks available")
+        return indices
+
+    def play_turn(self, moves: Sequence[Move]) -> list[list[str]]:
+        """
+        Reveal one move per seat, then pass hands.
+
+        Args:
+            moves: One move per seat, either a card index or a pair of
+                   indices to play with Chopsticks
+
+        Returns:
+            The cards each seat put on its tableau this turn
+        """
+        checked = [self.check_move(seat, move) for seat, move in enumerate(moves)]
+        revealed = []
+        for seat, indices in enumerate(checked):
+            hand = self.hands[seat]
+            tableau = self.tableaus[seat]
+            if len(indices) == 1:
+                cards = [hand.pop(indices[0])]
+            else:
+                cards = [hand[i] for i in indices]
+                for i in sorted(indices, reverse=True):
+                    del hand[i]
+                tableau.remove("Chopsticks")
+                hand.append("Chopsticks")
+            tableau.extend(cards)
+            revealed.append(cards)
+        self.hands = self.hands[-1:] + self.hands[:-1]
+        self.turn += 1
+        return revealed
+
+    def end_round(self) -> list[int]:
+        """Score the finished round, add it to the totals and return it."""
+        tableaus = self.tableaus
+        maki = score_maki([count_maki(t) for t in tableaus])
+        points = []
+        for seat, tableau in enumerate(tableaus):
+            gained = score_tableau(tableau) + maki[seat]
+            self.puddings[seat] += tableau.count("Pudding")
+            self.scores[seat] += gained
+            points.append(gained)
+        return points
+
+    def final_scores(self) -> list[int]:
+        """Totals including end-of-game pudding."""
+        bonus = score_pudding(self.puddings)
+        return [score + extra for score, extra in zip(self.scores, bonus)]
+
+    def winners(self) -> list[int]:
+        """Seats with the best final score, ties broken by puddings."""
+        final = self.final_scores()
+        best = max(zip(final, self.puddings))
+        return [
+            seat for seat, key in enumerate(zip(final, self.puddings)) if key == best
+        ]
+
+
+# ── in-process driver ─────────────────────────────────────────────────────────
+
+@dataclass
+class GameResult:
+    """Outcome of one simulated game, indexed by seat."""
+
+    scores: list[int]
+    puddings: list[int]
+    winners: list[int]
+
+
+def play_game(
+    strategies: Sequence[Decide],
+    rng: Optional[random.Random] = None,
+    states: Optional[Sequence[GameState]] = None,
+) -> GameResult:
+    """
+    Play one full game between decide functions.
+
+    Args:
+        strategies: One `decide(hand, state)` per seat
+        rng: Random source for the shuffle (module `random` if omitted)
+        states: Optional pre-built GameStates, one per seat
+
+    Returns:
+        Final scores, pudding counts and winning seats
+    """
+    game = Game(len(strategies), rng)
+    if states is None:
+        states = [
+            GameState(game_id="local", player_id=seat, hand=[])
+            for seat in range(len(strategies))
+        ]
+    for state in states:
+        # What GAME_START tells a networked client
+        state.player_count = len(strategies)
+    seats = list(zip(strategies, states))
+
+    for round_num in range(1, ROUNDS + 1):
+        game.start_round()
+        for state in states:
+            state.round = round_num
+            state.turn = 1
+            state.clear_played()
+
+        while not game.round_over:
+            moves = []
+            for seat, (decide, state) in enumerate(seats):
+                state.set_hand([CARD_IDS[card] for card in game.hands[seat]])
+                state.refresh_flags()
+                moves.append(decide(state.hand, state))
+
+            for state, played in zip(states, game.play_turn(moves)):
+                if len(played) == 2:
+                    state.remove_played(CHOPSTICKS)
+                for card in played:
+                    state.add_played(CARD_IDS[card])
+                state.turn += 1
+
+        game.end_round()
+        for state in states:
+            state.clear_played()
+
+    return GameResult(
+        scores=game.final_scores(),
+        puddings=list(game.puddings),
+        winners=game.winners(),
+    )
+
+
+def load_strategy(module_name: str) -> Decide:
+    """Import a *_decide module and return a decide(hand, state) for it."""
+    module = importlib.import_module(module_name)
+    decide = module.decide
+    if module_name in DICT_STATE_MODULES:
+        return lambda hand, state: decide(hand, state.__dict__)
+    return decide
+
+
+def load_batch(module_name: str) -> Optional[tuple[Callable, Callable]]:
+    """
+    The two halves of a whole-hand scoring module's decide, or None for a
+    module without `decide_batch`. `prepare(hand, state)` does the per-turn
+    tracking and returns an index when the move needs no scoring, else
+    None. `decide_batch(hands, states)` returns a score vector per position.
+    Playing the first highest score is what decide would have played.
+    """
+    module = importlib.import_module(module_name)
+    decide_batch = getattr(module, "decide_batch", None)
+    if decide_batch is None:
+        return None
+    prepare = getattr(module, "prepare", None) or (lambda hand, state: None)
+    if module_name in DICT_STATE_MODULES:
+        return (
+            lambda hand, state: prepare(hand, state.__dict__),
+            lambda hands, states: decide_batch(hands, [state.__dict__ for state in states]),
+        )
+    return prepare, decide_batch
+
+
+def decide_remote(module_name: str, hand: list[str], state: GameState) -> tuple[int, GameState]:
+    """
+    Process-pool entry point: decide in a worker and send back the index
+    together with the state, so the strategy's tracking updates survive
+    the trip.
+    """
+    return load_strategy(module_name)(hand, state), state
+
+
+def main():
+    args = sys.argv[1:]
+    games = 1000
+    seed = None
+    names = []
+    while args:
+        arg = args.pop(0)
+        if arg == "--games":
+            games = int(args.pop(0))
+        elif arg == "--seed":
+            seed = int(args.pop(0))
+        else:
+            names.append(arg)
+
+    if not 2 <= len(names) <= 5:
+        print("Usage: python sushi_go_engine.py <decide_module> <decide_module> [...] [--games N] [--seed S]")
+        print("Example: python sushi_go_engine.py Claude_decide ClaudeV3_decide --games 1000")
+        sys.exit(1)
+
+    strategies = [load_strategy(name) for name in names]
+    rng = random.Random(seed)
+    totals = [0] * len(names)
+    wins = [0.0] * len(names)
+
+    start = time.perf_counter()
+    for _ in range(games):
+        result = play_game(strategies, rng)
+        for seat, score in enumerate(result.scores):
+            totals[seat] += score
+        for seat in result.winners:
+            wins[seat] += 1 / len(result.winners)
+    elapsed = time.perf_counter() - start
+
+    for seat, name in enumerate(names):
+        print(
+            f"{name:<20} mean score {totals[seat] / games:6.2f}   "
+            f"wins {wins[seat] / games:6.1%}"
+        )
+    print(f"{games} games in {elapsed:.2f}s ({games / elapsed:,.0f} games/sec)")
+
+
+if __name__ == "__main__":
+    main()
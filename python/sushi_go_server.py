@@ -0,0 +1,633 @@
+#!/usr/bin/env python3
+"""
+Sushi Go Server - local asyncio stand-in for the game server
+
+Implements the game commands and messages in PROTOCOL.md on top of the rules
+in `sushi_go_engine.py`, so bots can be load tested against a server we
+control. One process hosts any number of concurrent games.
+
+Games are created by the first JOIN that names them and start automatically
+as soon as they are full (`--players`, default 2). READY is accepted and
+acknowledged but never required.
+
+Tournaments work the same way: the first TOURNEY that names one opens it,
+and the bracket starts once `--entrants` players (default 4) have entered.
+Each round pairs the remaining entrants in entry order into 2-player
+matches, with a BYE for an odd one out. The winner of each match goes on,
+and the tiebreaker is the engine's `winners()` order. A match nobody has
+started `--join-timeout` seconds (default 30) after TOURNAMENT_MATCH is
+forfeited to whoever TJOINed; if neither did, to the one paired first.
+
+Usage:
+    python sushi_go_server.py [port] [--host HOST] [--players N] [--entrants N] [--turn-timeout SECONDS]
+                                [--join-timeout SECONDS]
+
+Example:
+    python sushi_go_server.py 7878 --players 4
+"""
+
+import asyncio
+import json
+import secrets
+import sys
+from typing import Optional
+
+from sushi_go_engine import HAND_SIZE_BY_PLAYERS, ROUNDS, Game, IllegalMove
+
+# ── lobby / game bookkeeping ──────────────────────────────────────────────────
+
+
+def _is_index(arg: str) -> bool:
+    """
+    Whether a PLAY/CHOPSTICKS argument is a plain integer. `int()` alone
+    also takes "+2", " 3", "1_0" and non-ASCII digits. A leading "-" is let
+    through so the engine answers E006 for it.
+    """
+    digits = arg.removeprefix("-")
+    return digits.isascii() and digits.isdigit()
+
+
+class Player:
+    """One seat in a game, possibly without a live connection."""
+
+    __slots__ = ("name", "seat", "token", "conn", "left")
+
+    def __init__(self, name: str, seat: int, token: str):
+        self.name = name
+        self.seat = seat
+        self.token = token
+        self.conn: Optional["Connection"] = None
+        self.left = False
+
+
+class ServerGame:
+    """A lobby that turns into a running engine Game once it fills up."""
+
+    def __init__(self, game_id: str, max_players: int, tournament: Optional["Tournament"] = None):
+        self.game_id = game_id
+        self.max_players = max_players
+        self.players: list[Player] = []
+        self.status = "waiting"          # waiting -> playing -> ended
+        self.game: Optional[Game] = None
+        self.moves: dict[int, tuple[int, ...]] = {}
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.tournament = tournament     # set for tournament matches, joined with TJOIN
+
+    def player(self, name: str) -> Optional[Player]:
+        for player in self.players:
+            if player.name == name:
+                return player
+        return None
+
+    def broadcast(self, line: str):
+        for player in self.players:
+            if player.conn is not None:
+                player.conn.send(line)
+
+    def scores_json(self, scores: list[int]) -> str:
+        return json.dumps(
+            {p.name: s for p, s in zip(self.players, scores)}, separators=(",", ":")
+        )
+
+
+class Entrant:
+    """One player entered in a tournament."""
+
+    __slots__ = ("name", "token", "tournament", "conn")
+
+    def __init__(self, name: str, token: str, tournament: "Tournament"):
+        self.name = name
+        self.token = token
+        self.tournament = tournament
+        self.conn: Optional["Connection"] = None
+
+
+class Tournament:
+    """A single-elimination bracket of 2-player matches."""
+
+    def __init__(self, tournament_id: str, max_entrants: int):
+        self.tournament_id = tournament_id
+        self.max_entrants = max_entrants
+        self.entrants: list[Entrant] = []
+        self.status = "waiting"          # waiting -> playing -> ended
+        self.round = 0
+        self.remaining: list[Entrant] = []   # still in, in bracket order
+        self.matches: list[str] = []         # this round's game ids, in bracket order
+        self.winners: dict[str, Entrant] = {}
+        self.bye: Optional[Entrant] = None
+
+    def entrant(self, name: str) -> Optional[Entrant]:
+        for entrant in self.entrants:
+            if entrant.name == name:
+                return entrant
+        return None
+
+    def broadcast(self, line: str):
+        for entrant in self.entrants:
+            if entrant.conn is not None:
+                entrant.conn.send(line)
+
+
+class Connection:
+    """One TCP client; owns at most one Player and one tournament Entrant."""
+
+    __slots__ = ("writer", "player", "game", "entrant")
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.player: Optional[Player] = None
+        self.game: Optional[ServerGame] = None
+        self.entrant: Optional[Entrant] = None
+
+    def send(self, line: str):
+        if not self.writer.is_closing():
+            self.writer.write(line.encode("utf-8") + b"\n")
+
+    def error(self, code: str, message: str):
+        self.send(f"ERROR {code} {message}")
+
+
+# ── server ────────────────────────────────────────────────────────────────────
+
+
+class SushiGoServer:
+    """Serves the PROTOCOL.md game commands for many games at once."""
+
+    def __init__(
+        self, max_players: int = 2, turn_timeout: float = 0.0, max_entrants: int = 4, join_timeout: float = 30.0
+    ):
+        if max_players not in HAND_SIZE_BY_PLAYERS:
+            raise ValueError(f"Unsupported player count: {max_players}")
+        if max_entrants < 2:
+            raise ValueError(f"A tournament needs at least 2 entrants, not {max_entrants}")
+        self.max_players = max_players
+        self.turn_timeout = turn_timeout
+        self.max_entrants = max_entrants
+        self.join_timeout = join_timeout
+        self.games: dict[str, ServerGame] = {}
+        self.tokens: dict[str, tuple[ServerGame, Player]] = {}
+        self.tournaments: dict[str, Tournament] = {}
+        self.match_tokens: dict[str, tuple[ServerGame, Entrant]] = {}
+
+    async def serve(self, host: str, port: int):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Sushi Go server listening on {host}:{port} ({self.max_players}-player games)")
+        async with server:
+            await server.serve_forever()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        conn = Connection(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode("utf-8", errors="replace").strip()
+                if command:
+                    self.dispatch(conn, command)
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.disconnect(conn)
+            writer.close()
+
+    def dispatch(self, conn: Connection, command: str):
+        verb, _, args = command.partition(" ")
+        handler = self.COMMANDS.get(verb.upper())
+        if handler is None:
+            conn.error("E001", f"Unknown command: {verb}")
+            return
+        handler(self, conn, args.split())
+
+    # ── commands ──────────────────────────────────────────────────────────────
+
+    def cmd_join(self, conn: Connection, args: list[str]):
+        if len(args) != 2:
+            conn.error("E001", "Usage: JOIN <game_id> <player_name>")
+            return
+        if conn.player is not None:
+            conn.error("E001", "Already in a game")
+            return
+        game_id, name = args
+        game = self.games.get(game_id)
+        if game is None:
+            game = self.games[game_id] = ServerGame(game_id, self.max_players)
+        if game.tournament is not None:
+            conn.error("E001", "Tournament matches are joined with TJOIN")
+            return
+        if game.status == "ended":
+            conn.error("E004", "Game has already ended")
+            return
+        if game.status == "playing":
+            conn.error("E003", "Game has already started")
+            return
+        if game.player(name) is not None:
+            conn.error("E010", "Name already taken")
+            return
+        if len(game.players) >= game.max_players:
+            conn.error("E011", "Game is full")
+            return
+        self._seat(conn, game, name)
+
+    def _seat(self, conn: Connection, game: ServerGame, name: str):
+        token = secrets.token_urlsafe(24)
+        player = Player(name, len(game.players), token)
+        game.players.append(player)
+        self.tokens[token] = (game, player)
+        self._attach(conn, game, player)
+        conn.send(f"WELCOME {game.game_id} {player.seat} {token}")
+        game.broadcast(f"JOINED {name} {len(game.players)}/{game.max_players}")
+        if len(game.players) == game.max_players:
+            self.start_game(game)
+
+    def cmd_rejoin(self, conn: Connection, args: list[str]):
+        if len(args) != 1:
+            conn.error("E001", "Usage: REJOIN <token>")
+            return
+        entry = self.tokens.get(args[0])
+        if entry is None:
+            conn.error("E005", "Player not found")
+            return
+        game, player = entry
+        if player.conn is not None and player.conn is not conn:
+            player.conn.player = player.conn.game = None
+        self._attach(conn, game, player)
+        if game.tournament is not None:
+            # Tournament messages follow the match's connection
+            entrant = game.tournament.entrant(player.name)
+            entrant.conn, conn.entrant = conn, entrant
+        player.left = False
+        conn.send(f"REJOINED {game.game_id} {player.seat}")
+        if game.status == "playing" and player.seat not in game.moves:
+            self.send_hand(game, player)
+
+    def cmd_ready(self, conn: Connection, args: list[str]):
+        if conn.player is None:
+            conn.error("E005", "Player not found")
+            return
+        conn.send("OK")
+
+    def cmd_play(self, conn: Connection, args: list[str]):
+        if len(args) != 1 or not _is_index(args[0]):
+            conn.error("E001", "Usage: PLAY <card_index>")
+            return
+        self.submit(conn, (int(args[0]),))
+
+    def cmd_chopsticks(self, conn: Connection, args: list[str]):
+        if len(args) != 2 or not all(_is_index(arg) for arg in args):
+            conn.error("E001", "Usage: CHOPSTICKS <idx1> <idx2>")
+            return
+        self.submit(conn, (int(args[0]), int(args[1])))
+
+    def cmd_status(self, conn: Connection, args: list[str]):
+        game = conn.game
+        if game is None:
+            conn.error("E005", "Player not found")
+            return
+        status = {
+            "game_id": game.game_id,
+            "status": game.status,
+            "players": [p.name for p in game.players],
+            "max_players": game.max_players,
+        }
+        if game.game is not None:
+            status.update(
+                round=game.game.round,
+                turn=game.game.turn,
+                scores=game.game.scores,
+                waiting=[p.name for p in game.players if p.seat not in game.moves],
+            )
+        conn.send("OK " + json.dumps(status, separators=(",", ":")))
+
+    def cmd_games(self, conn: Connection, args: list[str]):
+        joinable = [
+            {"game_id": g.game_id, "players": len(g.players), "max_players": g.max_players}
+            for g in self.games.values()
+            if g.status == "waiting" and g.tournament is None
+        ]
+        conn.send("OK " + json.dumps(joinable, separators=(",", ":")))
+
+    def cmd_leave(self, conn: Connection, args: list[str]):
+        game, player = conn.game, conn.player
+        if player is None:
+            conn.error("E005", "Player not found")
+            return
+        conn.player = conn.game = None
+        player.conn = None
+        if game.status == "waiting":
+            self._remove(game, player)
+        elif game.status == "playing":
+            # The seat stays in the game and plays its first card from now on
+            player.left = True
+            self.autoplay(game)
+        conn.send("OK")
+
+    def cmd_tourney(self, conn: Connection, args: list[str]):
+        if len(args) != 2:
+            conn.error("E001", "Usage: TOURNEY <tournament_id> <player_name>")
+            return
+        if conn.entrant is not None:
+            conn.error("E001", "Already in a tournament")
+            return
+        tournament_id, name = args
+        tournament = self.tournaments.get(tournament_id)
+        if tournament is None:
+            tournament = self.tournaments[tournament_id] = Tournament(tournament_id, self.max_entrants)
+        if tournament.status == "ended":
+            conn.error("E004", "Tournament has already ended")
+            return
+        if tournament.status == "playing":
+            conn.error("E003", "Tournament has already started")
+            return
+        if tournament.entrant(name) is not None:
+            conn.error("E010", "Name already taken")
+            return
+
+        entrant = Entrant(name, secrets.token_urlsafe(24), tournament)
+        entrant.conn, conn.entrant = conn, entrant
+        tournament.entrants.append(entrant)
+        count = f"{len(tournament.entrants)}/{tournament.max_entrants}"
+        conn.send(f"TOURNAMENT_WELCOME {tournament_id} {count} {entrant.token}")
+        tournament.broadcast(f"TOURNAMENT_JOINED {tournament_id} {name} {count}")
+        if len(tournament.entrants) == tournament.max_entrants:
+            tournament.status = "playing"
+            tournament.remaining = list(tournament.entrants)
+            self.start_bracket_round(tournament)
+
+    def cmd_tjoin(self, conn: Connection, args: list[str]):
+        if len(args) != 1:
+            conn.error("E001", "Usage: TJOIN <match_token>")
+            return
+        if conn.player is not None:
+            conn.error("E001", "Already in a game")
+            return
+        entry = self.match_tokens.pop(args[0], None)
+        if entry is None:
+            conn.error("E005", "Player not found")
+            return
+        game, entrant = entry
+        self._seat(conn, game, entrant.name)
+
+    COMMANDS = {
+        "JOIN": cmd_join,
+        "REJOIN": cmd_rejoin,
+        "READY": cmd_ready,
+        "PLAY": cmd_play,
+        "CHOPSTICKS": cmd_chopsticks,
+        "STATUS": cmd_status,
+        "GAMES": cmd_games,
+        "LEAVE": cmd_leave,
+        "TOURNEY": cmd_tourney,
+        "TJOIN": cmd_tjoin,
+    }
+
+    # ── game flow ─────────────────────────────────────────────────────────────
+
+    def start_game(self, game: ServerGame):
+        if game.timer is not None:
+            game.timer.cancel()
+            game.timer = None
+        game.status = "playing"
+        game.game = Game(len(game.players))
+        game.broadcast(f"GAME_START {len(game.players)}")
+        self.start_round(game)
+
+    def start_round(self, game: ServerGame):
+        game.game.start_round()
+        game.broadcast(f"ROUND_START {game.game.round}")
+        self.start_turn(game)
+
+    def start_turn(self, game: ServerGame):
+        game.moves.clear()
+        for player in game.players:
+            self.send_hand(game, player)
+        if self.turn_timeout:
+            loop = asyncio.get_running_loop()
+            game.timer = loop.call_later(self.turn_timeout, self.timeout_turn, game)
+        self.autoplay(game)
+
+    def send_hand(self, game: ServerGame, player: Player):
+        if player.conn is None:
+            return
+        hand = game.game.hands[player.seat]
+        player.conn.send("HAND " + " ".join(f"{i}:{card}" for i, card in enumerate(hand)))
+
+    def submit(self, conn: Connection, indices: tuple[int, ...]):
+        game, player = conn.game, conn.player
+        if player is None:
+            conn.error("E005", "Player not found")
+            return
+        if game.status == "ended":
+            conn.error("E004", "Game has already ended")
+            return
+        if game.status != "playing":
+            conn.error("E002", "Not your turn")
+            return
+        if player.seat in game.moves:
+            conn.error("E008", "Player already submitted move this turn")
+            return
+        try:
+            game.moves[player.seat] = game.game.check_move(player.seat, indices)
+        except IllegalMove as e:
+            conn.error(e.code, e.message)
+            return
+        conn.send("OK")
+        waiting = [p.name for p in game.players if p.seat not in game.moves]
+        if waiting:
+            conn.send("WAITING " + " ".join(waiting))
+        else:
+            self.resolve_turn(game)
+
+    def autoplay(self, game: ServerGame):
+        """Play index 0 for seats whose player has left, then resolve if complete."""
+        if game.status != "playing":
+            return
+        for player in game.players:
+            if player.left and player.seat not in game.moves:
+                game.moves[player.seat] = (0,)
+        if len(game.moves) == len(game.players):
+            self.resolve_turn(game)
+
+    def timeout_turn(self, game: ServerGame):
+        game.timer = None
+        if game.status != "playing":
+            return
+        for player in game.players:
+            game.moves.setdefault(player.seat, (0,))
+        self.resolve_turn(game)
+
+    def resolve_turn(self, game: ServerGame):
+        if game.timer is not None:
+            game.timer.cancel()
+            game.timer = None
+        engine = game.game
+        revealed = engine.play_turn([game.moves[p.seat] for p in game.players])
+        game.broadcast(
+            "PLAYED " + "; ".join(
+                f"{p.name}:{','.join(cards)}" for p, cards in zip(game.players, revealed)
+            )
+        )
+        if not engine.round_over:
+            self.start_turn(game)
+            return
+
+        engine.end_round()
+        game.broadcast(f"ROUND_END {engine.round} {game.scores_json(engine.scores)}")
+        if engine.round < ROUNDS:
+            self.start_round(game)
+            return
+
+        game.status = "ended"
+        winners = [game.players[seat].name for seat in engine.winners()]
+        game.broadcast(
+            f"GAME_END {game.scores_json(engine.final_scores())} "
+            f"{json.dumps(winners, separators=(',', ':'))}"
+        )
+        self._close(game)
+        if game.tournament is not None:
+            self.finish_match(game.tournament, game, winners[0])
+
+    # ── tournaments ───────────────────────────────────────────────────────────
+
+    def start_bracket_round(self, tournament: Tournament):
+        tournament.round += 1
+        tournament.matches = []
+        tournament.winners = {}
+        remaining = tournament.remaining
+        for i in range(0, len(remaining) - 1, 2):
+            game_id = f"{tournament.tournament_id}-r{tournament.round}-m{i // 2 + 1}"
+            self.games[game_id] = game = ServerGame(game_id, 2, tournament)
+            tournament.matches.append(game_id)
+            for entrant, opponent in ((remaining[i], remaining[i + 1]), (remaining[i + 1], remaining[i])):
+                token = secrets.token_urlsafe(24)
+                self.match_tokens[token] = (game, entrant)
+                if entrant.conn is not None:
+                    entrant.conn.send(
+                        f"TOURNAMENT_MATCH {tournament.tournament_id} {token} {tournament.round} {opponent.name}"
+                    )
+            if self.join_timeout:
+                loop = asyncio.get_running_loop()
+                game.timer = loop.call_later(self.join_timeout, self.forfeit_match, game)
+        tournament.bye = remaining[-1] if len(remaining) % 2 else None
+        if tournament.bye is not None and tournament.bye.conn is not None:
+            tournament.bye.conn.send(f"TOURNAMENT_MATCH {tournament.tournament_id} BYE {tournament.round}")
+
+    def forfeit_match(self, game: ServerGame):
+        """End a match still short of players at the join deadline."""
+        game.timer = None
+        if game.status != "waiting":
+            return
+        tournament = game.tournament
+        for token in [token for token, (match, _) in self.match_tokens.items() if match is game]:
+            del self.match_tokens[token]
+        if game.players:
+            winner = game.players[0].name
+        else:
+            winner = tournament.remaining[2 * tournament.matches.index(game.game_id)].name
+        game.status = "ended"
+        game.broadcast(
+            f"GAME_END {game.scores_json([0] * len(game.players))} "
+            f"{json.dumps([winner], separators=(',', ':'))}"
+        )
+        if game.game_id in self.games:
+            self._close(game)
+        self.finish_match(tournament, game, winner)
+
+    def finish_match(self, tournament: Tournament, game: ServerGame, winner: str):
+        tournament.winners[game.game_id] = tournament.entrant(winner)
+        if len(tournament.winners) < len(tournament.matches):
+            return
+        tournament.remaining = [tournament.winners[game_id] for game_id in tournament.matches]
+        if tournament.bye is not None:
+            # First in line next round, so nobody sits out twice running
+            tournament.remaining.insert(0, tournament.bye)
+        if len(tournament.remaining) > 1:
+            self.start_bracket_round(tournament)
+            return
+        tournament.status = "ended"
+        tournament.broadcast(f"TOURNAMENT_COMPLETE {tournament.tournament_id} {tournament.remaining[0].name}")
+        for entrant in tournament.entrants:
+            if entrant.conn is not None:
+                # Free the connection for another TOURNEY
+                entrant.conn.entrant = None
+        del self.tournaments[tournament.tournament_id]
+
+    # ── helpers ───────────────────────────────────────────────────────────────
+
+    def _attach(self, conn: Connection, game: ServerGame, player: Player):
+        conn.game, conn.player = game, player
+        player.conn = conn
+
+    def _remove(self, game: ServerGame, player: Player):
+        game.players.remove(player)
+        del self.tokens[player.token]
+        for seat, other in enumerate(game.players):
+            other.seat = seat
+        if not game.players:
+            del self.games[game.game_id]
+
+    def _close(self, game: ServerGame):
+        for player in game.players:
+            self.tokens.pop(player.token, None)
+            if player.conn is not None:
+                # Free the connection for its next game (the next TJOIN)
+                player.conn.player = player.conn.game = None
+        del self.games[game.game_id]
+
+    def disconnect(self, conn: Connection):
+        entrant = conn.entrant
+        if entrant is not None and entrant.conn is conn:
+            entrant.conn = None
+            tournament = entrant.tournament
+            if tournament.status == "waiting":
+                tournament.entrants.remove(entrant)
+                if not tournament.entrants:
+                    del self.tournaments[tournament.tournament_id]
+        player, game = conn.player, conn.game
+        if player is None or player.conn is not conn:
+            return
+        player.conn = None
+        if game.status == "waiting":
+            self._remove(game, player)
+        # Seats in a running game are kept for REJOIN
+
+
+def main():
+    args = sys.argv[1:]
+    host = "0.0.0.0"
+    port = 7878
+    players = 2
+    entrants = 4
+    turn_timeout = 0.0
+    join_timeout = 30.0
+    while args:
+        arg = args.pop(0)
+        if arg == "--host":
+            host = args.pop(0)
+        elif arg == "--players":
+            players = int(args.pop(0))
+        elif arg == "--entrants":
+            entrants = int(args.pop(0))
+        elif arg == "--turn-timeout":
+            turn_timeout = float(args.pop(0))
+        elif arg == "--join-timeout":
+            join_timeout = float(args.pop(0))
+        elif arg.isdigit():
+            port = int(arg)
+        else:
+            print("Usage: python sushi_go_server.py [port] [--host HOST] [--players N] [--entrants N] "
+                  "[--turn-timeout SECONDS] [--join-timeout SECONDS]")
+            sys.exit(1)
+
+    server = SushiGoServer(
+        max_players=players, turn_timeout=turn_timeout, max_entrants=entrants, join_timeout=join_timeout
+    )
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+
+
+if __name__ == "__main__":
+    main()
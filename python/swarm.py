@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Sushi Go Swarm - bot load generator with decision latency percentiles
+
+Launches many `SushiGoClient` bots in one process, each on its own thread and
+connection, playing any mix of `*_decide.py` strategies. For every turn it
+records:
+
+    decide  time from receiving HAND to sending PLAY (parsing + strategy)
+    ack     time from sending PLAY to the server's reply (OK / ERROR)
+
+and reports p50/p95/p99/max for each strategy and overall.
+
+Bots are seated `--players` to a game, in games named `<prefix>-<n>`. The
+local `sushi_go_server.py` creates those games on first JOIN; against the
+real server, create them in the web UI first.
+
+Usage:
+    python swarm.py <host> <port> [--bots N] [--players P] [--games G]
+                    [--ramp SECONDS] [--prefix NAME] [module ...]
+
+Example:
+    python swarm.py localhost 7878 --bots 200 --players 4 Claude_decide ClaudeV3_decide
+"""
+
+import sys
+import threading
+import time
+import uuid
+
+from sushi_go_client import SushiGoClient
+from sushi_go_engine import load_strategy
+
+
+class LatencyRecorder:
+    """Thread-safe per-strategy latency samples, in seconds."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: dict[str, dict[str, list[float]]] = {}
+
+    def add(self, strategy: str, kind: str, seconds: float):
+        with self._lock:
+            self.samples.setdefault(strategy, {}).setdefault(kind, []).append(seconds)
+
+    def report(self):
+        kinds = ("decide", "ack")
+        print(f"\n{'strategy':<18} {'metric':<7} {'count':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+        overall: dict[str, list[float]] = {kind: [] for kind in kinds}
+        for strategy in sorted(self.samples):
+            for kind in kinds:
+                values = self.samples[strategy].get(kind, [])
+                overall[kind].extend(values)
+                _print_row(strategy, kind, values)
+        for kind in kinds:
+            _print_row("(all)", kind, overall[kind])
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def _print_row(strategy: str, kind: str, values: list[float]):
+    values = sorted(values)
+    cells = [percentile(values, f) * 1000 for f in (0.50, 0.95, 0.99)]
+    cells.append((values[-1] if values else float("nan")) * 1000)
+    print(
+        f"{strategy:<18} {kind:<7} {len(values):>8} "
+        + " ".join(f"{ms:>7.2f}ms" for ms in cells)
+    )
+
+
+class SwarmBot(SushiGoClient):
+    """A quiet SushiGoClient that plays a decide module and times each turn."""
+
+    def __init__(self, host, port, strategy_name, decide, recorder):
+        super().__init__(host, port, verbose=False)
+        # Not `strategy`: SushiGoClient keeps the decide module there
+        self.strategy_name = strategy_name
+        self.decide = decide
+        self.recorder = recorder
+        self.finished = False
+        self._hand_at = None
+        self._sent_at = None
+
+    def receive(self) -> str:
+        message = super().receive()
+        now = time.perf_counter()
+        if message.startswith("HAND"):
+            self._hand_at = now
+        elif self._sent_at is not None and message.startswith(("OK", "ERROR")):
+            self.recorder.add(self.strategy_name, "ack", now - self._sent_at)
+            self._sent_at = None
+        return message
+
+    def send(self, command: str):
+        if command.startswith(("PLAY", "CHOPSTICKS")) and self._hand_at is not None:
+            self._sent_at = time.perf_counter()
+            self.recorder.add(self.strategy_name, "decide", self._sent_at - self._hand_at)
+            self._hand_at = None
+        super().send(command)
+
+    def choose_card(self, hand: list[str]) -> int:
+        return self.decide(hand, self.state)
+
+    def handle_message(self, message: str):
+        if message.startswith("GAME_END"):
+            self.finished = True
+        return super().handle_message(message)
+
+
+def run_bot(host, port, strategy_name, decide, recorder, seating, results):
+    """Play each (game_id, name) in `seating` in turn; record successes."""
+    for game_id, name in seating:
+        bot = SwarmBot(host, port, strategy_name, decide, recorder)
+        bot.run(game_id, name)
+        results.append(bot.finished)
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) < 2:
+        print("Usage: python swarm.py <host> <port> [--bots N] [--players P] [--games G] [--ramp SECONDS] [--prefix NAME] [module ...]")
+        print("Example: python swarm.py localhost 7878 --bots 200 --players 4 Claude_decide ClaudeV3_decide")
+        sys.exit(1)
+
+    host, port = args.pop(0), int(args.pop(0))
+    bots = 100
+    players = 2
+    games = 1
+    ramp = 1.0
+    prefix = "swarm-" + uuid.uuid4().hex[:6]
+    names = []
+    while args:
+        arg = args.pop(0)
+        if arg == "--bots":
+            bots = int(args.pop(0))
+        elif arg == "--players":
+            players = int(args.pop(0))
+        elif arg == "--games":
+            games = int(args.pop(0))
+        elif arg == "--ramp":
+            ramp = float(args.pop(0))
+        elif arg == "--prefix":
+            prefix = args.pop(0)
+        else:
+            names.append(arg)
+    names = names or ["ClaudeV3_decide"]
+    strategies = {name: load_strategy(name) for name in names}
+
+    # Round bots up to whole tables
+    bots = -(-bots // players) * players
+    recorder = LatencyRecorder()
+    results: list[bool] = []
+    threads = []
+    for i in range(bots):
+        table, seat = divmod(i, players)
+        strategy = names[i % len(names)]
+        seating = [
+            (f"{prefix}-{table}-{g}", f"{strategy[:12]}-{table}-{seat}")
+            for g in range(games)
+        ]
+        thread = threading.Thread(
+            target=run_bot,
+            args=(host, port, strategy, strategies[strategy], recorder, seating, results),
+            daemon=True,
+        )
+        threads.append(thread)
+
+    print(f"Launching {bots} bots ({bots // players} tables x {games} games) against {host}:{port}")
+    start = time.perf_counter()
+    for i, thread in enumerate(threads):
+        thread.start()
+        if ramp:
+            time.sleep(ramp / bots)
+    try:
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        print("\nInterrupted; reporting what finished.")
+    elapsed = time.perf_counter() - start
+
+    recorder.report()
+    print(f"\n{sum(results)}/{bots * games} bot-games finished in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Per-phase turn timing for `SushiGoClient`.
+
+A turn runs from the moment the HAND line arrives until the server's OK. The
+client stamps `time.monotonic_ns()` at each boundary:
+
+    line ─ parse ─ parsed ─ decide ─ decided ─ send ─ sent ─ ack ─ ok
+
+Each gap goes into a histogram, along with `turn` (line → ok). When the
+strategy module has an `update_state`, `decide` is also split into
+`tracking` (time inside `update_state`) and `scoring` (the rest). Only
+calls on the thread that stamped `parsed` count as tracking, so a decide
+running elsewhere meanwhile (speculation.py) can't push scoring negative.
+
+Histograms are power-of-two microsecond buckets, so recording is an
+int.bit_length() and a list increment, and memory stays fixed however many
+turns are played. A client without a timer only pays an `is None` check at
+each stamp.
+
+Example:
+    timer = TurnTimer()
+    timer.instrument(ClaudeV3_decide)      # optional tracking/scoring split
+    timer.mark("line"); ...; timer.mark("ok"); timer.end_turn()
+    print(timer.to_json())
+"""
+
+import json
+import threading
+import time
+from typing import Optional
+
+# (histogram, from mark, to mark)
+SPANS = (
+    ("parse", "line", "parsed"),
+    ("decide", "parsed", "decided"),
+    ("send", "decided", "sent"),
+    ("ack", "sent", "ok"),
+    ("turn", "line", "ok"),
+)
+BUCKETS = 32                 # bucket i holds durations below 2**i µs
+
+
+class Histogram:
+    """Counts of durations in power-of-two microsecond buckets."""
+
+    __slots__ = ("counts", "total_ns", "min_ns", "max_ns")
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.total_ns = 0
+        self.min_ns: Optional[int] = None
+        self.max_ns = 0
+
+    def add(self, ns: int):
+        self.counts[min((ns // 1000).bit_length(), BUCKETS - 1)] += 1
+        self.total_ns += ns
+        if self.min_ns is None or ns < self.min_ns:
+            self.min_ns = ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def percentile(self, fraction: float) -> float:
+        """Upper edge (µs) of the bucket holding the given fraction."""
+        target = fraction * self.count
+        seen = 0
+        for bucket, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= target:
+                return float(2 ** bucket)
+        return 0.0
+
+    def to_dict(self) -> dict:
+        count = self.count
+        if not count:
+            return {"count": 0}
+        return {
+            "count": count,
+            "mean_us": round(self.total_ns / count / 1000, 1),
+            "min_us": round(self.min_ns / 1000, 1),
+            "max_us": round(self.max_ns / 1000, 1),
+            "p50_us": self.percentile(0.5),
+            "p90_us": self.percentile(0.9),
+            "p99_us": self.percentile(0.99),
+            # "<N" : turns that took under N µs (and at least N/2)
+            "buckets": {f"<{2 ** b}": n for b, n in enumerate(self.counts) if n},
+        }
+
+
+class TurnTimer:
+    """Stamps for the current turn plus histograms over all of them."""
+
+    def __init__(self):
+        self.histograms = {name: Histogram() for name, _, _ in SPANS}
+        self._marks: dict[str, int] = {}
+        self._tracking_ns = 0
+        self._split = False
+        # The thread deciding the current turn; update_state calls on any
+        # other thread aren't this turn's tracking
+        self._owner: Optional[int] = None
+
+    def mark(self, point: str):
+        """Stamp a boundary of the current turn."""
+        if point == "parsed":
+            self._owner = threading.get_ident()
+        self._marks[point] = time.monotonic_ns()
+
+    def end_turn(self):
+        """Record the finished turn's spans and start a fresh one."""
+        marks = self._marks
+        for name, start, end in SPANS:
+            if start in marks and end in marks:
+                self.histograms[name].add(marks[end] - marks[start])
+        if self._split and "parsed" in marks and "decided" in marks:
+            decide_ns = marks["decided"] - marks["parsed"]
+            self._add("tracking", self._tracking_ns)
+            self._add("scoring", decide_ns - self._tracking_ns)
+        marks.clear()
+        self._tracking_ns = 0
+
+    def _add(self, name: str, ns: int):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(ns)
+
+    def instrument(self, module) -> bool:
+        """
+        Time `module.update_state` so `decide` splits into tracking and
+        scoring. The module's decide must call it through the module
+        global (every *_decide module here does). One timed client per
+        process: the wrapper reports to the timer that installed it, and
+        only for calls on the thread deciding the current turn.
+
+        Returns:
+            Whether the module has an update_state to time
+        """
+        update_state = getattr(module, "update_state", None)
+        if update_state is None:
+            return False
+        update_state = getattr(update_state, "__wrapped__", update_state)
+
+        def timed_update_state(*args, **kwargs):
+            if threading.get_ident() != self._owner:
+                return update_state(*args, **kwargs)
+            start = time.monotonic_ns()
+            try:
+                return update_state(*args, **kwargs)
+            finally:
+                self._tracking_ns += time.monotonic_ns() - start
+
+        timed_update_state.__wrapped__ = update_state
+        module.update_state = timed_update_state
+        self._split = True
+        return True
+
+    def to_dict(self) -> dict:
+        return {name: histogram.to_dict() for name, histogram in self.histograms.items()}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def dump(self, path: str):
+        """Write the histograms as JSON to `path` ("-" for stdout)."""
+        if path == "-":
+            print(self.to_json())
+            return
+        with open(path, "w") as f:
+            f.write(self.to_json() + "\n")
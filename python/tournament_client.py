@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Sushi Go Client - tournaments
+
+Enters a bracket with TOURNEY and keeps that one connection for the whole
+event. Each TOURNAMENT_MATCH is joined with TJOIN and played through the
+usual `SushiGoClient` game loop. A BYE is waited out, and the run ends at
+TOURNAMENT_COMPLETE. Nothing is rebuilt between matches, so everything the
+strategy has warmed up stays warm: the imported module and its tables, and
+the ISMCTS rollout workers (`--workers N`, started once before the first
+connection).
+
+In a single-elimination bracket an entrant has at most one match at a
+time, so concurrent matches come from entering several players.
+`--entries N` enters `<player_name>`, `<player_name>-2`, ... with a thread
+and a connection each, all sharing the same module and workers.
+
+Usage:
+    python tournament_client.py <host> <port> <tournament_id> <player_name> [--entries N] [--workers N]
+                                [--speculate] [--log-level LEVEL] [--log-file PATH] [module]
+
+Example:
+    python tournament_client.py localhost 7878 cup1 MyBot --entries 2 ClaudeV3_decide
+"""
+
+import importlib
+import sys
+import threading
+from typing import Optional
+
+import client_log
+import rollout_pool
+from sushi_go_client import SushiGoClient
+from sushi_go_engine import load_strategy
+
+
+class TournamentClient(SushiGoClient):
+    """SushiGoClient that plays every match of a tournament on one connection."""
+
+    def __init__(self, host: str, port: int, decide_module: str = "ClaudeV3_decide", **kwargs):
+        """
+        Args:
+            host: Server host
+            port: Server port
+            decide_module: *_decide module to play
+            **kwargs: Passed on to `SushiGoClient`
+        """
+        self.decide_module = decide_module
+        self.decide = load_strategy(decide_module)
+        self.strategy = importlib.import_module(decide_module)
+        super().__init__(host, port, **kwargs)
+        self.matches = 0
+        self.byes = 0
+        self.winner: Optional[str] = None
+
+    def choose_card(self, hand: list[str]) -> int:
+        return self.decide(hand, self.state)
+
+    def play_tournament(self, tournament_id: str, player_name: str) -> Optional[str]:
+        """
+        Enter a tournament and play each match it assigns us.
+
+        Returns:
+            The tournament winner from TOURNAMENT_COMPLETE, or None if
+            the server turned us away
+        """
+        self.send(f"TOURNEY {tournament_id} {player_name}")
+        response = self.receive_until(lambda line: line.startswith(("TOURNAMENT_WELCOME", "ERROR")))
+        if response.startswith("ERROR"):
+            self.log.warning("failed to enter: %s", response)
+            return None
+        self.log.info("entered %s (%s)", tournament_id, response.split()[2])
+
+        while True:
+            parts = self.receive().split()
+            if not parts:
+                continue
+            if parts[0] == "TOURNAMENT_MATCH":
+                if parts[2] == "BYE":
+                    self.byes += 1
+                    self.log.info("round %s: bye", parts[3])
+                    continue
+                self.log.info("round %s: playing %s", parts[3], parts[4])
+                if self.join_match(parts[2], player_name):
+                    self.signal_ready()
+                    self.play_game()
+                    self.matches += 1
+            elif parts[0] == "TOURNAMENT_COMPLETE":
+                self.log.info("tournament won by %s", parts[2])
+                return parts[2]
+
+    def run(self, tournament_id: str, player_name: str):
+        """Connect, play the tournament and disconnect."""
+        self.log = client_log.connection(f"{player_name}@{tournament_id}")
+        try:
+            self.connect()
+            self.winner = self.play_tournament(tournament_id, player_name)
+        except KeyboardInterrupt:
+            self.log.info("interrupted, disconnecting")
+        except Exception as e:
+            self.log.error("error: %s", e)
+        finally:
+            self.disconnect()
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) < 4:
+        print("Usage: python tournament_client.py <host> <port> <tournament_id> <player_name> [--entries N] "
+              "[--workers N] [--speculate] [--log-level LEVEL] [--log-file PATH] [module]")
+        print("Example: python tournament_client.py localhost 7878 cup1 MyBot --entries 2 ClaudeV3_decide")
+        sys.exit(1)
+
+    host, port, tournament_id, player_name = args[0], int(args[1]), args[2], args[3]
+    args = args[4:]
+    entries = 1
+    workers = 0
+    speculate = False
+    level = "INFO"
+    log_file = None
+    module_name = "ClaudeV3_decide"
+    while args:
+        arg = args.pop(0)
+        if arg == "--entries":
+            entries = int(args.pop(0))
+        elif arg == "--workers":
+            workers = int(args.pop(0))
+        elif arg == "--speculate":
+            speculate = True
+        elif arg == "--log-level":
+            level = args.pop(0)
+        elif arg == "--log-file":
+            log_file = args.pop(0)
+        else:
+            module_name = arg
+
+    client_log.configure(level, log_file)
+    if workers:
+        # Once, before any socket exists, so no worker inherits a connection
+        rollout_pool.start(workers)
+
+    names = [player_name] + [f"{player_name}-{i}" for i in range(2, entries + 1)]
+    clients = [TournamentClient(host, port, module_name, verbose=False, speculate=speculate) for _ in names]
+    threads = [
+        threading.Thread(target=client.run, args=(tournament_id, name), name=name)
+        for client, name in zip(clients, names)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for client, name in zip(clients, names):
+        print(f"{name}: {client.matches} matches, {client.byes} byes")
+    winner = next((client.winner for client in clients if client.winner), None)
+    print(f"Winner: {winner or 'unknown'}")
+
+
+if __name__ == "__main__":
+    main()
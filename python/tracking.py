@@ -0,0 +1,125 @@
+"""
+Incremental opponent-card tracking.
+
+The Claude strategies estimate how many of each card are live across all
+hands: hands we have seen count exactly, and hands we haven't seen yet get
+the deck remainder in proportion. They used to rebuild that estimate from
+every stored hand and every observed play on each decision.
+
+`DistributionTracker` keeps the running totals instead. Each observed hand
+updates them in O(hand size) from its diff against the last time we held
+that hand. The estimate is a cached dict, rebuilt only after a change and
+only over the 12 card types. So tracking costs the same on turn 30 as on
+turn 1, and `copy()` is cheap enough to use inside search.
+
+Example:
+    tracker = DistributionTracker(player_count=3, hand_size=9)
+    tracker.observe(0, hand)          # first sight of hand position 0
+    ...
+    played = tracker.observe(0, hand) # same position again: returns what
+                                      # the opponents took from it
+    tracker.distribution["Tempura"]
+"""
+
+from typing import Optional
+
+from cards import CARD_IDS, CARD_NAMES, NUM_CARDS, counts_of_names
+
+
+class DistributionTracker:
+    """Running known/played/accounted counts behind `card_distribution`."""
+
+    __slots__ = (
+        "player_count", "hand_size", "frequencies", "total_cards",
+        "slots", "known", "played", "accounted", "_view",
+    )
+
+    def __init__(
+        self,
+        player_count: int,
+        hand_size: int,
+        frequencies: dict[str, int],
+        total_cards: int,
+    ):
+        """
+        Args:
+            player_count: Seats at the table (= hand positions)
+            hand_size: Cards per hand at the start of a round
+            frequencies: Copies of each card in the deck, by name
+            total_cards: Deck size used for the unseen-hand estimate
+        """
+        self.player_count = player_count
+        self.hand_size = hand_size
+        self.frequencies = [(CARD_IDS[name], name, n) for name, n in frequencies.items()]
+        self.total_cards = total_cards
+        self.slots: list[list[int]] = []     # last count vector per hand position
+        self.known = [0] * NUM_CARDS         # summed over slots
+        self.played = [0] * NUM_CARDS        # taken by opponents
+        self.accounted = 0                   # sum(known) + sum(played)
+        self._view: Optional[dict[str, float]] = None
+
+    def observe(self, slot: int, hand: list[str]) -> list[str]:
+        """
+        Record the hand now held at position `slot`.
+
+        Returns:
+            Cards that left that hand since we last saw it (taken by
+            opponents), empty on first sight
+        """
+        new = counts_of_names(hand)
+        missing: list[str] = []
+        if slot < len(self.slots):
+            old = self.slots[slot]
+            known, played = self.known, self.played
+            for card in range(NUM_CARDS):
+                delta = new[card] - old[card]
+                if delta:
+                    known[card] += delta
+                    self.accounted += delta
+                    if delta < 0:
+                        played[card] -= delta
+                        self.accounted -= delta
+                        missing.extend([CARD_NAMES[card]] * -delta)
+            self.slots[slot] = new
+        else:
+            self.slots.append(new)
+            for card in range(NUM_CARDS):
+                self.known[card] += new[card]
+            self.accounted += len(hand)
+        self._view = None
+        return missing
+
+    @property
+    def distribution(self) -> dict[str, float]:
+        """
+        Estimated copies of each card across all live hands: exact for
+        hands we've seen, deck-proportional for the rest. Cached until the
+        next `observe`; treat it as read-only.
+        """
+        if self._view is None:
+            unseen = self.player_count - len(self.slots)
+            deck_left = max(0, self.total_cards - self.accounted)
+            known, played, size = self.known, self.played, self.hand_size
+            view = {}
+            for card, name, freq in self.frequencies:
+                if unseen == 0 or deck_left == 0:
+                    view[name] = float(known[card])
+                else:
+                    remaining = max(0, freq - known[card] - played[card])
+                    view[name] = known[card] + (remaining / deck_left) * unseen * size
+            self._view = view
+        return self._view
+
+    def copy(self) -> "DistributionTracker":
+        """Independent copy, e.g. for a search to advance."""
+        clone = DistributionTracker.__new__(DistributionTracker)
+        clone.player_count = self.player_count
+        clone.hand_size = self.hand_size
+        clone.frequencies = self.frequencies
+        clone.total_cards = self.total_cards
+        clone.slots = [list(slot) for slot in self.slots]
+        clone.known = list(self.known)
+        clone.played = list(self.played)
+        clone.accounted = self.accounted
+        clone._view = self._view
+        return clone